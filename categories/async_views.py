@@ -0,0 +1,39 @@
+from python_server.async_views import claims_for, fast_path, json_response
+from python_server.conditional import (
+    acollection_validators, is_not_modified, not_modified_response, set_validator_headers,
+)
+from django.http import HttpResponse
+from users.tokens import ROLE_CLAIM
+from . import cache as category_cache
+from .models import Category
+from .serializers import CategorySerializer
+from .views import CategoryViewSet
+
+
+async def list_categories(request):
+    token = await claims_for(request)
+    # Keyset pages are left to the DRF view and its paginator
+    if token is None or token[ROLE_CLAIM] != 'admin' or 'page_size' in request.GET:
+        return None
+    queryset = Category.objects.all()
+    if request.GET.get('categoryName'):
+        queryset = queryset.filter(categoryName=request.GET['categoryName'])
+
+    etag, last_modified = await acollection_validators(request, category_cache.GENERATION_KEY, queryset, 'updated_at')
+    if is_not_modified(request, etag, last_modified):
+        return not_modified_response(etag, last_modified, response_class=HttpResponse)
+
+    async def build():
+        categories = [dict(item) for item in CategorySerializer([c async for c in queryset], many=True).data]
+        return {
+            'success': True,
+            'message': 'Categories retrieved successfully',
+            'count': len(categories),
+            'categories': categories
+        }
+
+    data = await category_cache.aget_or_build(await category_cache.alist_key(request), build)
+    return set_validator_headers(json_response(data), etag, last_modified)
+
+
+category_list_view = fast_path(list_categories, CategoryViewSet.as_view({'get': 'list', 'post': 'create'}))
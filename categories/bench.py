@@ -0,0 +1,51 @@
+import random
+
+from python_server.benchmarks import scenario
+from users.bench import make_admin
+from .models import Category
+
+
+def seed_categories(count, batch_size=5000):
+    """Bulk-insert ``count`` categories; returns their ids."""
+    ids = []
+    for start in range(0, count, batch_size):
+        categories = Category.objects.bulk_create(
+            Category(categoryName=f'Bench Category {i}', description=f'Seeded category {i}')
+            for i in range(start, min(start + batch_size, count))
+        )
+        ids.extend(str(category.id) for category in categories)
+    return ids
+
+
+@scenario('category-list', 'GET /api/categories/: full list (cached), conditional revalidation and one keyset page of 50.')
+def category_list(run):
+    seed_categories(run.size)
+    client = run.client(make_admin())
+    first = client.get('/api/categories/')
+    run.measure('list', lambda i: client.get('/api/categories/'), expected_status=200)
+    run.measure(
+        'list-not-modified',
+        lambda i: client.get('/api/categories/', headers={'If-None-Match': first['ETag']}),
+        expected_status=304,
+    )
+    run.measure('list-page', lambda i: client.get('/api/categories/', {'page_size': 50}), expected_status=200)
+
+
+@scenario('category-retrieve', 'GET /api/categories/<id>/ across a seeded category table.')
+def category_retrieve(run):
+    ids = seed_categories(run.size)
+    client = run.client(make_admin())
+    rng = random.Random(42)
+    run.measure('retrieve', lambda i: client.get(f'/api/categories/{rng.choice(ids)}/'), expected_status=200)
+
+
+@scenario('category-create', 'POST /api/categories/ (also invalidates the cached list).')
+def category_create(run):
+    seed_categories(run.size)
+    client = run.client(make_admin())
+    counter = iter(range(10 ** 9))
+    run.measure(
+        'create',
+        lambda i: client.post('/api/categories/', {'categoryName': f'Created Category {next(counter)}'}, format='json'),
+        expected_status=201,
+    )
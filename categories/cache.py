@@ -0,0 +1,112 @@
+"""
+Response cache for the category endpoints.
+
+Entries are keyed under a generation token; any write to ``Category`` swaps
+the token (see ``signals.py``), which orphans every cached list and detail
+at once without having to enumerate keys. Hit/miss counters live in the same
+cache so they are shared by all workers when Redis is configured.
+
+Invalidation only reaches workers that share the cache, so responses are
+only cached with ``SHARED_CACHE`` on; otherwise every request is built
+from the database.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+
+from python_server.conditional import acurrent_generation, bump_generation, current_generation
+
+GENERATION_KEY = 'categories:generation'
+HITS_KEY = 'categories:cache:hits'
+MISSES_KEY = 'categories:cache:misses'
+
+
+def _generation():
+    return current_generation(GENERATION_KEY)
+
+
+async def _ageneration():
+    return await acurrent_generation(GENERATION_KEY)
+
+
+def invalidate():
+    """Orphan every cached category response (and the list ETags)."""
+    bump_generation(GENERATION_KEY)
+
+
+def _count(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Counter not there yet (or evicted); add() loses to a concurrent creator harmlessly
+        if not cache.add(key, 1, None):
+            cache.incr(key)
+
+
+async def _acount(key):
+    try:
+        await cache.aincr(key)
+    except ValueError:
+        if not await cache.aadd(key, 1, None):
+            await cache.aincr(key)
+
+
+def _list_digest(request):
+    # Links in paginated responses are absolute, so the host is part of the key.
+    # request.GET works for both DRF and plain Django requests, so the sync
+    # views and the async fast path share entries.
+    params = sorted(request.GET.lists())
+    return hashlib.md5(repr((request.get_host(), params)).encode()).hexdigest()
+
+
+def list_key(request):
+    return f'categories:list:{_generation()}:{_list_digest(request)}'
+
+
+async def alist_key(request):
+    return f'categories:list:{await _ageneration()}:{_list_digest(request)}'
+
+
+def detail_key(pk):
+    return f'categories:detail:{_generation()}:{pk}'
+
+
+def get_or_build(key, build):
+    """Return the cached value for ``key`` or store and return ``build()``."""
+    if not settings.SHARED_CACHE:
+        return build()
+    data = cache.get(key)
+    if data is not None:
+        _count(HITS_KEY)
+        return data
+    _count(MISSES_KEY)
+    data = build()
+    cache.set(key, data, settings.CATEGORY_CACHE_TIMEOUT)
+    return data
+
+
+async def aget_or_build(key, build):
+    """Async ``get_or_build``; ``build`` is a coroutine function."""
+    if not settings.SHARED_CACHE:
+        return await build()
+    data = await cache.aget(key)
+    if data is not None:
+        await _acount(HITS_KEY)
+        return data
+    await _acount(MISSES_KEY)
+    data = await build()
+    await cache.aset(key, data, settings.CATEGORY_CACHE_TIMEOUT)
+    return data
+
+
+def stats():
+    counters = cache.get_many([HITS_KEY, MISSES_KEY])
+    hits = counters.get(HITS_KEY, 0)
+    misses = counters.get(MISSES_KEY, 0)
+    total = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_ratio': round(hits / total, 4) if total else None,
+    }
@@ -5,6 +5,8 @@ class Category(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     categoryName = models.CharField(max_length=100, unique=True)
     description = models.TextField(blank=True)
+    # MAX(updated_at) validates cached lists when there is no shared cache (python_server/conditional.py)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     def __str__(self):
         return self.categoryName
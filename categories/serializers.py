@@ -1,7 +1,8 @@
 from rest_framework import serializers
+from python_server.metrics import TimedSerializerMixin
 from .models import Category
 
-class CategorySerializer(serializers.ModelSerializer):
+class CategorySerializer(TimedSerializerMixin, serializers.ModelSerializer):
     categoryName = serializers.CharField(min_length=2, max_length=50)
     class Meta:
         model = Category
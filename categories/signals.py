@@ -0,0 +1,15 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import cache as category_cache
+from .models import Category
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_category_cache(sender, **kwargs):
+    # Invalidate now for this request and again on commit, so a reader that
+    # re-cached the old rows before the transaction committed is also evicted
+    category_cache.invalidate()
+    transaction.on_commit(category_cache.invalidate)
@@ -0,0 +1,79 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from users.models import User, UserProfile
+from . import cache as category_cache
+from .models import Category
+
+
+class CategoryAPITestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        admin = User.objects.create_user(email='admin@example.com', password='admin-pass-123')
+        UserProfile.objects.create(user=admin, role='admin')
+        self.client = APIClient()
+        self.client.force_authenticate(admin)
+
+    def names(self):
+        return [c['categoryName'] for c in self.client.get('/api/categories/').data['categories']]
+
+
+@override_settings(SHARED_CACHE=True)
+class CategoryCacheTests(CategoryAPITestCase):
+    def test_writes_bump_the_generation(self):
+        generation = category_cache._generation()
+        response = self.client.post('/api/categories/', {'categoryName': 'Spares'}, format='json')
+        self.assertNotEqual(category_cache._generation(), generation)
+
+        generation = category_cache._generation()
+        url = f"/api/categories/{response.data['category']['id']}/"
+        self.client.patch(url, {'description': 'Nuts and bolts'}, format='json')
+        self.assertNotEqual(category_cache._generation(), generation)
+
+        generation = category_cache._generation()
+        self.client.delete(url)
+        self.assertNotEqual(category_cache._generation(), generation)
+
+    def test_list_and_detail_are_reread_after_writes(self):
+        category = Category.objects.create(categoryName='Spares')
+        url = f'/api/categories/{category.id}/'
+        self.assertEqual(self.names(), ['Spares'])
+        self.assertEqual(self.client.get(url).data['category']['categoryName'], 'Spares')
+        self.assertEqual(self.names(), ['Spares'])
+        self.assertEqual(category_cache.stats()['hits'], 1)
+
+        self.client.patch(url, {'categoryName': 'Tools'}, format='json')
+        self.assertEqual(self.names(), ['Tools'])
+        self.assertEqual(self.client.get(url).data['category']['categoryName'], 'Tools')
+
+        self.client.post('/api/categories/', {'categoryName': 'Fasteners'}, format='json')
+        self.assertEqual(sorted(self.names()), ['Fasteners', 'Tools'])
+
+        self.client.delete(url)
+        self.assertEqual(self.names(), ['Fasteners'])
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_cached_responses_outlive_writes_that_skip_signals(self):
+        # Documents why invalidation must reach every worker: the cache is trusted
+        category = Category.objects.create(categoryName='Spares')
+        self.names()
+        Category.objects.filter(pk=category.pk).update(categoryName='Tools')
+        self.assertEqual(self.names(), ['Spares'])
+
+
+class CategoryWithoutSharedCacheTests(CategoryAPITestCase):
+    def test_responses_are_not_cached(self):
+        category = Category.objects.create(categoryName='Spares')
+        self.assertEqual(self.names(), ['Spares'])
+        # As another worker's write would look to this one: no signal here
+        Category.objects.filter(pk=category.pk).update(categoryName='Tools')
+        self.assertEqual(self.names(), ['Tools'])
+        self.assertEqual(category_cache.stats()['hits'], 0)
+
+    def test_conditional_get_uses_the_updated_at_aggregate(self):
+        category = Category.objects.create(categoryName='Spares')
+        etag = self.client.get('/api/categories/')['ETag']
+        self.assertEqual(self.client.get('/api/categories/', HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.client.patch(f'/api/categories/{category.id}/', {'description': 'Nuts'}, format='json')
+        self.assertEqual(self.client.get('/api/categories/', HTTP_IF_NONE_MATCH=etag).status_code, 200)
@@ -1,10 +1,18 @@
 
 from rest_framework import viewsets, permissions, status
+from rest_framework.decorators import action
 from rest_framework.response import Response
+from django.db.models import ProtectedError
 from django_filters.rest_framework import DjangoFilterBackend
 from .models import Category
 from .serializers import CategorySerializer
 from users.permissions import IsAdminRole
+from python_server.pagination import KeysetPagination
+from python_server.metrics import TimedPermissionsMixin
+from python_server.conditional import (
+    collection_validators, is_not_modified, not_modified_response, set_validator_headers,
+)
+from . import cache as category_cache
 from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiParameter, OpenApiTypes
 
 @extend_schema_view(
@@ -51,7 +59,7 @@ from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiPara
         ]
     ),
 )
-class CategoryViewSet(viewsets.ModelViewSet):
+class CategoryViewSet(TimedPermissionsMixin, viewsets.ModelViewSet):
     """API endpoints for managing categories."""
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
@@ -59,24 +67,58 @@ class CategoryViewSet(viewsets.ModelViewSet):
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['categoryName']
     lookup_field = 'id'  # Using id (UUID primary key) as lookup field
+    pagination_class = KeysetPagination  # Opt-in with ?page_size=N
+    ordering = ('id',)
 
     def list(self, request, *args, **kwargs):
-        """List all categories with beautiful response format."""
-        response = super().list(request, *args, **kwargs)
-        return Response({
+        """List all categories with beautiful response format (served from cache, supports conditional GET)."""
+        etag, last_modified = collection_validators(
+            request, category_cache.GENERATION_KEY, self.filter_queryset(self.get_queryset()), 'updated_at',
+        )
+        if is_not_modified(request, etag, last_modified):
+            return not_modified_response(etag, last_modified)
+        data = category_cache.get_or_build(category_cache.list_key(request), self._build_list)
+        return set_validator_headers(Response(data, status=status.HTTP_200_OK), etag, last_modified)
+
+    def _build_list(self):
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page if page is not None else queryset, many=True)
+        categories = [dict(item) for item in serializer.data]
+        data = {
             'success': True,
             'message': 'Categories retrieved successfully',
-            'count': len(response.data),
-            'categories': response.data
-        }, status=status.HTTP_200_OK)
+            'count': len(categories),
+            'categories': categories
+        }
+        if page is not None:
+            data.update(self.paginator.get_pagination_data())
+        return data
 
     def retrieve(self, request, *args, **kwargs):
-        """Retrieve a single category with beautiful response format."""
-        response = super().retrieve(request, *args, **kwargs)
+        """Retrieve a single category with beautiful response format (served from cache)."""
+        def build():
+            serializer = self.get_serializer(self.get_object())
+            return {
+                'success': True,
+                'message': 'Category retrieved successfully',
+                'category': dict(serializer.data)
+            }
+        data = category_cache.get_or_build(category_cache.detail_key(kwargs[self.lookup_field]), build)
+        return Response(data, status=status.HTTP_200_OK)
+
+    @extend_schema(
+        summary="Category cache statistics",
+        description="Hit/miss counters of the category response cache.",
+        tags=["Categories"]
+    )
+    @action(detail=False, methods=['get'], url_path='cache-stats')
+    def cache_stats(self, request):
+        """Expose the category cache hit/miss counters."""
         return Response({
             'success': True,
-            'message': 'Category retrieved successfully',
-            'category': response.data
+            'message': 'Category cache statistics retrieved successfully',
+            'stats': category_cache.stats()
         }, status=status.HTTP_200_OK)
 
     def create(self, request, *args, **kwargs):
@@ -110,7 +152,13 @@ class CategoryViewSet(viewsets.ModelViewSet):
         """Delete category with beautiful response format."""
         instance = self.get_object()
         category_name = instance.categoryName
-        super().destroy(request, *args, **kwargs)
+        try:
+            super().destroy(request, *args, **kwargs)
+        except ProtectedError:
+            return Response({
+                'success': False,
+                'message': f'Category "{category_name}" still has products and cannot be deleted'
+            }, status=status.HTTP_400_BAD_REQUEST)
         return Response({
             'success': True,
             'message': f'Category "{category_name}" deleted successfully'
@@ -35,4 +35,11 @@ timeout = 30
 keepalive = 2
 
 # Debug settings
-reload = False
\ No newline at end of file
+reload = False
+
+
+# Server hooks
+def worker_exit(server, worker):
+    # Write audit log entries still buffered in this worker before it goes away
+    from users import audit
+    audit.flush()
\ No newline at end of file
@@ -1,3 +1,58 @@
 from django.contrib import admin
+from .models import Location, LowStockAlert, StockBalance, StockMovement
 
-# Register your models here.
+@admin.register(Location)
+class LocationAdmin(admin.ModelAdmin):
+    list_display = ('code', 'name', 'isActive')
+    search_fields = ('=code', 'name')
+
+
+@admin.register(StockMovement)
+class StockMovementAdmin(admin.ModelAdmin):
+    list_display = ('created_At', 'movementType', 'product', 'location', 'quantity', 'reference')
+    list_filter = ('movementType',)
+    list_select_related = ('product', 'location')
+    show_full_result_count = False
+
+    # The ledger is append-only; movements are recorded through the API
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(StockBalance)
+class StockBalanceAdmin(admin.ModelAdmin):
+    list_display = ('product', 'location', 'quantity', 'reorderPoint', 'isLow', 'updated_At')
+    list_select_related = ('product', 'location')
+    show_full_result_count = False
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(LowStockAlert)
+class LowStockAlertAdmin(admin.ModelAdmin):
+    list_display = ('created_At', 'product', 'location', 'quantity', 'reorderPoint', 'resolvedAt')
+    list_select_related = ('product', 'location')
+    show_full_result_count = False
+
+    # Raised and resolved by the ledger as balances cross their reorder points
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,102 @@
+import random
+from datetime import timedelta
+from decimal import Decimal
+
+from django.utils import timezone
+
+from categories.bench import seed_categories
+from products.bench import seed_products
+from products.models import Product
+from python_server.benchmarks import scenario
+from .models import Location, StockBalance, StockMovement
+from .snapshots import build_snapshots, quantity_as_of, replay_as_of
+
+HISTORY_DAYS = 365
+
+
+def seed_history(product, locations, count, days=HISTORY_DAYS, batch_size=5000):
+    """Bulk-insert ``count`` backdated movements spread evenly over ``days``."""
+    rng = random.Random(42)
+    start = timezone.now() - timedelta(days=days + 1)
+    step = timedelta(days=days) / max(count, 1)
+    for offset in range(0, count, batch_size):
+        StockMovement.objects.bulk_create(
+            StockMovement(
+                product=product,
+                location=rng.choice(locations),
+                movementType=StockMovement.RECEIPT,
+                quantity=Decimal(rng.randint(1, 20)),
+                created_At=start + step * i,
+            )
+            for i in range(offset, min(offset + batch_size, count))
+        )
+    return start
+
+
+@scenario(
+    'stock-as-of',
+    'On-hand quantity at a past moment for one product/location with --size movements over a year: '
+    'replaying the history from zero versus the nearest daily checkpoint plus the delta.',
+)
+def stock_as_of(run):
+    seed_products(1, seed_categories(1))
+    product = Product.objects.get()
+    locations = [Location.objects.create(code=f'BENCH-{i}', name=f'Bench location {i}') for i in range(2)]
+    start = seed_history(product, locations, run.size)
+    build_snapshots('daily')
+    rng = random.Random(42)
+    moments = [start + timedelta(days=rng.uniform(0, HISTORY_DAYS)) for _ in range(run.iterations + run.warmup)]
+
+    run.measure('replay-from-zero', lambda i: replay_as_of(product, locations[0], moments[i]))
+    run.measure('checkpoint-plus-delta', lambda i: quantity_as_of(product, locations[0], moments[i]))
+
+
+@scenario('cycle-count', 'POST /api/inventory/cycle-counts/ with a --size line count sheet (half the lines differ from stock).')
+def cycle_count(run):
+    from users.bench import make_admin
+
+    seed_products(run.size, seed_categories(5))
+    location = Location.objects.create(code='BENCH-AISLE', name='Bench aisle')
+    skus = list(Product.objects.order_by('id').values_list('sku', flat=True))
+    client = run.client(make_admin())
+    # Each sheet differs from the previous one on about half the lines
+    sheets = [
+        [{'code': sku, 'quantity': (i + n) % 2 * 10 + i % 5} for i, sku in enumerate(skus)]
+        for n in range(2)
+    ]
+    run.measure(
+        'submit',
+        lambda i: client.post('/api/inventory/cycle-counts/', {'location': str(location.uuid), 'lines': sheets[i % 2]}, format='json'),
+        expected_status=201,
+        iterations=min(run.iterations, 20),
+    )
+
+
+@scenario(
+    'low-stock',
+    'GET /api/inventory/low-stock/ over --size balances with reorder points, 1% of them low, '
+    'and issues that cross no reorder point (the ledger\'s single-UPDATE path).',
+)
+def low_stock(run):
+    from users.bench import make_admin
+
+    seed_products(run.size, seed_categories(5))
+    location = Location.objects.create(code='BENCH-AISLE', name='Bench aisle')
+    StockBalance.objects.bulk_create(
+        StockBalance(
+            product_id=product_id, location=location, quantity=Decimal(1 if i % 100 == 0 else 1000),
+            reorderPoint=Decimal(5), isLow=i % 100 == 0,
+        )
+        for i, product_id in enumerate(Product.objects.order_by('id').values_list('id', flat=True))
+    )
+    client = run.client(make_admin())
+    run.measure('list', lambda i: client.get('/api/inventory/low-stock/'))
+    products = list(Product.objects.order_by('id')[1:100])
+    run.measure(
+        'issue',
+        lambda i: client.post('/api/inventory/movements/', {
+            'product': str(products[i % len(products)].uuid), 'location': str(location.uuid),
+            'movementType': StockMovement.ISSUE, 'quantity': '1',
+        }, format='json'),
+        expected_status=201,
+    )
@@ -0,0 +1,237 @@
+"""
+Bulk cycle-count reconciliation.
+
+A count sheet lists counted quantities for many products at one location.
+``reconcile()`` does everything in one transaction:
+
+- resolves the lines' products in bulk;
+- reads and row-locks the current balances with one set-based query (split
+  only where the database caps query parameters, as SQLite does at 999);
+- appends an adjustment movement for every non-zero variance;
+- sets the balances to the counted quantities: a batched ``bulk_create``
+  upsert (INSERT ... ON CONFLICT DO UPDATE) for the locked existing rows and
+  a plain ``bulk_create`` for new ones;
+- flips ``isLow`` on the rows whose reorder point the count crossed and
+  raises or resolves their low-stock alerts in bulk.
+
+The number of queries grows with the batch count, not with the number of
+lines. Lines are validated up front like the vendor importer's rows, with a
+capped error report, and nothing is written if any line is invalid.
+"""
+import uuid
+from decimal import Decimal, InvalidOperation
+
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from products.models import Product
+from products.serializers import normalize_code
+from . import reorder
+from .models import QUANTITY_DIGITS, QUANTITY_PLACES, StockBalance, StockMovement
+
+MAX_LINES = 20000
+MAX_REPORTED_ERRORS = 1000
+MAX_REPORTED_VARIANCES = 1000
+BATCH_SIZE = 2000
+MAX_QUANTITY = Decimal(10) ** (QUANTITY_DIGITS - QUANTITY_PLACES)
+QUANTUM = Decimal(1).scaleb(-QUANTITY_PLACES)
+
+
+class CycleCountError(Exception):
+    def __init__(self, message, errors=None, errors_truncated=False):
+        super().__init__(message)
+        self.errors = errors or []
+        self.errors_truncated = errors_truncated
+
+
+def _chunks(values, params_per_value=1):
+    """Split an ``__in`` list so each query stays under the database's parameter cap."""
+    values = list(values)
+    limit = connection.features.max_query_params
+    size = limit // params_per_value if limit else len(values) or 1
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def _parse_quantity(raw):
+    try:
+        quantity = Decimal(str(raw))
+    except (InvalidOperation, ValueError):
+        return None, 'A valid number is required.'
+    if not quantity.is_finite() or quantity < 0:
+        return None, 'Counted quantity must be zero or more.'
+    if quantity >= MAX_QUANTITY or quantity != quantity.quantize(QUANTUM):
+        return None, f'Use at most {QUANTITY_DIGITS - QUANTITY_PLACES} digits and {QUANTITY_PLACES} decimal places.'
+    return quantity, None
+
+
+def clean_lines(lines):
+    """
+    Validate raw count lines.
+
+    Each line is ``{"product": <uuid>}`` or ``{"code": <SKU or barcode>}`` plus
+    ``"quantity"``. Returns ``{product_id: counted_quantity}``; raises
+    ``CycleCountError`` carrying per-line errors. Lines for the same product
+    (counted in two spots) are added up.
+    """
+    if not isinstance(lines, list) or not lines:
+        raise CycleCountError('lines must be a non-empty list.')
+    if len(lines) > MAX_LINES:
+        raise CycleCountError(f'A count sheet may have at most {MAX_LINES} lines; split it up.')
+
+    errors = []
+    parsed = []
+    uuids = set()
+    codes = set()
+    for number, line in enumerate(lines, start=1):
+        if not isinstance(line, dict):
+            errors.append({'line': number, 'errors': {'line': 'Each line must be an object.'}})
+            continue
+        line_errors = {}
+        quantity, message = _parse_quantity(line.get('quantity'))
+        if message:
+            line_errors['quantity'] = message
+        key = None
+        if line.get('product'):
+            try:
+                key = ('uuid', uuid.UUID(str(line['product'])))
+                uuids.add(key[1])
+            except ValueError:
+                line_errors['product'] = 'Must be a valid UUID.'
+        elif line.get('code'):
+            key = ('code', normalize_code(str(line['code'])))
+            codes.add(key[1])
+        else:
+            line_errors['product'] = 'Give the product uuid or its SKU/barcode as code.'
+        if line_errors:
+            errors.append({'line': number, 'errors': line_errors})
+        else:
+            parsed.append((number, key, quantity))
+
+    by_uuid = {}
+    for chunk in _chunks(uuids):
+        by_uuid.update(Product.objects.filter(uuid__in=chunk).values_list('uuid', 'id'))
+    by_code = {}
+    # Each code is matched against both columns, so it costs two parameters
+    for chunk in _chunks(codes, params_per_value=2):
+        for sku, barcode, product_id in Product.objects.filter(
+            Q(sku__in=chunk) | Q(barcode__in=chunk)
+        ).values_list('sku', 'barcode', 'id'):
+            # An exact SKU match wins over another product's identical barcode
+            by_code[sku] = product_id
+            if barcode:
+                by_code.setdefault(barcode, product_id)
+
+    counted = {}
+    for number, (kind, value), quantity in parsed:
+        product_id = (by_uuid if kind == 'uuid' else by_code).get(value)
+        if product_id is None:
+            errors.append({'line': number, 'errors': {'product': f'Unknown product "{value}".'}})
+            continue
+        total = counted.get(product_id, Decimal('0')) + quantity
+        if total >= MAX_QUANTITY:
+            # Each line fits the column but the product's total must too
+            errors.append({'line': number, 'errors': {
+                'quantity': f'The lines for "{value}" add up to more than the largest storable quantity.'
+            }})
+            continue
+        counted[product_id] = total
+
+    if errors:
+        errors.sort(key=lambda error: error['line'])
+        raise CycleCountError(
+            f'{len(errors)} invalid line(s); nothing was recorded.',
+            errors[:MAX_REPORTED_ERRORS], len(errors) > MAX_REPORTED_ERRORS,
+        )
+    return counted
+
+
+def reconcile(location, counted, user_id=None, reference='', note=''):
+    """
+    Bring ``location``'s balances in line with ``counted`` (``{product_id: quantity}``).
+
+    Products that are not on the sheet are left alone. Returns a report with
+    the adjusted lines and their variances.
+    """
+    reference = reference or f'cycle-count {timezone.now():%Y-%m-%d %H:%M}'
+    for attempt in range(3):
+        try:
+            return _reconcile(location, counted, user_id, reference, note)
+        except IntegrityError:
+            # A movement created one of the missing balance rows concurrently; the rerun locks it
+            if attempt == 2:
+                raise
+
+
+def _reconcile(location, counted, user_id, reference, note):
+    with transaction.atomic():
+        now = timezone.now()
+        balances = {}
+        for chunk in _chunks(counted):
+            balances.update(
+                (balance.product_id, balance)
+                for balance in StockBalance.objects.select_for_update().filter(location=location, product_id__in=chunk)
+            )
+
+        movements = []
+        changed = []
+        created = []
+        went_low = []
+        recovered = []
+        variances = []
+        for product_id, quantity in counted.items():
+            balance = balances.get(product_id)
+            current = balance.quantity if balance is not None else Decimal('0')
+            variance = quantity - current
+            if not variance:
+                continue
+            movements.append(StockMovement(
+                product_id=product_id, location=location, movementType=StockMovement.ADJUSTMENT,
+                quantity=variance, user_id=user_id, reference=reference, note=note, created_At=now,
+            ))
+            if balance is None:
+                created.append(StockBalance(product_id=product_id, location=location, quantity=quantity, updated_At=now))
+            else:
+                row = StockBalance(
+                    product_id=product_id, location=location, quantity=quantity, updated_At=now,
+                    reorderPoint=balance.reorderPoint, isLow=reorder.is_low(quantity, balance.reorderPoint),
+                )
+                changed.append(row)
+                if row.isLow and not balance.isLow:
+                    went_low.append(row)
+                elif balance.isLow and not row.isLow:
+                    recovered.append(product_id)
+            variances.append((product_id, current, quantity, variance))
+
+        StockMovement.objects.bulk_create(movements, batch_size=BATCH_SIZE)
+        # The changed rows are locked and known to exist, so an upsert is a plain
+        # batched update without bulk_update's per-row CASE WHEN (several times slower)
+        StockBalance.objects.bulk_create(
+            changed, batch_size=BATCH_SIZE, update_conflicts=True,
+            unique_fields=['product', 'location'], update_fields=['quantity', 'isLow', 'updated_At'],
+        )
+        StockBalance.objects.bulk_create(created, batch_size=BATCH_SIZE)
+        reorder.raise_alerts(went_low, now)
+        for chunk in _chunks(recovered):
+            reorder.resolve_alerts(location.pk, chunk, now)
+
+    skus = {}
+    for chunk in _chunks(product_id for product_id, *_ in variances[:MAX_REPORTED_VARIANCES]):
+        skus.update(Product.objects.filter(id__in=chunk).values_list('id', 'sku'))
+    return {
+        'lines': len(counted),
+        'adjusted': len(variances),
+        'unchanged': len(counted) - len(variances),
+        'reference': reference,
+        'variances': [
+            {
+                'sku': skus.get(product_id),
+                'expected': str(current.quantize(QUANTUM)),
+                'counted': str(quantity.quantize(QUANTUM)),
+                'variance': str(variance.quantize(QUANTUM)),
+            }
+            for product_id, current, quantity, variance in variances[:MAX_REPORTED_VARIANCES]
+        ],
+        'variances_truncated': len(variances) > MAX_REPORTED_VARIANCES,
+    }
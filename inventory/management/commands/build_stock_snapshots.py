@@ -0,0 +1,25 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_datetime
+
+from inventory.snapshots import PERIODS, SnapshotError, build_snapshots
+
+
+class Command(BaseCommand):
+    help = 'Write stock checkpoints for every complete period since the newest one (incremental).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--period', choices=PERIODS, default=settings.INVENTORY_SNAPSHOT_PERIOD)
+        parser.add_argument('--until', help='Do not checkpoint periods ending after this ISO datetime.')
+
+    def handle(self, *args, **options):
+        until = None
+        if options['until']:
+            until = parse_datetime(options['until'])
+            if until is None or until.tzinfo is None:
+                raise CommandError('--until must be an ISO datetime with a timezone, e.g. 2026-03-31T23:59:59+00:00.')
+        try:
+            periods, rows = build_snapshots(options['period'], until=until)
+        except SnapshotError as exc:
+            raise CommandError(str(exc))
+        self.stdout.write(self.style.SUCCESS(f'{rows} snapshots written for {periods} {options["period"]} periods.'))
@@ -0,0 +1,76 @@
+# Generated by Django 5.0.3 on 2026-10-17 02:03
+
+import django.db.models.deletion
+import django.utils.timezone
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('products', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Location',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('uuid', models.UUIDField(default=uuid.uuid4, editable=False, unique=True)),
+                ('code', models.CharField(max_length=32, unique=True)),
+                ('name', models.CharField(max_length=100)),
+                ('isActive', models.BooleanField(default=True)),
+                ('created_At', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='StockMovement',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('uuid', models.UUIDField(default=uuid.uuid4, editable=False, unique=True)),
+                ('movementType', models.CharField(choices=[('receipt', 'Receipt'), ('issue', 'Issue'), ('transfer', 'Transfer'), ('adjustment', 'Adjustment')], max_length=10)),
+                ('quantity', models.DecimalField(decimal_places=3, max_digits=14)),
+                ('transferGroup', models.UUIDField(blank=True, editable=False, null=True)),
+                ('reference', models.CharField(blank=True, max_length=100)),
+                ('note', models.TextField(blank=True)),
+                ('created_At', models.DateTimeField(default=django.utils.timezone.now, editable=False)),
+                ('location', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='movements', to='inventory.location')),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='movements', to='products.product')),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='StockBalance',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('quantity', models.DecimalField(decimal_places=3, default=0, max_digits=14)),
+                ('updated_At', models.DateTimeField(auto_now=True)),
+                ('location', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='balances', to='inventory.location')),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='balances', to='products.product')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['location', 'product'], name='stockbalance_loc_product_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='stockbalance',
+            constraint=models.UniqueConstraint(fields=('product', 'location'), name='stockbalance_product_location_uniq'),
+        ),
+        migrations.AddIndex(
+            model_name='stockmovement',
+            index=models.Index(fields=['product', 'location', 'created_At', 'id'], name='movement_prod_loc_ts_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='stockmovement',
+            index=models.Index(fields=['location', 'created_At', 'id'], name='movement_loc_ts_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='stockmovement',
+            index=models.Index(fields=['created_At', 'id'], name='movement_ts_id_idx'),
+        ),
+    ]
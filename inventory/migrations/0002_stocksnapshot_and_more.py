@@ -0,0 +1,32 @@
+# Generated by Django 5.0.3 on 2026-10-17 02:07
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0001_initial'),
+        ('products', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StockSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('asOf', models.DateTimeField()),
+                ('quantity', models.DecimalField(decimal_places=3, max_digits=14)),
+                ('location', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='snapshots', to='inventory.location')),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='snapshots', to='products.product')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['asOf'], name='stocksnapshot_asof_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='stocksnapshot',
+            constraint=models.UniqueConstraint(fields=('product', 'location', 'asOf'), name='stocksnapshot_pair_asof_uniq'),
+        ),
+    ]
@@ -0,0 +1,64 @@
+# Generated by Django 5.0.3 on 2026-10-17 02:17
+
+import django.db.models.deletion
+import django.utils.timezone
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0002_stocksnapshot_and_more'),
+        ('products', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LowStockAlert',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('uuid', models.UUIDField(default=uuid.uuid4, editable=False, unique=True)),
+                ('quantity', models.DecimalField(decimal_places=3, max_digits=14)),
+                ('reorderPoint', models.DecimalField(decimal_places=3, max_digits=14)),
+                ('created_At', models.DateTimeField(default=django.utils.timezone.now, editable=False)),
+                ('resolvedAt', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='stockbalance',
+            name='isLow',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+        migrations.AddField(
+            model_name='stockbalance',
+            name='reorderPoint',
+            field=models.DecimalField(blank=True, decimal_places=3, max_digits=14, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='stockbalance',
+            index=models.Index(condition=models.Q(('isLow', True)), fields=['id'], name='stockbalance_low_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='stockbalance',
+            index=models.Index(condition=models.Q(('isLow', True)), fields=['location', 'id'], name='stockbalance_low_loc_idx'),
+        ),
+        migrations.AddField(
+            model_name='lowstockalert',
+            name='location',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='low_stock_alerts', to='inventory.location'),
+        ),
+        migrations.AddField(
+            model_name='lowstockalert',
+            name='product',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='low_stock_alerts', to='products.product'),
+        ),
+        migrations.AddIndex(
+            model_name='lowstockalert',
+            index=models.Index(fields=['created_At', 'id'], name='lowstockalert_ts_id_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='lowstockalert',
+            constraint=models.UniqueConstraint(condition=models.Q(('resolvedAt__isnull', True)), fields=('product', 'location'), name='lowstockalert_open_uniq'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.0.3 on 2026-10-17 02:44
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0003_lowstockalert_and_reorder_points'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='lowstockalert',
+            name='lowstockalert_ts_id_idx',
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.0.3 on 2026-10-17 03:04
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0004_drop_lowstockalert_ts_id_idx'),
+        ('products', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='stockmovement',
+            name='movement_loc_ts_idx',
+        ),
+        migrations.AddIndex(
+            model_name='stockmovement',
+            index=models.Index(fields=['product', 'id'], name='movement_prod_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='stockmovement',
+            index=models.Index(fields=['location', 'id'], name='movement_loc_id_idx'),
+        ),
+    ]
@@ -1,3 +1,169 @@
+import uuid
+
+from django.conf import settings
 from django.db import models
+from django.utils import timezone
+
+from products.models import Product
+
+QUANTITY_DIGITS = 14
+QUANTITY_PLACES = 3
+
+
+class Location(models.Model):
+    """A place stock is held: a store, warehouse, aisle or bin."""
+    uuid = models.UUIDField(default=uuid.uuid4, editable=False, unique=True)
+    code = models.CharField(max_length=32, unique=True)
+    name = models.CharField(max_length=100)
+    isActive = models.BooleanField(default=True)
+    created_At = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f'{self.code} - {self.name}'
+
+
+class StockMovement(models.Model):
+    """
+    One line of the append-only stock ledger.
+
+    ``quantity`` is the signed change at ``location``: receipts are positive,
+    issues negative, adjustments either. A transfer is written as two rows (out
+    of the source, into the destination) sharing a ``transferGroup``. Rows are
+    never updated or deleted; corrections are new adjustment movements.
+    """
+    RECEIPT = 'receipt'
+    ISSUE = 'issue'
+    TRANSFER = 'transfer'
+    ADJUSTMENT = 'adjustment'
+    MOVEMENT_TYPE_CHOICES = [
+        (RECEIPT, 'Receipt'),
+        (ISSUE, 'Issue'),
+        (TRANSFER, 'Transfer'),
+        (ADJUSTMENT, 'Adjustment'),
+    ]
+
+    uuid = models.UUIDField(default=uuid.uuid4, editable=False, unique=True)
+    product = models.ForeignKey(Product, on_delete=models.PROTECT, related_name='movements')
+    location = models.ForeignKey(Location, on_delete=models.PROTECT, related_name='movements')
+    movementType = models.CharField(max_length=10, choices=MOVEMENT_TYPE_CHOICES)
+    quantity = models.DecimalField(max_digits=QUANTITY_DIGITS, decimal_places=QUANTITY_PLACES)
+    transferGroup = models.UUIDField(null=True, blank=True, editable=False)
+    reference = models.CharField(max_length=100, blank=True)
+    note = models.TextField(blank=True)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True)
+    created_At = models.DateTimeField(default=timezone.now, editable=False)
+
+    class Meta:
+        indexes = [
+            # Per product/location history in time order (snapshots, as-of reads)
+            models.Index(fields=['product', 'location', 'created_At', 'id'], name='movement_prod_loc_ts_idx'),
+            models.Index(fields=['created_At', 'id'], name='movement_ts_id_idx'),
+            # Filtered ledger pages, newest id first
+            models.Index(fields=['product', 'id'], name='movement_prod_id_idx'),
+            models.Index(fields=['location', 'id'], name='movement_loc_id_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise ValueError('Stock movements are append-only; record an adjustment instead.')
+        super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        raise ValueError('Stock movements are append-only; record an adjustment instead.')
+
+    def __str__(self):
+        return f'{self.movementType} {self.quantity} {self.product_id}@{self.location_id}'
+
+
+class StockBalance(models.Model):
+    """
+    Materialized on-hand quantity per product and location.
+
+    Maintained by ``inventory.ledger`` in the same transaction as the
+    movements that change it, so reading stock on hand is a single row
+    lookup on the unique (product, location) index.
+
+    ``isLow`` is true while ``quantity`` is at or below ``reorderPoint``. It
+    is flipped by ``inventory.reorder`` when a write crosses the threshold,
+    never by scanning.
+    """
+    product = models.ForeignKey(Product, on_delete=models.PROTECT, related_name='balances')
+    location = models.ForeignKey(Location, on_delete=models.PROTECT, related_name='balances')
+    quantity = models.DecimalField(max_digits=QUANTITY_DIGITS, decimal_places=QUANTITY_PLACES, default=0)
+    reorderPoint = models.DecimalField(
+        max_digits=QUANTITY_DIGITS, decimal_places=QUANTITY_PLACES, null=True, blank=True,
+    )
+    isLow = models.BooleanField(default=False, editable=False)
+    updated_At = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['product', 'location'], name='stockbalance_product_location_uniq'),
+        ]
+        indexes = [
+            # Everything held at one location
+            models.Index(fields=['location', 'product'], name='stockbalance_loc_product_idx'),
+            # The low-stock list, overall and per location; partial, so they only hold the low rows
+            models.Index(fields=['id'], condition=models.Q(isLow=True), name='stockbalance_low_idx'),
+            models.Index(fields=['location', 'id'], condition=models.Q(isLow=True), name='stockbalance_low_loc_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.product_id}@{self.location_id}: {self.quantity}'
+
+
+class StockSnapshot(models.Model):
+    """
+    On-hand quantity of a product at a location as of the end of a period.
+
+    Sparse: ``build_stock_snapshots`` only writes a row for pairs that moved
+    during the period, since the previous checkpoint still holds for the
+    rest. Built by ``inventory.snapshots``; see ``quantity_as_of()``.
+    """
+    product = models.ForeignKey(Product, on_delete=models.PROTECT, related_name='snapshots')
+    location = models.ForeignKey(Location, on_delete=models.PROTECT, related_name='snapshots')
+    asOf = models.DateTimeField()
+    quantity = models.DecimalField(max_digits=QUANTITY_DIGITS, decimal_places=QUANTITY_PLACES)
+
+    class Meta:
+        constraints = [
+            # Also the index behind "latest checkpoint at or before t" for a pair
+            models.UniqueConstraint(fields=['product', 'location', 'asOf'], name='stocksnapshot_pair_asof_uniq'),
+        ]
+        indexes = [
+            # Finding the newest checkpoint to build on
+            models.Index(fields=['asOf'], name='stocksnapshot_asof_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.product_id}@{self.location_id} {self.asOf:%Y-%m-%d}: {self.quantity}'
+
+
+class LowStockAlert(models.Model):
+    """
+    A balance dropping to or below its reorder point.
+
+    Written by ``inventory.reorder`` only when the balance crosses the
+    threshold, so a product that stays low raises one alert, not one per
+    movement. ``resolvedAt`` is stamped when stock climbs back above the
+    reorder point or the reorder point is cleared.
+    """
+    uuid = models.UUIDField(default=uuid.uuid4, editable=False, unique=True)
+    product = models.ForeignKey(Product, on_delete=models.PROTECT, related_name='low_stock_alerts')
+    location = models.ForeignKey(Location, on_delete=models.PROTECT, related_name='low_stock_alerts')
+    quantity = models.DecimalField(max_digits=QUANTITY_DIGITS, decimal_places=QUANTITY_PLACES)
+    reorderPoint = models.DecimalField(max_digits=QUANTITY_DIGITS, decimal_places=QUANTITY_PLACES)
+    created_At = models.DateTimeField(default=timezone.now, editable=False)
+    resolvedAt = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            # At most one open alert per pair; also the index that resolves it
+            models.UniqueConstraint(
+                fields=['product', 'location'], condition=models.Q(resolvedAt__isnull=True),
+                name='lowstockalert_open_uniq',
+            ),
+        ]
 
-# Create your models here.
+    def __str__(self):
+        return f'{self.product_id}@{self.location_id} low at {self.quantity} (reorder point {self.reorderPoint})'
@@ -0,0 +1,82 @@
+"""
+Reorder points and low-stock alerts.
+
+A balance is low while a reorder point is set and ``quantity`` is at or below
+it. ``StockBalance.isLow`` holds that state so the low-stock list is a
+partial-index read, and it is kept current incrementally: the ledger's
+single-statement update excludes rows whose reorder point the movement
+would cross (``crossing()``), and only those rows go through
+``update_balance()``, which locks the row, flips the flag and records the
+transition. A ``LowStockAlert`` is raised when a balance turns low and
+resolved when it recovers, never on movements that leave it where it was.
+"""
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import LowStockAlert, StockBalance
+
+
+def is_low(quantity, reorder_point):
+    return reorder_point is not None and quantity <= reorder_point
+
+
+def crossing(delta):
+    """Balances that a change of ``delta`` would move across their reorder point."""
+    if delta < 0:
+        return Q(isLow=False, reorderPoint__gte=F('quantity') + delta)
+    return Q(isLow=True, reorderPoint__lt=F('quantity') + delta)
+
+
+def raise_alerts(balances, now):
+    """Open an alert for each of ``balances``, which have just turned low."""
+    LowStockAlert.objects.bulk_create([
+        LowStockAlert(
+            product_id=balance.product_id, location_id=balance.location_id, quantity=balance.quantity,
+            reorderPoint=balance.reorderPoint, created_At=now,
+        )
+        for balance in balances
+    ])
+
+
+def resolve_alerts(location_id, product_ids, now):
+    """Close the open alerts of ``product_ids`` at a location, which are no longer low."""
+    LowStockAlert.objects.filter(
+        location_id=location_id, product_id__in=product_ids, resolvedAt__isnull=True,
+    ).update(resolvedAt=now)
+
+
+def record_transition(balance, was_low, now):
+    if balance.isLow and not was_low:
+        raise_alerts([balance], now)
+    elif was_low and not balance.isLow:
+        resolve_alerts(balance.location_id, [balance.product_id], now)
+
+
+def update_balance(balance, quantity, now):
+    """Set a locked ``balance`` to ``quantity``, flipping ``isLow`` and alerting on a crossing."""
+    was_low = balance.isLow
+    balance.quantity = quantity
+    balance.isLow = is_low(quantity, balance.reorderPoint)
+    balance.updated_At = now
+    balance.save(update_fields=['quantity', 'isLow', 'updated_At'])
+    record_transition(balance, was_low, now)
+
+
+def set_reorder_point(product, location, reorder_point):
+    """
+    Set (or clear, with ``None``) the reorder point of a product at a location.
+
+    Creates the balance row at zero if the pair was never stocked, so a new
+    line with a reorder point shows up as low straight away. Returns the
+    balance.
+    """
+    with transaction.atomic():
+        now = timezone.now()
+        balance, _ = StockBalance.objects.select_for_update().get_or_create(product=product, location=location)
+        was_low = balance.isLow
+        balance.reorderPoint = reorder_point
+        balance.isLow = is_low(balance.quantity, reorder_point)
+        balance.save(update_fields=['reorderPoint', 'isLow'])
+        record_transition(balance, was_low, now)
+    return balance
@@ -0,0 +1,118 @@
+from rest_framework import serializers
+from rest_framework.validators import UniqueValidator
+
+from products.models import Product
+from products.serializers import CodeField
+from python_server.metrics import TimedSerializerMixin
+from .cycle_count import MAX_LINES
+from .models import QUANTITY_DIGITS, QUANTITY_PLACES, Location, LowStockAlert, StockBalance, StockMovement
+
+
+class LocationSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    code = CodeField(max_length=32, validators=[UniqueValidator(queryset=Location.objects.all())])
+
+    class Meta:
+        model = Location
+        fields = ['uuid', 'code', 'name', 'isActive', 'created_At']
+
+
+class StockMovementSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    product = serializers.UUIDField(source='product.uuid', read_only=True)
+    sku = serializers.CharField(source='product.sku', read_only=True)
+    location = serializers.UUIDField(source='location.uuid', read_only=True)
+    locationCode = serializers.CharField(source='location.code', read_only=True)
+
+    class Meta:
+        model = StockMovement
+        fields = [
+            'uuid', 'product', 'sku', 'location', 'locationCode', 'movementType', 'quantity',
+            'transferGroup', 'reference', 'note', 'created_At',
+        ]
+
+
+class MovementRequestSerializer(TimedSerializerMixin, serializers.Serializer):
+    """Input for recording a movement; ``toLocation`` is only used by transfers."""
+    product = serializers.SlugRelatedField(slug_field='uuid', queryset=Product.objects.all())
+    location = serializers.SlugRelatedField(slug_field='uuid', queryset=Location.objects.filter(isActive=True))
+    toLocation = serializers.SlugRelatedField(
+        slug_field='uuid', queryset=Location.objects.filter(isActive=True), required=False, allow_null=True,
+    )
+    movementType = serializers.ChoiceField(choices=StockMovement.MOVEMENT_TYPE_CHOICES)
+    quantity = serializers.DecimalField(max_digits=QUANTITY_DIGITS, decimal_places=QUANTITY_PLACES)
+    reference = serializers.CharField(max_length=100, required=False, allow_blank=True, default='')
+    note = serializers.CharField(required=False, allow_blank=True, default='')
+
+    def validate(self, attrs):
+        movement_type = attrs['movementType']
+        if movement_type == StockMovement.ADJUSTMENT:
+            if attrs['quantity'] == 0:
+                raise serializers.ValidationError({'quantity': 'An adjustment cannot be zero.'})
+        elif attrs['quantity'] <= 0:
+            raise serializers.ValidationError({'quantity': 'Quantity must be greater than zero.'})
+        if movement_type == StockMovement.TRANSFER:
+            to_location = attrs.get('toLocation')
+            if to_location is None:
+                raise serializers.ValidationError({'toLocation': 'A transfer needs a destination location.'})
+            if to_location == attrs['location']:
+                raise serializers.ValidationError({'toLocation': 'The destination must differ from the source.'})
+        elif attrs.get('toLocation') is not None:
+            raise serializers.ValidationError({'toLocation': 'Only transfers take a destination location.'})
+        return attrs
+
+
+class StockBalanceSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    product = serializers.UUIDField(source='product.uuid', read_only=True)
+    sku = serializers.CharField(source='product.sku', read_only=True)
+    location = serializers.UUIDField(source='location.uuid', read_only=True)
+    locationCode = serializers.CharField(source='location.code', read_only=True)
+
+    class Meta:
+        model = StockBalance
+        fields = ['product', 'sku', 'location', 'locationCode', 'quantity', 'reorderPoint', 'isLow', 'updated_At']
+
+
+class StockBalanceAsOfSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    """A balance row annotated by ``snapshots.annotate_as_of()``."""
+    product = serializers.UUIDField(source='product.uuid', read_only=True)
+    sku = serializers.CharField(source='product.sku', read_only=True)
+    location = serializers.UUIDField(source='location.uuid', read_only=True)
+    locationCode = serializers.CharField(source='location.code', read_only=True)
+    quantity = serializers.DecimalField(
+        source='quantityAsOf', max_digits=QUANTITY_DIGITS, decimal_places=QUANTITY_PLACES, read_only=True,
+    )
+
+    class Meta:
+        model = StockBalance
+        fields = ['product', 'sku', 'location', 'locationCode', 'quantity']
+
+
+class CycleCountRequestSerializer(TimedSerializerMixin, serializers.Serializer):
+    """
+    A count sheet for one location. ``lines`` are checked by
+    ``cycle_count.clean_lines()``, which validates thousands of lines far
+    faster than nested serializers would.
+    """
+    location = serializers.SlugRelatedField(slug_field='uuid', queryset=Location.objects.filter(isActive=True))
+    lines = serializers.ListField(allow_empty=False, max_length=MAX_LINES)
+    reference = serializers.CharField(max_length=100, required=False, allow_blank=True, default='')
+    note = serializers.CharField(required=False, allow_blank=True, default='')
+
+
+class ReorderPointRequestSerializer(TimedSerializerMixin, serializers.Serializer):
+    """Input for setting a reorder point; ``null`` clears it."""
+    product = serializers.SlugRelatedField(slug_field='uuid', queryset=Product.objects.all())
+    location = serializers.SlugRelatedField(slug_field='uuid', queryset=Location.objects.filter(isActive=True))
+    reorderPoint = serializers.DecimalField(
+        max_digits=QUANTITY_DIGITS, decimal_places=QUANTITY_PLACES, min_value=0, allow_null=True,
+    )
+
+
+class LowStockAlertSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    product = serializers.UUIDField(source='product.uuid', read_only=True)
+    sku = serializers.CharField(source='product.sku', read_only=True)
+    location = serializers.UUIDField(source='location.uuid', read_only=True)
+    locationCode = serializers.CharField(source='location.code', read_only=True)
+
+    class Meta:
+        model = LowStockAlert
+        fields = ['uuid', 'product', 'sku', 'location', 'locationCode', 'quantity', 'reorderPoint', 'created_At', 'resolvedAt']
@@ -0,0 +1,10 @@
+from celery import shared_task
+from django.conf import settings
+
+from .snapshots import build_snapshots
+
+
+@shared_task
+def build_stock_snapshots(period=None):
+    """Periodic: checkpoint stock for every newly completed period."""
+    return build_snapshots(period or settings.INVENTORY_SNAPSHOT_PERIOD)
@@ -1,3 +1,477 @@
-from django.test import TestCase
+import multiprocessing
+import random
+from datetime import datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
 
-# Create your tests here.
+from django.db import connection, connections
+from django.db.models import Sum
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from categories.models import Category
+from products.models import Product
+from users.models import User, UserProfile
+from . import ledger
+from .models import Location, LowStockAlert, StockBalance, StockMovement, StockSnapshot
+from .reorder import set_reorder_point
+from .snapshots import build_snapshots, quantity_as_of, replay_as_of
+
+
+def make_user(email, role):
+    user = User.objects.create_user(email=email, password='user-pass-123')
+    UserProfile.objects.create(user=user, role=role)
+    return user
+
+
+def make_stock_fixtures():
+    category = Category.objects.create(categoryName='Spares')
+    product = Product.objects.create(sku='BOLT-M8', barcode='8900000000011', productName='M8 bolt', category=category)
+    store = Location.objects.create(code='MAIN', name='Main store')
+    aisle = Location.objects.create(code='A-01', name='Aisle 1')
+    return product, store, aisle
+
+
+def ledger_total(product, location):
+    total = StockMovement.objects.filter(product=product, location=location).aggregate(total=Sum('quantity'))['total']
+    return total or Decimal('0')
+
+
+class LedgerTests(TestCase):
+    def setUp(self):
+        self.product, self.store, self.aisle = make_stock_fixtures()
+
+    def test_movements_keep_the_balance_equal_to_the_ledger(self):
+        ledger.record_movement(self.product, self.store, StockMovement.RECEIPT, Decimal('10'))
+        ledger.record_movement(self.product, self.store, StockMovement.ISSUE, Decimal('3'))
+        ledger.record_movement(self.product, self.store, StockMovement.ADJUSTMENT, Decimal('-0.5'))
+        out, into = ledger.transfer(self.product, self.store, self.aisle, Decimal('4'))
+
+        self.assertEqual(out.transferGroup, into.transferGroup)
+        self.assertEqual((out.quantity, into.quantity), (Decimal('-4'), Decimal('4')))
+        self.assertEqual(ledger.on_hand(self.product, self.store), Decimal('2.5'))
+        self.assertEqual(ledger.on_hand(self.product, self.aisle), Decimal('4'))
+        for location in (self.store, self.aisle):
+            self.assertEqual(ledger.on_hand(self.product, location), ledger_total(self.product, location))
+
+    def test_cannot_remove_more_than_is_on_hand(self):
+        ledger.record_movement(self.product, self.store, StockMovement.RECEIPT, Decimal('2'))
+        with self.assertRaises(ledger.InsufficientStock):
+            ledger.record_movement(self.product, self.store, StockMovement.ISSUE, Decimal('3'))
+        with self.assertRaises(ledger.InsufficientStock):
+            ledger.transfer(self.product, self.store, self.aisle, Decimal('5'))
+        with self.assertRaises(ledger.InsufficientStock):
+            ledger.record_movement(self.product, self.aisle, StockMovement.ISSUE, Decimal('1'))
+        # Nothing half-applied: no stray movements, no balance row at the aisle
+        self.assertEqual(StockMovement.objects.count(), 1)
+        self.assertEqual(ledger.on_hand(self.product, self.store), Decimal('2'))
+        self.assertFalse(StockBalance.objects.filter(location=self.aisle).exists())
+
+    def test_movements_are_append_only(self):
+        movement = ledger.record_movement(self.product, self.store, StockMovement.RECEIPT, Decimal('1'))
+        movement.quantity = Decimal('100')
+        with self.assertRaises(ValueError):
+            movement.save()
+        with self.assertRaises(ValueError):
+            movement.delete()
+
+
+class InventoryAPITests(TestCase):
+    def setUp(self):
+        self.product, self.store, self.aisle = make_stock_fixtures()
+        self.client = APIClient()
+        self.client.force_authenticate(make_user('store@example.com', 'storekeeper'))
+
+    def post_movement(self, client=None, **data):
+        payload = {'product': str(self.product.uuid), 'location': str(self.store.uuid), **data}
+        return (client or self.client).post('/api/inventory/movements/', payload, format='json')
+
+    def test_record_receipt_and_transfer(self):
+        response = self.post_movement(movementType='receipt', quantity='12', reference='PO-1')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['balances'][0]['quantity'], '12.000')
+
+        response = self.post_movement(movementType='transfer', quantity='5', toLocation=str(self.aisle.uuid))
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(
+            {b['locationCode']: b['quantity'] for b in response.data['balances']},
+            {'MAIN': '7.000', 'A-01': '5.000'},
+        )
+
+        response = self.post_movement(movementType='issue', quantity='8')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('Not enough stock', response.data['message'])
+
+    def test_on_hand_is_a_single_row_read(self):
+        ledger.record_movement(self.product, self.store, StockMovement.RECEIPT, Decimal('3'))
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/inventory/balances/on-hand/', {
+                'product': str(self.product.uuid), 'location': str(self.store.uuid),
+            })
+        self.assertEqual(response.data['quantity'], '3.000')
+        response = self.client.get('/api/inventory/balances/on-hand/', {
+            'product': str(self.product.uuid), 'location': str(self.aisle.uuid),
+        })
+        self.assertEqual(response.data['quantity'], '0.000')
+
+    def test_only_inventory_roles_record_movements(self):
+        requester = APIClient()
+        requester.force_authenticate(make_user('req@example.com', 'requester'))
+        self.assertEqual(self.post_movement(requester, movementType='receipt', quantity='1').status_code, 403)
+        self.assertEqual(requester.get('/api/inventory/movements/').status_code, 200)
+
+    def test_movement_pages_cover_rows_sharing_a_timestamp(self):
+        # More tied rows than DRF's cursor offset cap (1000), as one bulk write produces
+        now = datetime(2026, 3, 1, 9, 0, tzinfo=dt_timezone.utc)
+        StockMovement.objects.bulk_create(
+            StockMovement(product=self.product, location=self.store, movementType='receipt', quantity=1, created_At=now)
+            for _ in range(1250)
+        )
+        seen = []
+        url = '/api/inventory/movements/?page_size=300'
+        while url:
+            response = self.client.get(url)
+            seen.extend(movement['uuid'] for movement in response.data['movements'])
+            url = response.data['next']
+        self.assertEqual(len(seen), 1250)
+        self.assertEqual(len(set(seen)), 1250)
+
+    def test_stocked_products_and_locations_cannot_be_deleted(self):
+        admin = APIClient()
+        admin.force_authenticate(make_user('admin@example.com', 'admin'))
+        ledger.record_movement(self.product, self.store, StockMovement.RECEIPT, Decimal('1'))
+        response = admin.delete(f'/api/products/{self.product.uuid}/')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('cannot be deleted', response.data['message'])
+        response = admin.delete(f'/api/inventory/locations/{self.store.uuid}/')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('cannot be deleted', response.data['message'])
+        self.assertTrue(Product.objects.filter(pk=self.product.pk).exists())
+        self.assertTrue(Location.objects.filter(pk=self.store.pk).exists())
+        self.assertEqual(admin.delete(f'/api/inventory/locations/{self.aisle.uuid}/').status_code, 204)
+
+
+class StockSnapshotTests(TestCase):
+    START = datetime(2026, 3, 1, 9, 0, tzinfo=dt_timezone.utc)
+
+    def setUp(self):
+        self.product, self.store, self.aisle = make_stock_fixtures()
+
+    def move(self, location, movement_type, quantity, days, hours=0):
+        """Record a movement and backdate it (the ledger itself always stamps now)."""
+        movement = ledger.record_movement(self.product, location, movement_type, Decimal(quantity))
+        StockMovement.objects.filter(pk=movement.pk).update(
+            created_At=self.START + timedelta(days=days, hours=hours)
+        )
+
+    def test_checkpoint_plus_delta_matches_full_replay(self):
+        self.move(self.store, 'receipt', '100', 0)
+        self.move(self.store, 'issue', '10', 0, 5)
+        self.move(self.aisle, 'receipt', '7', 2)
+        self.move(self.store, 'issue', '25', 9)
+        self.move(self.store, 'adjustment', '-1.5', 30, 2)
+
+        periods, rows = build_snapshots('daily', until=self.START + timedelta(days=31))
+        # Sparse: one checkpoint per pair and day with movements, nothing for quiet days
+        self.assertEqual((periods, rows), (4, 4))
+        self.assertEqual(build_snapshots('daily', until=self.START + timedelta(days=31)), (0, 0))
+
+        for days in (-1, 0, 1, 2.5, 9, 15, 30, 30.5, 40):
+            moment = self.START + timedelta(days=days)
+            for location in (self.store, self.aisle):
+                self.assertEqual(
+                    quantity_as_of(self.product, location, moment),
+                    replay_as_of(self.product, location, moment),
+                )
+        self.assertEqual(quantity_as_of(self.product, self.store, self.START + timedelta(days=20)), Decimal('65'))
+
+    def test_build_is_incremental(self):
+        self.move(self.store, 'receipt', '5', 0)
+        build_snapshots('monthly', until=self.START + timedelta(days=40))
+        self.move(self.store, 'receipt', '3', 45)
+        self.assertEqual(build_snapshots('monthly', until=self.START + timedelta(days=70)), (1, 1))
+        latest = StockSnapshot.objects.order_by('-asOf').first()
+        self.assertEqual(latest.quantity, Decimal('8'))
+        self.assertEqual(latest.asOf, datetime(2026, 5, 1, tzinfo=dt_timezone.utc))
+
+    def test_as_of_endpoint(self):
+        self.move(self.store, 'receipt', '100', 0)
+        self.move(self.store, 'issue', '40', 20)
+        build_snapshots('daily', until=self.START + timedelta(days=25))
+        client = APIClient()
+        client.force_authenticate(make_user('auditor@example.com', 'inventorymanager'))
+        response = client.get('/api/inventory/balances/as-of/', {'at': '2026-03-15', 'product': str(self.product.uuid)})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([b['quantity'] for b in response.data['balances']], ['100.000'])
+        response = client.get('/api/inventory/balances/as-of/', {'at': '2026-03-31'})
+        self.assertEqual([b['quantity'] for b in response.data['balances']], ['60.000'])
+        self.assertEqual(client.get('/api/inventory/balances/as-of/', {'at': 'last week'}).status_code, 400)
+
+
+class CycleCountTests(TestCase):
+    def setUp(self):
+        self.product, self.store, self.aisle = make_stock_fixtures()
+        self.client = APIClient()
+        self.client.force_authenticate(make_user('store@example.com', 'storekeeper'))
+
+    def submit(self, lines, client=None, location=None):
+        return (client or self.client).post('/api/inventory/cycle-counts/', {
+            'location': str((location or self.store).uuid), 'lines': lines, 'reference': 'Aisle count',
+        }, format='json')
+
+    def test_variances_become_adjustments_and_balances_match_the_count(self):
+        others = [
+            Product.objects.create(sku=f'NUT-{i}', productName=f'Nut {i}', category=self.product.category)
+            for i in range(3)
+        ]
+        ledger.record_movement(self.product, self.store, StockMovement.RECEIPT, Decimal('10'))
+        ledger.record_movement(others[0], self.store, StockMovement.RECEIPT, Decimal('4'))
+        ledger.record_movement(others[1], self.store, StockMovement.RECEIPT, Decimal('2'))
+
+        response = self.submit([
+            {'code': 'bolt-m8', 'quantity': '6'},
+            {'code': '8900000000011', 'quantity': '1.5'},  # same product by barcode, counted elsewhere
+            {'product': str(others[0].uuid), 'quantity': 4},
+            {'code': 'NUT-1', 'quantity': 0},
+            {'code': 'NUT-2', 'quantity': '3'},  # never stocked here
+        ])
+        self.assertEqual(response.status_code, 201)
+        report = response.data['report']
+        self.assertEqual((report['lines'], report['adjusted'], report['unchanged']), (4, 3, 1))
+        self.assertIn({'sku': 'BOLT-M8', 'expected': '10.000', 'counted': '7.500', 'variance': '-2.500'}, report['variances'])
+
+        expected = {self.product: '7.5', others[0]: '4', others[1]: '0', others[2]: '3'}
+        for product, quantity in expected.items():
+            self.assertEqual(ledger.on_hand(product, self.store), Decimal(quantity))
+            self.assertEqual(ledger_total(product, self.store), Decimal(quantity))
+        self.assertEqual(
+            StockMovement.objects.filter(movementType='adjustment', reference='Aisle count').count(), 3
+        )
+
+    def test_large_sheet_uses_a_bounded_number_of_queries(self):
+        category = self.product.category
+        products = Product.objects.bulk_create(
+            Product(sku=f'BULK-{i}', productName=f'Bulk {i}', category=category) for i in range(2000)
+        )
+        for product in products[:1000]:
+            StockBalance.objects.create(product=product, location=self.store, quantity=5)
+        lines = [{'code': product.sku, 'quantity': i % 7} for i, product in enumerate(products)]
+        with CaptureQueriesContext(connection) as captured:
+            response = self.submit(lines)
+        self.assertEqual(response.status_code, 201)
+        # Set-based: queries grow with batches, not lines (about 8 on PostgreSQL;
+        # SQLite's 999-parameter cap splits the inserts into more batches)
+        self.assertLess(len(captured.captured_queries), len(lines) // 40)
+        new_rows = sum(1 for i in range(1000, 2000) if i % 7)
+        self.assertEqual(StockBalance.objects.filter(location=self.store).count(), 1000 + new_rows)
+        for i in (0, 999, 1000, 1999):
+            self.assertEqual(ledger.on_hand(products[i], self.store), Decimal(i % 7))
+
+    def test_invalid_lines_record_nothing(self):
+        response = self.submit([
+            {'code': 'BOLT-M8', 'quantity': '5'},
+            {'code': 'MISSING', 'quantity': '1'},
+            {'code': 'BOLT-M8', 'quantity': '-1'},
+            {'quantity': '2'},
+        ])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual([error['line'] for error in response.data['errors']], [2, 3, 4])
+        self.assertFalse(StockMovement.objects.exists())
+
+    def test_lines_adding_up_past_the_column_are_line_errors(self):
+        big = '99999999999'
+        response = self.submit([
+            {'code': 'BOLT-M8', 'quantity': big},
+            {'code': '8900000000011', 'quantity': big},
+            {'product': str(self.product.uuid), 'quantity': big},
+        ])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual([error['line'] for error in response.data['errors']], [2, 3])
+        self.assertIn('add up to', response.data['errors'][0]['errors']['quantity'])
+        self.assertFalse(StockMovement.objects.exists())
+
+    def test_an_exact_sku_wins_over_a_clashing_barcode(self):
+        # Saved before the serializer rejected SKU/barcode clashes
+        clash = Product.objects.create(sku='CLASH-1', barcode='NUT-9', productName='Clash', category=self.product.category)
+        nut = Product.objects.create(sku='NUT-9', productName='Nut 9', category=self.product.category)
+        self.assertEqual(self.submit([{'code': 'NUT-9', 'quantity': 2}]).status_code, 201)
+        self.assertEqual(ledger.on_hand(nut, self.store), Decimal('2'))
+        self.assertEqual(ledger.on_hand(clash, self.store), Decimal('0'))
+
+    def test_requires_an_inventory_role(self):
+        requester = APIClient()
+        requester.force_authenticate(make_user('req@example.com', 'requester'))
+        self.assertEqual(self.submit([{'code': 'BOLT-M8', 'quantity': 1}], client=requester).status_code, 403)
+
+
+class ReorderPointTests(TestCase):
+    def setUp(self):
+        self.product, self.store, self.aisle = make_stock_fixtures()
+        self.client = APIClient()
+        self.client.force_authenticate(make_user('manager@example.com', 'inventorymanager'))
+
+    def move(self, movement_type, quantity, location=None):
+        ledger.record_movement(self.product, location or self.store, movement_type, Decimal(quantity))
+
+    def balance(self, location=None):
+        return StockBalance.objects.get(product=self.product, location=location or self.store)
+
+    def test_alerts_are_raised_only_on_the_crossing(self):
+        self.move('receipt', '10')
+        response = self.client.post('/api/inventory/reorder-points/', {
+            'product': str(self.product.uuid), 'location': str(self.store.uuid), 'reorderPoint': '4',
+        }, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['balance']['reorderPoint'], '4.000')
+
+        # Movements that cross nothing stay a single write-first UPDATE, with no read
+        with CaptureQueriesContext(connection) as captured:
+            self.move('issue', '3')
+        self.assertFalse([q for q in captured.captured_queries if q['sql'].startswith('SELECT')])
+        self.assertFalse(LowStockAlert.objects.exists())
+
+        self.move('issue', '3')  # 4: at the reorder point
+        self.move('issue', '1')  # still low, no second alert
+        alert = LowStockAlert.objects.get()
+        self.assertEqual((alert.quantity, alert.reorderPoint, alert.resolvedAt), (Decimal('4'), Decimal('4'), None))
+        self.assertTrue(self.balance().isLow)
+
+        self.move('receipt', '10')
+        alert.refresh_from_db()
+        self.assertIsNotNone(alert.resolvedAt)
+        self.assertFalse(self.balance().isLow)
+
+        ledger.transfer(self.product, self.store, self.aisle, Decimal('11'))
+        self.assertEqual(LowStockAlert.objects.filter(resolvedAt__isnull=True).count(), 1)
+        self.assertEqual(LowStockAlert.objects.count(), 2)
+
+    def test_low_stock_lists_the_current_low_set(self):
+        self.move('receipt', '2')
+        self.move('receipt', '50', self.aisle)
+        set_reorder_point(self.product, self.store, Decimal('5'))
+        set_reorder_point(self.product, self.aisle, Decimal('5'))
+        other = Product.objects.create(sku='NUT-1', productName='Nut', category=self.product.category)
+        set_reorder_point(other, self.aisle, Decimal('1'))  # never stocked: low at zero
+
+        response = self.client.get('/api/inventory/low-stock/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual({(b['sku'], b['locationCode']) for b in response.data['balances']},
+                         {('BOLT-M8', 'MAIN'), ('NUT-1', 'A-01')})
+        response = self.client.get('/api/inventory/low-stock/', {'location': str(self.aisle.uuid)})
+        self.assertEqual([b['sku'] for b in response.data['balances']], ['NUT-1'])
+
+        # Clearing the reorder point takes it off the list and resolves its alert
+        set_reorder_point(self.product, self.store, None)
+        response = self.client.get('/api/inventory/low-stock-alerts/', {'open': 'true'})
+        self.assertEqual([a['sku'] for a in response.data['alerts']], ['NUT-1'])
+        self.assertEqual(self.client.get('/api/inventory/low-stock/').data['count'], 1)
+
+    def test_cycle_count_crossings_raise_and_resolve_alerts(self):
+        other = Product.objects.create(sku='NUT-1', productName='Nut', category=self.product.category)
+        self.move('receipt', '10')
+        set_reorder_point(self.product, self.store, Decimal('5'))
+        set_reorder_point(other, self.store, Decimal('5'))  # low at zero
+
+        response = self.client.post('/api/inventory/cycle-counts/', {'location': str(self.store.uuid), 'lines': [
+            {'code': 'BOLT-M8', 'quantity': '3'},
+            {'code': 'NUT-1', 'quantity': '8'},
+        ]}, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(self.balance().isLow)
+        self.assertEqual(
+            set(LowStockAlert.objects.filter(resolvedAt__isnull=True).values_list('product__sku', flat=True)),
+            {'BOLT-M8'},
+        )
+
+    def test_alert_pages_cover_alerts_sharing_a_timestamp(self):
+        # A bulk count stamps every crossing with one `now`; more of them than the cursor's offset cap
+        now = datetime(2026, 3, 1, 9, 0, tzinfo=dt_timezone.utc)
+        LowStockAlert.objects.bulk_create(
+            LowStockAlert(product=self.product, location=self.store, quantity=1, reorderPoint=2,
+                          created_At=now, resolvedAt=now)
+            for _ in range(1250)
+        )
+        seen = []
+        url = '/api/inventory/low-stock-alerts/?page_size=300'
+        while url:
+            response = self.client.get(url)
+            seen.extend(alert['uuid'] for alert in response.data['alerts'])
+            url = response.data['next']
+        self.assertEqual(len(seen), 1250)
+        self.assertEqual(len(set(seen)), 1250)
+
+    def test_requires_an_inventory_role(self):
+        requester = APIClient()
+        requester.force_authenticate(make_user('req@example.com', 'requester'))
+        response = requester.post('/api/inventory/reorder-points/', {
+            'product': str(self.product.uuid), 'location': str(self.store.uuid), 'reorderPoint': '4',
+        }, format='json')
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(requester.get('/api/inventory/low-stock/').status_code, 200)
+
+
+def hammer(args):
+    """Worker process: a random mix of issues, receipts and transfers; returns what succeeded."""
+    product_id, location_ids, seed, operations = args
+    # Connections inherited over fork must not be reused
+    for conn in connections.all():
+        conn.connection = None
+    rng = random.Random(seed)
+    product = Product.objects.get(pk=product_id)
+    locations = list(Location.objects.filter(pk__in=location_ids))
+    done = {'receipt': 0, 'issue': 0, 'transfer': 0, 'rejected': 0}
+    for _ in range(operations):
+        roll = rng.random()
+        try:
+            if roll < 0.45:
+                ledger.record_movement(product, rng.choice(locations), StockMovement.ISSUE, Decimal('1'))
+                done['issue'] += 1
+            elif roll < 0.6:
+                ledger.record_movement(product, rng.choice(locations), StockMovement.RECEIPT, Decimal('1'))
+                done['receipt'] += 1
+            else:
+                source, destination = rng.sample(locations, 2)
+                ledger.transfer(product, source, destination, Decimal('2'))
+                done['transfer'] += 1
+        except ledger.InsufficientStock:
+            done['rejected'] += 1
+    connections.close_all()
+    return done
+
+
+class ConcurrentLedgerTests(TransactionTestCase):
+    WORKERS = 6
+    OPERATIONS = 120
+    INITIAL = Decimal('50')
+
+    def setUp(self):
+        # Checked here, not at import, because only now does the connection point at the test database
+        if connection.vendor == 'sqlite' and connection.is_in_memory_db():
+            self.skipTest('Needs a database other processes can open: set SQLITE_TEST_NAME to a file or use PostgreSQL.')
+
+    def test_concurrent_writers_never_lose_updates_or_go_negative(self):
+        product, store, aisle = make_stock_fixtures()
+        locations = [store, aisle]
+        for location in locations:
+            ledger.record_movement(product, location, StockMovement.RECEIPT, self.INITIAL)
+        connections.close_all()
+
+        # Separate processes, like gunicorn workers, each with its own connection
+        jobs = [(product.pk, [loc.pk for loc in locations], seed, self.OPERATIONS) for seed in range(self.WORKERS)]
+        with multiprocessing.get_context('fork').Pool(self.WORKERS) as pool:
+            results = pool.map(hammer, jobs)
+
+        done = {key: sum(result[key] for result in results) for key in results[0]}
+        self.assertEqual(sum(done.values()), self.WORKERS * self.OPERATIONS)
+        self.assertGreater(done['rejected'], 0)  # the stock really ran out under contention
+        self.assertEqual(
+            StockMovement.objects.count(),
+            len(locations) + done['receipt'] + done['issue'] + 2 * done['transfer'],
+        )
+        total = Decimal('0')
+        for location in locations:
+            balance = ledger.on_hand(product, location)
+            self.assertGreaterEqual(balance, 0)
+            self.assertEqual(balance, ledger_total(product, location))
+            total += balance
+        self.assertEqual(total, len(locations) * self.INITIAL + done['receipt'] - done['issue'])
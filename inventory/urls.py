@@ -0,0 +1,16 @@
+from rest_framework.routers import SimpleRouter
+from .views import (
+    CycleCountViewSet, LocationViewSet, LowStockAlertViewSet, LowStockViewSet, ReorderPointViewSet, StockBalanceViewSet,
+    StockMovementViewSet,
+)
+
+router = SimpleRouter()
+router.register(r'locations', LocationViewSet, basename='location')
+router.register(r'movements', StockMovementViewSet, basename='stock-movement')
+router.register(r'balances', StockBalanceViewSet, basename='stock-balance')
+router.register(r'cycle-counts', CycleCountViewSet, basename='cycle-count')
+router.register(r'reorder-points', ReorderPointViewSet, basename='reorder-point')
+router.register(r'low-stock', LowStockViewSet, basename='low-stock')
+router.register(r'low-stock-alerts', LowStockAlertViewSet, basename='low-stock-alert')
+
+urlpatterns = router.urls
@@ -1,3 +1,400 @@
-from django.shortcuts import render
+from datetime import datetime, time, timedelta
 
-# Create your views here.
+from django.db.models import ProtectedError
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from django_filters import rest_framework as filters
+from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework import mixins, viewsets, status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiParameter, OpenApiTypes
+
+from users.permissions import IsAdminOrReadOnly, IsInventoryRole
+from python_server.pagination import KeysetPagination
+from python_server.metrics import TimedPermissionsMixin
+from . import ledger, reorder
+from .cycle_count import CycleCountError, clean_lines, reconcile
+from .snapshots import annotate_as_of
+from .models import QUANTITY_PLACES, Location, LowStockAlert, StockBalance, StockMovement
+from .serializers import (
+    CycleCountRequestSerializer, LocationSerializer, LowStockAlertSerializer, MovementRequestSerializer,
+    ReorderPointRequestSerializer, StockBalanceAsOfSerializer, StockBalanceSerializer, StockMovementSerializer,
+)
+
+
+def parse_moment(value):
+    """An ISO datetime, or a date meaning the close of that (local) day; None if invalid."""
+    moment = parse_datetime(value)
+    if moment is not None:
+        return moment if timezone.is_aware(moment) else timezone.make_aware(moment)
+    day = parse_date(value)
+    if day is None:
+        return None
+    return timezone.make_aware(datetime.combine(day + timedelta(days=1), time.min)) - timedelta(microseconds=1)
+
+
+class InventoryPagination(KeysetPagination):
+    # Always on: ledgers and balance tables grow with every product and location
+    page_size = 100
+    max_page_size = 1000
+
+
+@extend_schema_view(
+    list=extend_schema(summary="List locations", tags=["Inventory"]),
+    retrieve=extend_schema(summary="Retrieve a location", tags=["Inventory"]),
+    create=extend_schema(summary="Create a location", tags=["Inventory"]),
+    update=extend_schema(summary="Update a location", tags=["Inventory"]),
+    partial_update=extend_schema(summary="Partially update a location", tags=["Inventory"]),
+    destroy=extend_schema(summary="Delete a location", tags=["Inventory"]),
+)
+class LocationViewSet(TimedPermissionsMixin, viewsets.ModelViewSet):
+    """API endpoints for stock locations."""
+    queryset = Location.objects.all()
+    serializer_class = LocationSerializer
+    permission_classes = [IsAdminOrReadOnly]
+    lookup_field = 'uuid'
+    lookup_url_kwarg = 'id'
+    pagination_class = KeysetPagination  # Opt-in with ?page_size=N
+    filter_backends = [DjangoFilterBackend]
+    filterset_fields = ['isActive']
+    ordering = ('code',)
+
+    def destroy(self, request, *args, **kwargs):
+        code = self.get_object().code
+        try:
+            return super().destroy(request, *args, **kwargs)
+        except ProtectedError:
+            # The ledger is append-only, so a location that held stock stays; deactivate it instead
+            return Response({
+                'success': False,
+                'message': f'Location "{code}" has stock records and cannot be deleted; set isActive to false instead'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+
+class MovementFilter(filters.FilterSet):
+    # Filter on the uuids clients know; both are unique-indexed on their own tables
+    product = filters.UUIDFilter(field_name='product__uuid')
+    location = filters.UUIDFilter(field_name='location__uuid')
+
+    class Meta:
+        model = StockMovement
+        fields = ['product', 'location', 'movementType']
+
+
+class BalanceFilter(filters.FilterSet):
+    product = filters.UUIDFilter(field_name='product__uuid')
+    location = filters.UUIDFilter(field_name='location__uuid')
+
+    class Meta:
+        model = StockBalance
+        fields = ['product', 'location']
+
+
+class LowStockFilter(filters.FilterSet):
+    # By location only, which the partial (location, id) index serves
+    location = filters.UUIDFilter(field_name='location__uuid')
+
+    class Meta:
+        model = StockBalance
+        fields = ['location']
+
+
+class LowStockAlertFilter(filters.FilterSet):
+    product = filters.UUIDFilter(field_name='product__uuid')
+    location = filters.UUIDFilter(field_name='location__uuid')
+    open = filters.BooleanFilter(field_name='resolvedAt', lookup_expr='isnull')
+
+    class Meta:
+        model = LowStockAlert
+        fields = ['product', 'location', 'open']
+
+
+@extend_schema_view(
+    list=extend_schema(
+        summary="List stock movements",
+        description="The stock ledger, newest first, keyset-paginated (default 100 per page). "
+                    "Filter by product, location (uuids) and movementType.",
+        tags=["Inventory"]
+    ),
+    retrieve=extend_schema(summary="Retrieve a stock movement", tags=["Inventory"]),
+    create=extend_schema(
+        summary="Record a stock movement",
+        description="Record a receipt, issue, adjustment (signed quantity) or transfer (needs toLocation). "
+                    "The balances change in the same transaction; removing more than is on hand is rejected.",
+        tags=["Inventory"],
+        request=MovementRequestSerializer,
+    ),
+)
+class StockMovementViewSet(TimedPermissionsMixin, mixins.ListModelMixin, mixins.RetrieveModelMixin, mixins.CreateModelMixin,
+                           viewsets.GenericViewSet):
+    """The append-only stock ledger: no update or delete endpoints."""
+    queryset = StockMovement.objects.select_related('product', 'location')
+    serializer_class = StockMovementSerializer
+    permission_classes = [IsInventoryRole]
+    lookup_field = 'uuid'
+    lookup_url_kwarg = 'id'
+    pagination_class = InventoryPagination
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = MovementFilter
+    # Rows written together share a timestamp, so page on the primary key (ids grow
+    # in insertion order); filtered pages use the (product, id)/(location, id) indexes
+    ordering = ('-id',)
+
+    def list(self, request, *args, **kwargs):
+        page = self.paginate_queryset(self.filter_queryset(self.get_queryset()))
+        serializer = self.get_serializer(page, many=True)
+        data = {
+            'success': True,
+            'message': 'Stock movements retrieved successfully',
+            'count': len(serializer.data),
+            'movements': serializer.data
+        }
+        data.update(self.paginator.get_pagination_data())
+        return Response(data, status=status.HTTP_200_OK)
+
+    def retrieve(self, request, *args, **kwargs):
+        response = super().retrieve(request, *args, **kwargs)
+        return Response({
+            'success': True,
+            'message': 'Stock movement retrieved successfully',
+            'movement': response.data
+        }, status=status.HTTP_200_OK)
+
+    def create(self, request, *args, **kwargs):
+        serializer = MovementRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        options = {'user_id': request.user.pk, 'reference': data['reference'], 'note': data['note']}
+        try:
+            if data['movementType'] == StockMovement.TRANSFER:
+                movements = ledger.transfer(
+                    data['product'], data['location'], data['toLocation'], data['quantity'], **options
+                )
+            else:
+                movements = (ledger.record_movement(
+                    data['product'], data['location'], data['movementType'], data['quantity'], **options
+                ),)
+        except ledger.StockError as exc:
+            return Response({'success': False, 'message': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        balances = StockBalance.objects.select_related('product', 'location').filter(
+            product=data['product'], location__in=[movement.location for movement in movements],
+        )
+        return Response({
+            'success': True,
+            'message': 'Stock movement recorded successfully',
+            'movements': StockMovementSerializer(movements, many=True).data,
+            'balances': StockBalanceSerializer(balances, many=True).data
+        }, status=status.HTTP_201_CREATED)
+
+
+@extend_schema_view(
+    list=extend_schema(
+        summary="List stock balances",
+        description="On-hand quantities per product and location, keyset-paginated. Filter by product and location (uuids).",
+        tags=["Inventory"]
+    ),
+)
+class StockBalanceViewSet(TimedPermissionsMixin, mixins.ListModelMixin, viewsets.GenericViewSet):
+    """Materialized on-hand balances (read-only; changed only through movements)."""
+    queryset = StockBalance.objects.select_related('product', 'location')
+    serializer_class = StockBalanceSerializer
+    permission_classes = [IsInventoryRole]
+    pagination_class = InventoryPagination
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = BalanceFilter
+    ordering = ('id',)
+
+    def list(self, request, *args, **kwargs):
+        page = self.paginate_queryset(self.filter_queryset(self.get_queryset()))
+        serializer = self.get_serializer(page, many=True)
+        data = {
+            'success': True,
+            'message': 'Stock balances retrieved successfully',
+            'count': len(serializer.data),
+            'balances': serializer.data
+        }
+        data.update(self.paginator.get_pagination_data())
+        return Response(data, status=status.HTTP_200_OK)
+
+    @extend_schema(
+        summary="Quantity on hand",
+        description="On-hand quantity of one product at one location: a single indexed row read (0 if never stocked).",
+        tags=["Inventory"],
+        parameters=[
+            OpenApiParameter(name='product', type=OpenApiTypes.UUID, location=OpenApiParameter.QUERY, required=True),
+            OpenApiParameter(name='location', type=OpenApiTypes.UUID, location=OpenApiParameter.QUERY, required=True),
+        ]
+    )
+    @action(detail=False, methods=['get'], url_path='on-hand')
+    def on_hand(self, request):
+        filterset = BalanceFilter(request.query_params, queryset=self.get_queryset())
+        if not filterset.is_valid() or not {'product', 'location'} <= set(request.query_params):
+            return Response({
+                'success': False,
+                'message': 'Pass both product and location as uuids.'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        balance = filterset.qs.first()
+        return Response({
+            'success': True,
+            'message': 'Quantity on hand retrieved successfully',
+            'product': request.query_params['product'],
+            'location': request.query_params['location'],
+            'quantity': StockBalanceSerializer(balance).data['quantity'] if balance else f'{0:.{QUANTITY_PLACES}f}',
+        }, status=status.HTTP_200_OK)
+
+    @extend_schema(
+        summary="Stock on hand at a past moment",
+        description="Balances as they stood at ?at= (ISO datetime, or a date for the close of that day), "
+                    "from the nearest stock checkpoint plus the movements since it. Keyset-paginated; "
+                    "filter by product and location (uuids).",
+        tags=["Inventory"],
+        parameters=[
+            OpenApiParameter(name='at', type=OpenApiTypes.STR, location=OpenApiParameter.QUERY, required=True),
+            OpenApiParameter(name='product', type=OpenApiTypes.UUID, location=OpenApiParameter.QUERY),
+            OpenApiParameter(name='location', type=OpenApiTypes.UUID, location=OpenApiParameter.QUERY),
+        ]
+    )
+    @action(detail=False, methods=['get'], url_path='as-of')
+    def as_of(self, request):
+        moment = parse_moment(request.query_params.get('at', ''))
+        if moment is None:
+            return Response({
+                'success': False,
+                'message': 'Pass ?at= as an ISO datetime or date.'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        queryset = annotate_as_of(self.filter_queryset(self.get_queryset()), moment)
+        page = self.paginate_queryset(queryset)
+        serializer = StockBalanceAsOfSerializer(page, many=True)
+        data = {
+            'success': True,
+            'message': 'Stock as of the requested moment retrieved successfully',
+            'at': moment.isoformat(),
+            'count': len(serializer.data),
+            'balances': serializer.data
+        }
+        data.update(self.paginator.get_pagination_data())
+        return Response(data, status=status.HTTP_200_OK)
+
+
+@extend_schema(
+    tags=["Inventory"],
+    summary="Submit a cycle count",
+    description="Reconcile a count sheet for one location: each line is {product: uuid} or {code: SKU/barcode} "
+                "with the counted quantity. Variances against current balances become adjustment movements and "
+                "the balances are set to the counted quantities, all in one transaction. Products not on the "
+                "sheet are untouched. Up to 20000 lines; nothing is recorded if any line is invalid.",
+    request=CycleCountRequestSerializer,
+)
+class CycleCountViewSet(TimedPermissionsMixin, viewsets.GenericViewSet):
+    """Bulk stock reconciliation for storekeepers, inventory managers and admins."""
+    serializer_class = CycleCountRequestSerializer
+    permission_classes = [IsInventoryRole]
+
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        try:
+            counted = clean_lines(data['lines'])
+        except CycleCountError as exc:
+            return Response({
+                'success': False,
+                'message': str(exc),
+                'errors': exc.errors,
+                'errors_truncated': exc.errors_truncated
+            }, status=status.HTTP_400_BAD_REQUEST)
+        report = reconcile(
+            data['location'], counted, user_id=request.user.pk, reference=data['reference'], note=data['note'],
+        )
+        return Response({
+            'success': True,
+            'message': 'Cycle count recorded successfully',
+            'report': report
+        }, status=status.HTTP_201_CREATED)
+
+
+@extend_schema(
+    tags=["Inventory"],
+    summary="Set a reorder point",
+    description="Set the reorder point of a product at a location, or clear it with null. The balance is low "
+                "while its quantity is at or below the reorder point; turning low raises a low-stock alert.",
+    request=ReorderPointRequestSerializer,
+)
+class ReorderPointViewSet(TimedPermissionsMixin, viewsets.GenericViewSet):
+    """Reorder points, kept on the balance rows they apply to."""
+    serializer_class = ReorderPointRequestSerializer
+    permission_classes = [IsInventoryRole]
+
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        balance = reorder.set_reorder_point(data['product'], data['location'], data['reorderPoint'])
+        return Response({
+            'success': True,
+            'message': 'Reorder point saved successfully',
+            'balance': StockBalanceSerializer(balance).data
+        }, status=status.HTTP_200_OK)
+
+
+@extend_schema_view(
+    list=extend_schema(
+        summary="List low stock",
+        description="Balances at or below their reorder point, keyset-paginated. Filter by location (uuid). "
+                    "Read from a partial index that only holds the low rows.",
+        tags=["Inventory"]
+    ),
+)
+class LowStockViewSet(TimedPermissionsMixin, mixins.ListModelMixin, viewsets.GenericViewSet):
+    """The current low set, maintained as movements cross reorder points."""
+    queryset = StockBalance.objects.filter(isLow=True).select_related('product', 'location')
+    serializer_class = StockBalanceSerializer
+    permission_classes = [IsInventoryRole]
+    pagination_class = InventoryPagination
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = LowStockFilter
+    ordering = ('id',)
+
+    def list(self, request, *args, **kwargs):
+        page = self.paginate_queryset(self.filter_queryset(self.get_queryset()))
+        serializer = self.get_serializer(page, many=True)
+        data = {
+            'success': True,
+            'message': 'Low stock retrieved successfully',
+            'count': len(serializer.data),
+            'balances': serializer.data
+        }
+        data.update(self.paginator.get_pagination_data())
+        return Response(data, status=status.HTTP_200_OK)
+
+
+@extend_schema_view(
+    list=extend_schema(
+        summary="List low-stock alerts",
+        description="Alerts raised when a balance dropped to its reorder point, newest first, keyset-paginated. "
+                    "Filter by product, location (uuids) and open=true for the unresolved ones.",
+        tags=["Inventory"]
+    ),
+)
+class LowStockAlertViewSet(TimedPermissionsMixin, mixins.ListModelMixin, viewsets.GenericViewSet):
+    queryset = LowStockAlert.objects.select_related('product', 'location')
+    serializer_class = LowStockAlertSerializer
+    permission_classes = [IsInventoryRole]
+    pagination_class = InventoryPagination
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = LowStockAlertFilter
+    ordering = ('-id',)  # Alerts raised by one bulk write share a timestamp; see StockMovementViewSet
+
+    def list(self, request, *args, **kwargs):
+        page = self.paginate_queryset(self.filter_queryset(self.get_queryset()))
+        serializer = self.get_serializer(page, many=True)
+        data = {
+            'success': True,
+            'message': 'Low-stock alerts retrieved successfully',
+            'count': len(serializer.data),
+            'alerts': serializer.data
+        }
+        data.update(self.paginator.get_pagination_data())
+        return Response(data, status=status.HTTP_200_OK)
@@ -1,3 +1,12 @@
 from django.contrib import admin
+from .models import Product
 
-# Register your models here.
+@admin.register(Product)
+class ProductAdmin(admin.ModelAdmin):
+    list_display = ('sku', 'barcode', 'productName', 'category', 'unitOfMeasure', 'isActive')
+    list_filter = ('isActive', 'unitOfMeasure')
+    list_select_related = ('category',)
+    search_fields = ('=sku', '=barcode', 'productName')
+    autocomplete_fields = ('category',)
+    # Counting 500k+ rows on every changelist page is not worth it
+    show_full_result_count = False
@@ -0,0 +1,44 @@
+import random
+
+from categories.bench import seed_categories
+from python_server.benchmarks import scenario
+from users.bench import make_admin
+from .models import Product
+
+
+def seed_products(count, category_ids, batch_size=5000):
+    """Bulk-insert ``count`` products spread over ``category_ids``."""
+    rng = random.Random(42)
+    for start in range(0, count, batch_size):
+        Product.objects.bulk_create(
+            Product(
+                sku=f'BENCH-{i:07d}',
+                barcode=f'89{i:011d}',
+                productName=f'Bench Product {i}',
+                category_id=rng.choice(category_ids),
+            )
+            for i in range(start, min(start + batch_size, count))
+        )
+
+
+@scenario('product-lookup', 'GET /api/products/by-code/<code>/ by SKU and barcode, and category-scoped keyset pages.')
+def product_lookup(run):
+    category_ids = seed_categories(20)
+    seed_products(run.size, category_ids)
+    client = run.client(make_admin())
+    rng = random.Random(42)
+    run.measure(
+        'by-sku',
+        lambda i: client.get(f'/api/products/by-code/bench-{rng.randrange(run.size):07d}/'),
+        expected_status=200,
+    )
+    run.measure(
+        'by-barcode',
+        lambda i: client.get(f'/api/products/by-code/89{rng.randrange(run.size):011d}/'),
+        expected_status=200,
+    )
+    run.measure(
+        'category-page',
+        lambda i: client.get('/api/products/', {'category': rng.choice(category_ids), 'page_size': 50}),
+        expected_status=200,
+    )
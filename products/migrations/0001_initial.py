@@ -0,0 +1,36 @@
+# Generated by Django 5.0.3 on 2026-10-17 01:59
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('categories', '0002_category_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Product',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('uuid', models.UUIDField(default=uuid.uuid4, editable=False, unique=True)),
+                ('sku', models.CharField(max_length=64, unique=True)),
+                ('barcode', models.CharField(blank=True, max_length=64, null=True, unique=True)),
+                ('productName', models.CharField(max_length=200)),
+                ('description', models.TextField(blank=True)),
+                ('unitOfMeasure', models.CharField(choices=[('pcs', 'Pieces'), ('box', 'Box'), ('set', 'Set'), ('pair', 'Pair'), ('kg', 'Kilogram'), ('g', 'Gram'), ('l', 'Litre'), ('ml', 'Millilitre'), ('m', 'Metre')], default='pcs', max_length=10)),
+                ('isActive', models.BooleanField(default=True)),
+                ('created_At', models.DateTimeField(auto_now_add=True)),
+                ('updated_At', models.DateTimeField(auto_now=True)),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='products', to='categories.category')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['created_At', 'uuid'], name='product_created_uuid_idx'), models.Index(fields=['category', 'created_At', 'uuid'], name='product_cat_created_idx')],
+            },
+        ),
+    ]
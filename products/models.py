@@ -1,3 +1,41 @@
+import uuid
+
 from django.db import models
 
-# Create your models here.
+from categories.models import Category
+
+
+class Product(models.Model):
+    UNIT_CHOICES = [
+        ('pcs', 'Pieces'),
+        ('box', 'Box'),
+        ('set', 'Set'),
+        ('pair', 'Pair'),
+        ('kg', 'Kilogram'),
+        ('g', 'Gram'),
+        ('l', 'Litre'),
+        ('ml', 'Millilitre'),
+        ('m', 'Metre'),
+    ]
+
+    uuid = models.UUIDField(default=uuid.uuid4, editable=False, unique=True)
+    # Stored upper-case (see ProductSerializer) so lookups stay exact matches on the unique index
+    sku = models.CharField(max_length=64, unique=True)
+    barcode = models.CharField(max_length=64, unique=True, null=True, blank=True)
+    productName = models.CharField(max_length=200)
+    description = models.TextField(blank=True)
+    category = models.ForeignKey(Category, on_delete=models.PROTECT, related_name='products')
+    unitOfMeasure = models.CharField(max_length=10, choices=UNIT_CHOICES, default='pcs')
+    isActive = models.BooleanField(default=True)
+    created_At = models.DateTimeField(auto_now_add=True)
+    updated_At = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # Keyset pagination order, overall and within a category
+            models.Index(fields=['created_At', 'uuid'], name='product_created_uuid_idx'),
+            models.Index(fields=['category', 'created_At', 'uuid'], name='product_cat_created_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.sku} - {self.productName}'
@@ -0,0 +1,73 @@
+import re
+
+from rest_framework import serializers
+from rest_framework.validators import UniqueValidator
+
+from categories.models import Category
+from python_server.metrics import TimedSerializerMixin
+from .models import Product
+
+# Compiled once at import
+SKU_RE = re.compile(r'^[A-Z0-9][A-Z0-9._/-]*$')
+BARCODE_RE = re.compile(r'^[0-9A-Z.\- $/+%]{4,}$')
+
+SKU_ERROR = "SKU may only contain letters, digits and . _ / - and must start with a letter or digit."
+BARCODE_ERROR = "Barcode must be at least 4 digits, upper-case letters or Code 39 symbols."
+
+
+def normalize_code(value):
+    """Canonical form of a SKU or barcode, as stored and as looked up."""
+    return value.strip().upper()
+
+
+class CodeField(serializers.CharField):
+    """CharField normalized before the uniqueness check, so 'ab-1' and 'AB-1' collide."""
+
+    def to_internal_value(self, data):
+        return normalize_code(super().to_internal_value(data))
+
+
+class ProductSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    sku = CodeField(max_length=64, validators=[UniqueValidator(queryset=Product.objects.all())])
+    barcode = CodeField(
+        max_length=64, required=False, allow_null=True, allow_blank=True,
+        validators=[UniqueValidator(queryset=Product.objects.all())],
+    )
+    category = serializers.PrimaryKeyRelatedField(queryset=Category.objects.all())
+    categoryName = serializers.CharField(source='category.categoryName', read_only=True)
+
+    class Meta:
+        model = Product
+        fields = [
+            'uuid', 'sku', 'barcode', 'productName', 'description', 'category', 'categoryName',
+            'unitOfMeasure', 'isActive', 'created_At', 'updated_At',
+        ]
+
+    def validate_sku(self, value):
+        if not SKU_RE.match(value):
+            raise serializers.ValidationError(SKU_ERROR)
+        return value
+
+    def validate_barcode(self, value):
+        if not value:
+            # Many products have no barcode; only NULL may repeat under the unique index
+            return None
+        if not BARCODE_RE.match(value):
+            raise serializers.ValidationError(BARCODE_ERROR)
+        return value
+
+    def validate(self, attrs):
+        # Lookups by code search both columns, so a SKU may not equal another product's barcode
+        others = Product.objects.all()
+        if self.instance is not None:
+            others = others.exclude(pk=self.instance.pk)
+        errors = {}
+        sku = attrs.get('sku')
+        if sku and others.filter(barcode=sku).exists():
+            errors['sku'] = 'Another product already uses this as its barcode.'
+        barcode = attrs.get('barcode')
+        if barcode and others.filter(sku=barcode).exists():
+            errors['barcode'] = 'Another product already uses this as its SKU.'
+        if errors:
+            raise serializers.ValidationError(errors)
+        return attrs
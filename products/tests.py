@@ -1,3 +1,108 @@
 from django.test import TestCase
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from categories.models import Category
+from users.models import User, UserProfile
+from .models import Product
+
+
+def make_user(email, role):
+    user = User.objects.create_user(email=email, password='user-pass-123')
+    UserProfile.objects.create(user=user, role=role)
+    return user
+
+
+class ProductAPITestCase(TestCase):
+    def setUp(self):
+        self.category = Category.objects.create(categoryName='Spares')
+        self.other_category = Category.objects.create(categoryName='Tools')
+        self.client = APIClient()
+        self.client.force_authenticate(make_user('admin@example.com', 'admin'))
+
+    def make_product(self, index, category=None, **extra):
+        fields = {
+            'sku': f'SKU-{index}',
+            'barcode': f'890000000{index:04d}',
+            'productName': f'Product {index}',
+            'category': category or self.category,
+        }
+        fields.update(extra)
+        return Product.objects.create(**fields)
+
+
+class ProductCatalogTests(ProductAPITestCase):
+    def test_create_normalizes_codes_and_rejects_case_duplicates(self):
+        response = self.client.post('/api/products/', {
+            'sku': ' bolt-m8 ', 'barcode': '', 'productName': 'M8 bolt',
+            'category': str(self.category.id), 'unitOfMeasure': 'box',
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['product']['sku'], 'BOLT-M8')
+        self.assertIsNone(response.data['product']['barcode'])
+        self.assertEqual(response.data['product']['categoryName'], 'Spares')
+
+        duplicate = self.client.post('/api/products/', {
+            'sku': 'Bolt-M8', 'productName': 'Another bolt', 'category': str(self.category.id),
+        }, format='json')
+        self.assertEqual(duplicate.status_code, 400)
+
+    def test_category_scoped_keyset_pages(self):
+        for i in range(5):
+            self.make_product(i)
+        self.make_product(99, category=self.other_category)
+
+        response = self.client.get('/api/products/', {'category': str(self.category.id), 'page_size': 2})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([p['sku'] for p in response.data['products']], ['SKU-4', 'SKU-3'])
+        with self.assertNumQueries(1):
+            second = self.client.get(response.data['next'])
+        self.assertEqual([p['sku'] for p in second.data['products']], ['SKU-2', 'SKU-1'])
+
+    def test_by_code_matches_sku_or_barcode_in_one_query(self):
+        product = self.make_product(7)
+        with self.assertNumQueries(1):
+            by_sku = self.client.get('/api/products/by-code/sku-7/')
+        self.assertEqual(by_sku.data['product']['uuid'], str(product.uuid))
+        by_barcode = self.client.get('/api/products/by-code/8900000000007/')
+        self.assertEqual(by_barcode.data['product']['uuid'], str(product.uuid))
+        self.assertEqual(self.client.get('/api/products/by-code/NOPE/').status_code, 404)
+
+    def test_by_code_accepts_slashes(self):
+        product = self.make_product(1, sku='PIPE/20', barcode='CODE/39')
+        self.assertEqual(self.client.get('/api/products/by-code/pipe/20/').data['product']['uuid'], str(product.uuid))
+        self.assertEqual(self.client.get('/api/products/by-code/CODE/39/').data['product']['uuid'], str(product.uuid))
+
+    def test_sku_and_barcode_cannot_clash_across_products(self):
+        self.make_product(1)
+        response = self.client.post('/api/products/', {
+            'sku': '8900000000001', 'productName': 'Clash', 'category': str(self.category.id),
+        }, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('as its barcode', response.data['message'])
+        response = self.client.post('/api/products/', {
+            'sku': 'SKU-2', 'barcode': 'sku-1', 'productName': 'Clash', 'category': str(self.category.id),
+        }, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('as its SKU', response.data['message'])
+
+    def test_exact_sku_wins_over_an_older_clashing_barcode(self):
+        older = self.make_product(1, barcode='SKU-2')
+        product = self.make_product(2)
+        self.assertNotEqual(older.pk, product.pk)
+        self.assertEqual(self.client.get('/api/products/by-code/SKU-2/').data['product']['uuid'], str(product.uuid))
+
+    def test_non_admins_can_read_but_not_write(self):
+        self.make_product(1)
+        client = APIClient()
+        client.force_authenticate(make_user('store@example.com', 'storekeeper'))
+        self.assertEqual(client.get('/api/products/by-code/SKU-1/').status_code, 200)
+        response = client.post('/api/products/', {
+            'sku': 'X-1', 'productName': 'X', 'category': str(self.category.id),
+        }, format='json')
+        self.assertEqual(response.status_code, 403)
+
+    def test_category_with_products_cannot_be_deleted(self):
+        self.make_product(1)
+        response = self.client.delete(f'/api/categories/{self.category.id}/')
+        self.assertEqual(response.status_code, 400)
+        self.assertTrue(Category.objects.filter(id=self.category.id).exists())
@@ -0,0 +1,7 @@
+from rest_framework.routers import SimpleRouter
+from .views import ProductViewSet
+
+router = SimpleRouter()
+router.register(r'', ProductViewSet, basename='product')
+
+urlpatterns = router.urls
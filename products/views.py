@@ -1,3 +1,151 @@
-from django.shortcuts import render
+from django.db.models import Case, ProtectedError, Q, Value, When
+from django_filters import rest_framework as filters
+from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework import viewsets, status
+from rest_framework.decorators import action
+from rest_framework.response import Response
 
-# Create your views here.
+from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiParameter, OpenApiTypes
+
+from users.permissions import IsAdminOrReadOnly
+from python_server.pagination import KeysetPagination
+from python_server.metrics import TimedPermissionsMixin
+from .models import Product
+from .serializers import ProductSerializer, normalize_code
+
+
+class ProductPagination(KeysetPagination):
+    # Always on: the catalog is expected to hold hundreds of thousands of SKUs
+    page_size = 100
+    max_page_size = 1000
+
+
+class ProductFilter(filters.FilterSet):
+    # Plain UUID filter: the default model choice filter would first fetch the category
+    category = filters.UUIDFilter(field_name='category_id')
+
+    class Meta:
+        model = Product
+        fields = ['category', 'isActive', 'unitOfMeasure']
+
+
+@extend_schema_view(
+    list=extend_schema(
+        summary="List products",
+        description="Keyset-paginated product list, newest first (?page_size=, default 100). "
+                    "Filter with ?category=<uuid> (served by the category index), isActive and unitOfMeasure.",
+        tags=["Products"]
+    ),
+    retrieve=extend_schema(summary="Retrieve a product", tags=["Products"]),
+    create=extend_schema(summary="Create a new product", tags=["Products"]),
+    update=extend_schema(summary="Update a product", tags=["Products"]),
+    partial_update=extend_schema(summary="Partially update a product", tags=["Products"]),
+    destroy=extend_schema(summary="Delete a product", tags=["Products"]),
+)
+class ProductViewSet(TimedPermissionsMixin, viewsets.ModelViewSet):
+    """API endpoints for the product catalog."""
+    queryset = Product.objects.select_related('category')
+    serializer_class = ProductSerializer
+    permission_classes = [IsAdminOrReadOnly]  # Everyone signed in can look products up
+    lookup_field = 'uuid'
+    lookup_url_kwarg = 'id'
+    pagination_class = ProductPagination
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = ProductFilter
+    ordering = ('-created_At', '-uuid')
+
+    def list(self, request, *args, **kwargs):
+        """List products, one keyset page at a time."""
+        page = self.paginate_queryset(self.filter_queryset(self.get_queryset()))
+        serializer = self.get_serializer(page, many=True)
+        data = {
+            'success': True,
+            'message': 'Products retrieved successfully',
+            'count': len(serializer.data),
+            'products': serializer.data
+        }
+        data.update(self.paginator.get_pagination_data())
+        return Response(data, status=status.HTTP_200_OK)
+
+    def retrieve(self, request, *args, **kwargs):
+        """Retrieve a single product."""
+        response = super().retrieve(request, *args, **kwargs)
+        return Response({
+            'success': True,
+            'message': 'Product retrieved successfully',
+            'product': response.data
+        }, status=status.HTTP_200_OK)
+
+    @extend_schema(
+        summary="Look up a product by SKU or barcode",
+        description="Exact, case-insensitive match on SKU or barcode, answered from their unique indexes "
+                    "in a single query (scanner and POS lookups).",
+        tags=["Products"],
+        parameters=[
+            OpenApiParameter(name='code', description='SKU or barcode', required=True, type=OpenApiTypes.STR,
+                             location=OpenApiParameter.PATH)
+        ]
+    )
+    # SKUs and Code 39 barcodes may contain '/', so the code runs to the trailing slash
+    @action(detail=False, methods=['get'], url_path=r'by-code/(?P<code>.+)')
+    def by_code(self, request, code=None):
+        """Look a product up by SKU or barcode."""
+        code = normalize_code(code)
+        # Codes are stored normalized, so both sides are plain equality on a unique index.
+        # A SKU match wins over a barcode that predates the cross-column check.
+        product = self.get_queryset().filter(Q(sku=code) | Q(barcode=code)).order_by(
+            Case(When(sku=code, then=Value(0)), default=Value(1))
+        ).first()
+        if product is None:
+            return Response({
+                'success': False,
+                'message': f'No product with SKU or barcode "{code}"'
+            }, status=status.HTTP_404_NOT_FOUND)
+        return Response({
+            'success': True,
+            'message': 'Product retrieved successfully',
+            'product': self.get_serializer(product).data
+        }, status=status.HTTP_200_OK)
+
+    def create(self, request, *args, **kwargs):
+        """Create a product."""
+        response = super().create(request, *args, **kwargs)
+        return Response({
+            'success': True,
+            'message': 'Product created successfully',
+            'product': response.data
+        }, status=status.HTTP_201_CREATED)
+
+    def update(self, request, *args, **kwargs):
+        """Update a product."""
+        response = super().update(request, *args, **kwargs)
+        return Response({
+            'success': True,
+            'message': 'Product updated successfully',
+            'product': response.data
+        }, status=status.HTTP_200_OK)
+
+    def partial_update(self, request, *args, **kwargs):
+        """Partially update a product."""
+        response = super().partial_update(request, *args, **kwargs)
+        return Response({
+            'success': True,
+            'message': 'Product updated successfully',
+            'product': response.data
+        }, status=status.HTTP_200_OK)
+
+    def destroy(self, request, *args, **kwargs):
+        """Delete a product."""
+        instance = self.get_object()
+        sku = instance.sku
+        try:
+            super().destroy(request, *args, **kwargs)
+        except ProtectedError:
+            return Response({
+                'success': False,
+                'message': f'Product "{sku}" has stock records and cannot be deleted; set isActive to false instead'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        return Response({
+            'success': True,
+            'message': f'Product "{sku}" deleted successfully'
+        }, status=status.HTTP_200_OK)
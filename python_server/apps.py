@@ -0,0 +1,15 @@
+from django.apps import AppConfig
+from django.db.backends.signals import connection_created
+
+
+class PythonServerConfig(AppConfig):
+    name = 'python_server'
+
+    def ready(self):
+        from django.conf import settings
+
+        from .db import apply_sqlite_pragmas
+        connection_created.connect(apply_sqlite_pragmas, dispatch_uid='python_server.sqlite_pragmas')
+        if settings.METRICS_ENABLED:
+            from . import metrics
+            connection_created.connect(metrics.install_query_timer, dispatch_uid='python_server.query_timer')
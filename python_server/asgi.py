@@ -12,5 +12,9 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'python_server.settings')
+# Async fast-path views for the hottest reads (see python_server/async_views.py)
+os.environ.setdefault('DJANGO_ROOT_URLCONF', 'python_server.asgi_urls')
+# Read by settings: persistent DB connections default off under ASGI
+os.environ.setdefault('DJANGO_ASGI', '1')
 
 application = get_asgi_application()
@@ -0,0 +1,19 @@
+"""
+URLconf for the ASGI deployment (selected in ``asgi.py``).
+
+The async fast-path views shadow their DRF routes for the hottest reads;
+every other URL is the regular ``python_server.urls``. They keep the DRF
+route names so metrics are labelled the same under both servers.
+"""
+from django.urls import path
+
+from categories.async_views import category_list_view
+from users.async_views import me_view
+from vendors.async_views import vendor_detail_view
+from .urls import urlpatterns as sync_urlpatterns
+
+urlpatterns = [
+    path('api/users/me/', me_view, name='me'),
+    path('api/categories/', category_list_view, name='category-list'),
+    path('api/vendors/vendors/<uuid:id>/', vendor_detail_view, name='vendor-detail'),
+] + sync_urlpatterns
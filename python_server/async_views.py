@@ -0,0 +1,69 @@
+"""
+Async (ASGI) fast path for the hottest read endpoints.
+
+DRF 3.14 views are sync-only, so under ASGI each of them costs a trip
+through the thread pool. The views registered in ``python_server.asgi_urls``
+serve the common case of their endpoint natively with the async ORM: a GET
+carrying a current role-claims token that passes the endpoint's permission.
+They return the same envelope as the DRF view.
+
+Anything else is handed, unchanged, to the regular DRF view. That covers
+other methods, legacy or invalid tokens, revoked tokens, permission
+failures, 404s and paginated requests, so error responses stay identical.
+"""
+from asgiref.sync import sync_to_async
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import JsonResponse
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+
+from users.tokens import BLOCKED_CLAIM, ROLE_CLAIM, VERSION_CLAIM, atoken_is_current
+
+_jwt = JWTAuthentication()
+
+
+async def claims_for(request):
+    """
+    The request's validated access token if it can be served on the fast path.
+
+    Returns None (meaning "let the DRF view decide") for a missing or invalid
+    token, a token without role claims, a blocked user or a revoked token.
+    """
+    header = _jwt.get_header(request)
+    raw_token = _jwt.get_raw_token(header) if header else None
+    if raw_token is None:
+        return None
+    try:
+        token = _jwt.get_validated_token(raw_token)
+    except (InvalidToken, TokenError):
+        return None
+    if ROLE_CLAIM not in token or VERSION_CLAIM not in token or token.get(BLOCKED_CLAIM):
+        return None
+    if not await atoken_is_current(token):
+        return None
+    return token
+
+
+def json_response(data, status=200):
+    return JsonResponse(data, status=status, encoder=DjangoJSONEncoder, json_dumps_params={'ensure_ascii': False})
+
+
+def fast_path(handler, fallback):
+    """
+    Route GETs to the async ``handler`` and everything else to ``fallback``.
+
+    ``handler`` may also return None to decline a GET, which then goes to
+    ``fallback`` (the DRF view's ``as_view()`` callable) as usual.
+    """
+    fallback = sync_to_async(fallback)
+
+    async def view(request, *args, **kwargs):
+        if request.method == 'GET':
+            response = await handler(request, *args, **kwargs)
+            if response is not None:
+                return response
+        return await fallback(request, *args, **kwargs)
+
+    # Same as DRF's views: CSRF only applies to session auth, inside the view
+    view.csrf_exempt = True
+    return view
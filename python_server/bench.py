@@ -0,0 +1,39 @@
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from python_server.benchmarks import scenario
+
+
+def _select_one(wrapper):
+    with wrapper.cursor() as cursor:
+        cursor.execute('SELECT 1')
+        cursor.fetchone()
+
+
+@scenario(
+    'db-connect',
+    'Per-request cost of a new database connection (CONN_MAX_AGE=0) versus a persistent, '
+    'health-checked one. Run with DATABASE_URL to include the PostgreSQL TCP/TLS/auth handshake.',
+    atomic=False,
+)
+def db_connect(run):
+    def fresh(i):
+        # What every request paid before: connect (TCP, TLS, auth), query, disconnect
+        wrapper = connections.create_connection(DEFAULT_DB_ALIAS)
+        try:
+            _select_one(wrapper)
+        finally:
+            wrapper.close()
+
+    persistent = connections.create_connection(DEFAULT_DB_ALIAS)
+    persistent.settings_dict.update(CONN_MAX_AGE=600, CONN_HEALTH_CHECKS=True)
+
+    def reused(i):
+        # Request boundary as Django runs it, then the same query on the kept connection
+        persistent.close_if_unusable_or_obsolete()
+        _select_one(persistent)
+
+    try:
+        run.measure('fresh-connection', fresh)
+        run.measure('persistent-connection', reused)
+    finally:
+        persistent.close()
@@ -0,0 +1,224 @@
+"""
+Benchmark harness behind ``manage.py bench``.
+
+Each installed app may ship a ``bench`` module that registers scenarios with
+the ``@scenario`` decorator. A scenario receives a ``BenchRun`` and calls
+``run.measure()`` for every operation it wants timed; the harness collects
+latency percentiles, throughput and queries per request for each of them.
+
+Scenarios get their HTTP clients from ``run.client()``: an in-process
+``APIClient`` by default, or with ``--live`` a keep-alive client talking to a
+real local server thread, whose query counts come from the ``Server-Timing`` header.
+"""
+import http.client
+import json
+import math
+import re
+import time
+from urllib.parse import urlencode, urlsplit
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+SCENARIOS = {}
+
+
+def scenario(name, description='', atomic=True):
+    """
+    Register ``func(run)`` as a benchmark scenario called ``name``.
+
+    Scenarios run inside a transaction that is rolled back afterwards; pass
+    ``atomic=False`` for ones that manage connections themselves (and so must
+    leave no data behind on their own).
+    """
+    def decorator(func):
+        func.bench_name = name
+        func.bench_description = description or (func.__doc__ or '').strip()
+        func.bench_atomic = atomic
+        SCENARIOS[name] = func
+        return func
+    return decorator
+
+
+def percentile(sorted_samples, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_samples:
+        return None
+    rank = max(int(math.ceil(pct / 100.0 * len(sorted_samples))), 1)
+    return sorted_samples[rank - 1]
+
+
+def summarize(samples, elapsed, queries=None):
+    """Turn raw per-call timings (seconds) into the JSON result shape."""
+    ordered = sorted(samples)
+    ms = lambda value: round(value * 1000, 3) if value is not None else None
+    result = {
+        'iterations': len(samples),
+        'throughput_rps': round(len(samples) / elapsed, 2) if elapsed else None,
+        'mean_ms': ms(sum(samples) / len(samples)) if samples else None,
+        'p50_ms': ms(percentile(ordered, 50)),
+        'p95_ms': ms(percentile(ordered, 95)),
+        'p99_ms': ms(percentile(ordered, 99)),
+        'max_ms': ms(ordered[-1]) if ordered else None,
+    }
+    if queries is not None:
+        result['queries_per_request'] = round(queries / len(samples), 2) if samples else None
+    return result
+
+
+class BenchmarkError(Exception):
+    pass
+
+
+SERVER_TIMING_QUERIES_RE = re.compile(r'(?:^|,)\s*db;[^,]*desc="(\d+) queries"')
+
+
+class LiveResponse:
+    def __init__(self, status_code, headers, content):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+
+    def __getitem__(self, header):
+        return self.headers[header]
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class LiveClient:
+    """Minimal HTTP client with the parts of ``APIClient`` the scenarios use."""
+
+    def __init__(self, base_url):
+        parts = urlsplit(base_url)
+        self.host = parts.hostname
+        self.port = parts.port
+        self.headers = {}
+
+    def credentials(self, HTTP_AUTHORIZATION=None):
+        self.headers.pop('Authorization', None)
+        if HTTP_AUTHORIZATION:
+            self.headers['Authorization'] = HTTP_AUTHORIZATION
+
+    def request(self, method, path, data=None, headers=None):
+        # One connection per request: the threaded dev server writes headers and
+        # body separately, so keep-alive adds ~40ms of Nagle/delayed-ACK stall
+        headers = {**self.headers, **(headers or {}), 'Connection': 'close'}
+        body = None
+        if data is not None:
+            body = json.dumps(data).encode()
+            headers['Content-Type'] = 'application/json'
+        connection = http.client.HTTPConnection(self.host, self.port, timeout=30)
+        try:
+            connection.request(method, path, body=body, headers=headers)
+            response = connection.getresponse()
+            return LiveResponse(response.status, dict(response.getheaders()), response.read())
+        finally:
+            connection.close()
+
+    def get(self, path, data=None, headers=None):
+        if data:
+            path = f'{path}?{urlencode(data)}'
+        return self.request('GET', path, headers=headers)
+
+    def post(self, path, data=None, format=None, headers=None):
+        return self.request('POST', path, data, headers)
+
+    def patch(self, path, data=None, format=None, headers=None):
+        return self.request('PATCH', path, data, headers)
+
+    def delete(self, path, headers=None):
+        return self.request('DELETE', path, headers=headers)
+
+
+def server_timing_queries(response):
+    """Query count the server reported in ``Server-Timing``, or None."""
+    headers = getattr(response, 'headers', None) or {}
+    match = SERVER_TIMING_QUERIES_RE.search(headers.get('Server-Timing', ''))
+    return int(match.group(1)) if match else None
+
+
+class BenchRun:
+    """State shared with a scenario while it runs."""
+
+    def __init__(self, size, iterations, warmup, count_queries=True, live_url=None):
+        self.size = size
+        self.iterations = iterations
+        self.warmup = warmup
+        self.count_queries = count_queries
+        self.live_url = live_url
+        self.results = {}
+
+    def client(self, user=None):
+        """HTTP client for this run, authenticated as ``user`` when given."""
+        if self.live_url:
+            client = LiveClient(self.live_url)
+            if user is not None:
+                client.credentials(HTTP_AUTHORIZATION=f'Bearer {access_token_for(user)}')
+            return client
+        if user is not None:
+            return api_client_for(user)
+        from rest_framework.test import APIClient
+        return APIClient()
+
+    def measure(self, label, call, expected_status=None, iterations=None):
+        """
+        Time ``call(i)`` for ``iterations`` calls after ``warmup`` untimed ones.
+
+        If ``expected_status`` is given the return value is treated as a
+        response and any other status code aborts the run, so a broken
+        endpoint can never report a flattering number.
+        """
+        iterations = iterations or self.iterations
+
+        def invoke(i):
+            result = call(i)
+            if expected_status is not None and result.status_code != expected_status:
+                raise BenchmarkError(
+                    f'{label}: expected HTTP {expected_status}, got {result.status_code}'
+                )
+            return result
+
+        for i in range(self.warmup):
+            invoke(i)
+
+        samples = []
+        queries = 0 if self.count_queries else None
+        started = time.perf_counter()
+        for i in range(iterations):
+            if self.count_queries and self.live_url:
+                # The queries run in the server thread, which reports them per response
+                t0 = time.perf_counter()
+                result = invoke(i)
+                samples.append(time.perf_counter() - t0)
+                reported = server_timing_queries(result)
+                queries = None if queries is None or reported is None else queries + reported
+            elif self.count_queries:
+                with CaptureQueriesContext(connection) as captured:
+                    t0 = time.perf_counter()
+                    invoke(i)
+                    samples.append(time.perf_counter() - t0)
+                queries += len(captured.captured_queries)
+            else:
+                t0 = time.perf_counter()
+                invoke(i)
+                samples.append(time.perf_counter() - t0)
+        elapsed = time.perf_counter() - started
+
+        self.results[label] = summarize(samples, elapsed, queries)
+        return self.results[label]
+
+
+def access_token_for(user):
+    from users.serializers import EmailTokenObtainPairSerializer
+
+    return EmailTokenObtainPairSerializer.get_token(user).access_token
+
+
+def api_client_for(user):
+    """APIClient carrying a real access token for ``user``."""
+    from rest_framework.test import APIClient
+
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {access_token_for(user)}')
+    return client
@@ -0,0 +1,20 @@
+"""
+Celery application for off-request work (SMS delivery, maintenance).
+
+Tasks live in each app's ``tasks`` module and are discovered automatically.
+Configuration comes from the ``CELERY_*`` Django settings. Without a broker
+configured, tasks run eagerly in-process, so development and the test suite
+need no Redis.
+
+Worker: ``celery -A python_server worker -l info``
+Beat:   ``celery -A python_server beat -l info``
+"""
+import os
+
+from celery import Celery
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'python_server.settings')
+
+app = Celery('python_server')
+app.config_from_object('django.conf:settings', namespace='CELERY')
+app.autodiscover_tasks()
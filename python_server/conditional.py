@@ -0,0 +1,122 @@
+"""
+Conditional GET for list endpoints.
+
+With ``SHARED_CACHE`` on, validators come from a generation token per
+collection held in the shared cache: every write to the collection swaps the
+token (``bump_generation``). So the ETag (request path plus token) and
+Last-Modified (when the token was set) cost no query on any request, keyset
+pages included. A lost token just means new validators, never a stale 304.
+
+A per-worker cache cannot carry the token (a write would only reach the
+worker that handled it), so without ``SHARED_CACHE`` the validators come
+from the collection itself: one ``MAX(<updated field>)`` + ``COUNT(*)``
+aggregate over the filtered queryset. An insert or edit moves the maximum
+and a delete moves the count. A view that sends the whole collection can
+pass ``defer=True`` and skip the aggregate on unconditional requests,
+deriving the same validators from the rows it sends (``rows_validators``).
+
+Either way a match returns 304 before the list is read.
+"""
+import hashlib
+import time
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Max
+from django.utils.http import http_date, parse_etags, parse_http_date_safe, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+
+def current_generation(key):
+    generation = cache.get(key)
+    if generation is None:
+        cache.add(key, time.time_ns(), None)
+        generation = cache.get(key)
+    return generation
+
+
+async def acurrent_generation(key):
+    generation = await cache.aget(key)
+    if generation is None:
+        await cache.aadd(key, time.time_ns(), None)
+        generation = await cache.aget(key)
+    return generation
+
+
+def bump_generation(key):
+    """Mark the collection under ``key`` as changed."""
+    cache.set(key, time.time_ns(), None)
+
+
+def collection_validators(request, generation_key, queryset, updated_field, defer=False):
+    """
+    ETag and Last-Modified for a list. ``(None, None)`` when ``defer`` is set
+    and the request is unconditional; see ``rows_validators``.
+    """
+    if settings.SHARED_CACHE:
+        return _validators(request, current_generation(generation_key))
+    if defer and not _is_conditional(request):
+        return None, None
+    aggregate = queryset.order_by().aggregate(last=Max(updated_field), count=Count('pk'))
+    return _aggregate_validators(request, aggregate['last'], aggregate['count'])
+
+
+async def acollection_validators(request, generation_key, queryset, updated_field):
+    """Async twin of ``collection_validators``."""
+    if settings.SHARED_CACHE:
+        return _validators(request, await acurrent_generation(generation_key))
+    aggregate = await queryset.order_by().aaggregate(last=Max(updated_field), count=Count('pk'))
+    return _aggregate_validators(request, aggregate['last'], aggregate['count'])
+
+
+def rows_validators(request, rows, updated_field):
+    """The aggregate's validators, computed from an already-read full collection."""
+    rows = list(rows)
+    last = max((getattr(row, updated_field) for row in rows), default=None)
+    return _aggregate_validators(request, last, len(rows))
+
+
+def _is_conditional(request):
+    return 'HTTP_IF_NONE_MATCH' in request.META or 'HTTP_IF_MODIFIED_SINCE' in request.META
+
+
+def _validators(request, generation):
+    fingerprint = f'{request.get_full_path()}|{generation}'
+    etag = quote_etag(hashlib.md5(fingerprint.encode()).hexdigest())
+    return etag, datetime.fromtimestamp(generation / 1e9, tz=timezone.utc)
+
+
+def _aggregate_validators(request, last, count):
+    fingerprint = f'{request.get_full_path()}|{last.isoformat() if last else ""}|{count}'
+    return quote_etag(hashlib.md5(fingerprint.encode()).hexdigest()), last
+
+
+def is_not_modified(request, etag, last_modified):
+    """RFC 9110 precedence: If-None-Match wins, If-Modified-Since is only a fallback."""
+    if etag is None:
+        return False
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+    if if_none_match:
+        etags = parse_etags(if_none_match)
+        return '*' in etags or etag in etags
+    if_modified_since = parse_http_date_safe(request.META.get('HTTP_IF_MODIFIED_SINCE'))
+    if if_modified_since is not None and last_modified is not None:
+        return int(last_modified.timestamp()) <= if_modified_since
+    return False
+
+
+def set_validator_headers(response, etag, last_modified):
+    if etag is None:
+        return response
+    response['ETag'] = etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified.timestamp())
+    # Clients must revalidate, which is exactly the cheap path above
+    response['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+def not_modified_response(etag, last_modified, response_class=Response):
+    return set_validator_headers(response_class(status=status.HTTP_304_NOT_MODIFIED), etag, last_modified)
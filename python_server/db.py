@@ -0,0 +1,37 @@
+"""
+Per-connection tuning for the SQLite fallback database.
+
+``apply_sqlite_pragmas`` is connected to ``connection_created`` in
+``PythonServerConfig.ready()``. It runs ``settings.SQLITE_PRAGMAS`` on every
+new SQLite connection. The defaults switch to WAL so readers no longer block
+writers (or the reverse), relax fsyncs to ``synchronous=NORMAL`` (safe in
+WAL), make lock waits block for ``busy_timeout`` ms instead of failing with
+"database is locked", and give each connection a bigger page cache, mmap I/O
+and in-memory temp tables. Other database vendors are left untouched.
+
+``journal_mode`` is the one persistent pragma: it rewrites the database file.
+With ``settings.SQLITE_KEEP_JOURNAL_MODE`` on, it is skipped and files keep
+whatever mode they already use.
+"""
+import re
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+_PRAGMA_NAME = re.compile(r'[a-z_]+')
+_PRAGMA_VALUE = re.compile(r'-?\w+')
+
+
+def apply_sqlite_pragmas(sender, connection, **kwargs):
+    if connection.vendor != 'sqlite':
+        return
+    keep_journal_mode = getattr(settings, 'SQLITE_KEEP_JOURNAL_MODE', False)
+    with connection.cursor() as cursor:
+        for name, value in getattr(settings, 'SQLITE_PRAGMAS', {}).items():
+            if name == 'journal_mode' and keep_journal_mode:
+                continue
+            # PRAGMA takes no bound parameters, so only accept plain names/values
+            if not _PRAGMA_NAME.fullmatch(name) or not _PRAGMA_VALUE.fullmatch(str(value)):
+                raise ImproperlyConfigured(f'Invalid SQLite pragma {name!r} = {value!r}.')
+            cursor.execute(f'PRAGMA {name} = {value}')
+
@@ -0,0 +1,112 @@
+"""
+Streaming CSV/JSONL exports.
+
+Rows are read with ``values_list().iterator(chunk_size=...)`` (a server-side
+cursor on PostgreSQL), encoded into ~64KB chunks and optionally compressed
+on the fly, so memory stays flat and the first bytes leave immediately no
+matter how many rows the table has.
+"""
+import csv
+import json
+import zlib
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv',
+    'jsonl': 'application/x-ndjson',
+}
+COMPRESSIONS = {
+    'gzip': ('.gz', 'application/gzip'),
+    'zstd': ('.zst', 'application/zstd'),
+}
+DEFAULT_CHUNK_SIZE = 2000
+FLUSH_BYTES = 64 * 1024
+
+
+class ExportError(Exception):
+    pass
+
+
+class _Echo:
+    """File-like object whose write() just returns the value (for csv.writer)."""
+
+    def write(self, value):
+        return value
+
+
+def _encode_rows(rows, columns, file_format):
+    if file_format == 'csv':
+        writer = csv.writer(_Echo())
+        yield writer.writerow(columns)
+        for row in rows:
+            yield writer.writerow(row)
+    else:
+        encoder = DjangoJSONEncoder(separators=(',', ':'))
+        for row in rows:
+            yield encoder.encode(dict(zip(columns, row))) + '\n'
+
+
+def _buffered(lines):
+    """Group many small lines into chunks of about FLUSH_BYTES."""
+    buffer = []
+    size = 0
+    for line in lines:
+        data = line.encode('utf-8')
+        buffer.append(data)
+        size += len(data)
+        if size >= FLUSH_BYTES:
+            yield b''.join(buffer)
+            buffer = []
+            size = 0
+    if buffer:
+        yield b''.join(buffer)
+
+
+def _compressor(compression):
+    if compression == 'gzip':
+        return zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    try:
+        import zstandard
+    except ImportError:
+        raise ExportError('zstd compression is not available on this server (install zstandard).')
+    return zstandard.ZstdCompressor(level=3).compressobj()
+
+
+def _compressed(chunks, compressor):
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def stream_export(queryset, fields, file_format='csv', compression=None, filename='export',
+                  columns=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Build a ``StreamingHttpResponse`` exporting ``fields`` of ``queryset``.
+
+    ``columns`` optionally renames the header/keys (defaults to ``fields``).
+    Raises ``ExportError`` for an unknown format or compression.
+    """
+    file_format = file_format or 'csv'
+    if file_format not in EXPORT_FORMATS:
+        raise ExportError(f"Unsupported file_format '{file_format}'. Use one of: {', '.join(EXPORT_FORMATS)}.")
+    if compression and compression not in COMPRESSIONS:
+        raise ExportError(f"Unsupported compression '{compression}'. Use one of: {', '.join(COMPRESSIONS)}.")
+
+    rows = queryset.values_list(*fields).iterator(chunk_size=chunk_size)
+    body = _buffered(_encode_rows(rows, list(columns or fields), file_format))
+    content_type = EXPORT_FORMATS[file_format]
+    filename = f'{filename}.{file_format}'
+    if compression:
+        body = _compressed(body, _compressor(compression))
+        extension, content_type = COMPRESSIONS[compression]
+        filename += extension
+
+    response = StreamingHttpResponse(body, content_type=content_type)
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    # Tell nginx not to buffer the whole file before sending it on
+    response['X-Accel-Buffering'] = 'no'
+    return response
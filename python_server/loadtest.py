@@ -0,0 +1,157 @@
+"""
+Closed-loop HTTP load generator behind ``manage.py loadtest``.
+
+``concurrency`` client coroutines each hold one keep-alive connection and
+issue requests back to back for ``duration`` seconds. Per-request latency is
+fed into the same ``summarize()`` used by ``manage.py bench``. The client is
+a minimal HTTP/1.1 implementation on asyncio streams, so it needs no extra
+dependency and adds very little overhead of its own.
+"""
+import asyncio
+import json
+import time
+from urllib.parse import urlsplit
+
+from .benchmarks import summarize
+
+
+class ConnectionClosed(Exception):
+    pass
+
+
+class HTTPConnection:
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.reader = None
+        self.writer = None
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except OSError:
+                pass
+        self.reader = self.writer = None
+
+    async def request(self, method, path, headers=None, body=b''):
+        """Send one request; returns ``(status, headers, body)``."""
+        reused = self.writer is not None
+        try:
+            return await self._request(method, path, headers or {}, body)
+        except (ConnectionClosed, ConnectionError):
+            await self.close()
+            if not reused:
+                raise
+            # The server dropped an idle keep-alive connection; retry once fresh
+            return await self._request(method, path, headers or {}, body)
+
+    async def _request(self, method, path, headers, body):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        lines = [f'{method} {path} HTTP/1.1', f'Host: {self.host}:{self.port}', f'Content-Length: {len(body)}']
+        lines.extend(f'{name}: {value}' for name, value in headers.items())
+        self.writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + body)
+        await self.writer.drain()
+
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionClosed()
+        status = int(status_line.split()[1])
+        response_headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            response_headers[name.strip().lower()] = value.strip()
+
+        if status in (204, 304) or method == 'HEAD':
+            payload = b''
+        elif 'content-length' in response_headers:
+            payload = await self.reader.readexactly(int(response_headers['content-length']))
+        elif response_headers.get('transfer-encoding', '').lower() == 'chunked':
+            chunks = []
+            while True:
+                size = int((await self.reader.readline()).split(b';')[0], 16)
+                if size == 0:
+                    await self.reader.readline()
+                    break
+                chunks.append(await self.reader.readexactly(size))
+                await self.reader.readline()
+            payload = b''.join(chunks)
+        else:
+            payload = await self.reader.read()
+            response_headers['connection'] = 'close'
+
+        if response_headers.get('connection', '').lower() == 'close':
+            await self.close()
+        return status, response_headers, payload
+
+
+def _address(base_url):
+    parts = urlsplit(base_url)
+    if parts.scheme != 'http':
+        raise ValueError(f'Only plain http:// targets are supported (got {base_url}).')
+    return parts.hostname, parts.port or 80, parts.path.rstrip('/')
+
+
+async def login(base_url, email, password):
+    """Obtain an access token from the target's login endpoint."""
+    host, port, prefix = _address(base_url)
+    connection = HTTPConnection(host, port)
+    try:
+        status, _, body = await connection.request(
+            'POST', f'{prefix}/api/users/login/', {'Content-Type': 'application/json'},
+            json.dumps({'email': email, 'password': password}).encode(),
+        )
+    finally:
+        await connection.close()
+    if status != 200:
+        raise ValueError(f'Login against {base_url} failed with HTTP {status}: {body[:200]!r}')
+    return json.loads(body)['access']
+
+
+async def run_load(base_url, path, headers=None, concurrency=50, duration=10.0, warmup=2.0):
+    """
+    Hammer ``GET base_url + path`` and return the summary dict.
+
+    The summary adds ``errors`` (connection failures) and ``status_counts`` to
+    the usual latency/throughput keys. Requests finished during the
+    ``warmup`` seconds are discarded.
+    """
+    host, port, prefix = _address(base_url)
+    samples = []
+    statuses = {}
+    errors = 0
+    started = time.perf_counter()
+    measure_from = started + warmup
+    stop_at = measure_from + duration
+
+    async def client():
+        nonlocal errors
+        connection = HTTPConnection(host, port)
+        try:
+            while True:
+                t0 = time.perf_counter()
+                if t0 >= stop_at:
+                    return
+                try:
+                    status, _, _ = await connection.request('GET', prefix + path, headers)
+                except (OSError, ConnectionClosed, asyncio.IncompleteReadError, ValueError):
+                    errors += 1
+                    await connection.close()
+                    continue
+                t1 = time.perf_counter()
+                if t0 >= measure_from:
+                    samples.append(t1 - t0)
+                    statuses[status] = statuses.get(status, 0) + 1
+        finally:
+            await connection.close()
+
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    result = summarize(samples, max(time.perf_counter() - measure_from, 1e-9))
+    result['errors'] = errors
+    result['status_counts'] = {str(code): count for code, count in sorted(statuses.items())}
+    return result
@@ -0,0 +1,146 @@
+import json
+import subprocess
+import sys
+from contextlib import ExitStack, contextmanager
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.contrib.staticfiles.handlers import StaticFilesHandler
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections, transaction
+from django.test.testcases import LiveServerThread
+from django.test.utils import (
+    modify_settings, setup_databases, setup_test_environment, teardown_databases, teardown_test_environment,
+)
+from django.utils.module_loading import autodiscover_modules
+
+from python_server.benchmarks import SCENARIOS, BenchmarkError, BenchRun
+
+
+def current_commit():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=settings.BASE_DIR, stderr=subprocess.DEVNULL, text=True,
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+@contextmanager
+def live_server():
+    """Serve the app from a thread on a free local port, like ``LiveServerTestCase``; yields its URL."""
+    # An in-memory SQLite test database only exists on this thread's connection
+    shared = [conn for conn in connections.all() if conn.vendor == 'sqlite' and conn.is_in_memory_db()]
+    for conn in shared:
+        conn.inc_thread_sharing()
+    server = LiveServerThread('localhost', StaticFilesHandler, {conn.alias: conn for conn in shared})
+    server.daemon = True
+    try:
+        with modify_settings(ALLOWED_HOSTS={'append': 'localhost'}):
+            server.start()
+            server.is_ready.wait()
+            if server.error:
+                raise CommandError(f'Could not start the live server: {server.error}')
+            try:
+                yield f'http://localhost:{server.port}'
+            finally:
+                server.terminate()
+    finally:
+        for conn in shared:
+            conn.dec_thread_sharing()
+
+
+class Command(BaseCommand):
+    help = (
+        'Run API benchmark scenarios against a throwaway test database and '
+        'report throughput, latency percentiles and queries per request as JSON.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('scenarios', nargs='*', help='Scenario names to run (default: all).')
+        parser.add_argument('--list', action='store_true', help='List available scenarios and exit.')
+        parser.add_argument('--size', type=int, default=1000, help='Rows to seed per dataset (default: 1000).')
+        parser.add_argument('--iterations', type=int, default=200, help='Timed calls per operation (default: 200).')
+        parser.add_argument('--warmup', type=int, default=20, help='Untimed calls before timing (default: 20).')
+        parser.add_argument('--no-query-count', action='store_true', help='Skip per-request query counting.')
+        parser.add_argument(
+            '--live', action='store_true',
+            help='Send requests over HTTP to a local server thread instead of the in-process test client '
+                 '(includes socket, WSGI and middleware costs; queries are read from Server-Timing).',
+        )
+        parser.add_argument('--output', help='Write the JSON report to this file instead of stdout.')
+
+    def handle(self, *args, **options):
+        autodiscover_modules('bench')
+
+        if options['list']:
+            for name in sorted(SCENARIOS):
+                self.stdout.write(f'{name:24} {SCENARIOS[name].bench_description}')
+            return
+
+        names = options['scenarios'] or sorted(SCENARIOS)
+        unknown = [name for name in names if name not in SCENARIOS]
+        if unknown:
+            raise CommandError(f"Unknown scenario(s): {', '.join(unknown)}. Use --list to see them.")
+
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False)
+        report = {
+            'meta': {
+                'commit': current_commit(),
+                'started_at': datetime.now(timezone.utc).isoformat(),
+                'database': connection.vendor,
+                'python': sys.version.split()[0],
+                'size': options['size'],
+                'iterations': options['iterations'],
+                'warmup': options['warmup'],
+                'client': 'live' if options['live'] else 'test-client',
+            },
+            'scenarios': {},
+        }
+        try:
+            with ExitStack() as stack:
+                live_url = stack.enter_context(live_server()) if options['live'] else None
+                self.run_scenarios(names, options, live_url, report)
+        finally:
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as fh:
+                fh.write(output + '\n')
+            self.stderr.write(f"Report written to {options['output']}")
+        else:
+            self.stdout.write(output)
+
+    def run_scenarios(self, names, options, live_url, report):
+        for name in names:
+            self.stderr.write(f'Running {name}...')
+            run = BenchRun(
+                size=options['size'],
+                iterations=options['iterations'],
+                warmup=options['warmup'],
+                count_queries=not options['no_query_count'],
+                live_url=live_url,
+            )
+            try:
+                if live_url:
+                    # A server thread on its own connection (PostgreSQL, file SQLite) cannot
+                    # see uncommitted rows, so commit the dataset and flush it afterwards
+                    try:
+                        SCENARIOS[name](run)
+                    finally:
+                        call_command('flush', interactive=False, verbosity=0)
+                elif SCENARIOS[name].bench_atomic:
+                    # Roll each scenario back so datasets never leak between them
+                    with transaction.atomic():
+                        SCENARIOS[name](run)
+                        transaction.set_rollback(True)
+                else:
+                    SCENARIOS[name](run)
+            except BenchmarkError as exc:
+                raise CommandError(str(exc))
+            report['scenarios'][name] = run.results
@@ -0,0 +1,86 @@
+import asyncio
+import json
+import os
+import sys
+from datetime import datetime, timezone
+
+from django.core.management.base import BaseCommand, CommandError
+
+from python_server.loadtest import login, run_load
+
+DEFAULT_PATHS = ['/api/users/me/', '/api/categories/']
+
+
+class Command(BaseCommand):
+    help = (
+        'HTTP load test one or more running deployments with the same workload and report '
+        'throughput and latency percentiles per target and path as JSON. To compare WSGI and '
+        'ASGI at equal core counts, start both with the same number of worker processes, e.g. '
+        '"gunicorn -w 3 -b :8000 python_server.wsgi:application" and '
+        '"gunicorn -w 3 -k uvicorn.workers.UvicornWorker -b :8001 python_server.asgi:application", '
+        'then run: manage.py loadtest --target wsgi=http://127.0.0.1:8000 '
+        '--target asgi=http://127.0.0.1:8001 --email ... --password ...'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--target', action='append', required=True, metavar='NAME=URL',
+                            help='Deployment to test, e.g. wsgi=http://127.0.0.1:8000 (repeatable).')
+        parser.add_argument('--path', action='append', dest='paths',
+                            help=f"GET path to load (repeatable; default: {' '.join(DEFAULT_PATHS)}).")
+        parser.add_argument('--email', help='Log in as this user on each target and send its access token.')
+        parser.add_argument('--password')
+        parser.add_argument('--token', help='Access token to send instead of logging in.')
+        parser.add_argument('--concurrency', type=int, default=50, help='Concurrent connections (default: 50).')
+        parser.add_argument('--duration', type=float, default=10.0, help='Measured seconds per path (default: 10).')
+        parser.add_argument('--warmup', type=float, default=2.0, help='Unmeasured seconds first (default: 2).')
+        parser.add_argument('--output', help='Write the JSON report to this file instead of stdout.')
+
+    def handle(self, *args, **options):
+        targets = []
+        for spec in options['target']:
+            name, sep, url = spec.partition('=')
+            if not sep or not url:
+                raise CommandError(f'--target must look like NAME=URL (got {spec}).')
+            targets.append((name, url))
+        if options['email'] and not options['password']:
+            raise CommandError('--email needs --password.')
+        paths = options['paths'] or DEFAULT_PATHS
+
+        report = {
+            'meta': {
+                'started_at': datetime.now(timezone.utc).isoformat(),
+                'python': sys.version.split()[0],
+                'client_cpus': os.cpu_count(),
+                'concurrency': options['concurrency'],
+                'duration': options['duration'],
+                'warmup': options['warmup'],
+            },
+            'targets': {},
+        }
+        for name, url in targets:
+            try:
+                report['targets'][name] = asyncio.run(self.run_target(url, paths, options))
+            except (OSError, ValueError) as exc:
+                raise CommandError(f'{name}: {exc}')
+
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as fh:
+                fh.write(output + '\n')
+            self.stderr.write(f"Report written to {options['output']}")
+        else:
+            self.stdout.write(output)
+
+    async def run_target(self, url, paths, options):
+        token = options['token']
+        if options['email']:
+            token = await login(url, options['email'], options['password'])
+        headers = {'Authorization': f'Bearer {token}'} if token else {}
+        results = {}
+        for path in paths:
+            self.stderr.write(f'Loading {url}{path}...')
+            results[path] = await run_load(
+                url, path, headers,
+                concurrency=options['concurrency'], duration=options['duration'], warmup=options['warmup'],
+            )
+        return results
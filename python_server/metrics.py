@@ -0,0 +1,334 @@
+"""
+Per-request performance instrumentation.
+
+``MetricsMiddleware`` times every request and breaks it down into database
+time and query count, serializer time (``BaseSerializer.data``) and DRF
+permission-check time. The phases are nested: serializer time includes any
+queries it triggers. The breakdown goes out in a ``Server-Timing`` header and
+feeds per-route aggregates, labelled by URL name (``vendor-list``,
+``user-detail``, ...) and method. ``metrics_view`` serves those aggregates at
+``/metrics`` in the Prometheus text format.
+
+Recording is a few additions under a lock, and the text is only built when
+``/metrics`` is scraped. Each worker process keeps its own aggregates and
+publishes a snapshot to the shared cache at most every
+``METRICS_SNAPSHOT_INTERVAL`` seconds. A scrape merges every live worker's
+snapshot, so it does not matter which gunicorn worker answers it. That needs
+``SHARED_CACHE``: otherwise each scrape would see one worker's counters and
+rate() over them would be meaningless, so ``/metrics`` answers 404 (the
+``Server-Timing`` header still works).
+
+Queries are timed by an ``execute_wrapper`` that is installed on every new
+connection. The other phases come from hooks the project's classes opt into:
+``TimedPermissionsMixin`` on views and ``TimedSerializerMixin`` on
+serializers. All of them record into a context variable, so code running
+outside a request pays a single lookup, and the async views' ORM calls
+running in ``sync_to_async`` threads are still attributed to their request.
+
+``/metrics`` needs ``Authorization: Bearer <METRICS_TOKEN>``; without a token
+it is only served with ``DEBUG`` on.
+"""
+import os
+import threading
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpResponse, HttpResponseForbidden, HttpResponseNotFound
+from rest_framework.serializers import ListSerializer
+
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SNAPSHOT_KEY = 'metrics:worker:{}'
+WORKERS_KEY = 'metrics:workers'
+
+_current = ContextVar('request_timings', default=None)
+
+
+class RequestTimings:
+    __slots__ = ('db_queries', 'db', 'serializer', 'permission')
+
+    def __init__(self):
+        self.db_queries = 0
+        self.db = 0.0
+        self.serializer = 0.0
+        self.permission = 0.0
+
+
+def _empty_series():
+    return {
+        'count': 0,
+        'sum': 0.0,
+        'buckets': [0] * len(BUCKETS),
+        'db_queries': 0,
+        'db_seconds': 0.0,
+        'serializer_seconds': 0.0,
+        'permission_seconds': 0.0,
+        'statuses': {},
+    }
+
+
+class Registry:
+    """Per-process aggregates keyed by ``(route, method)``."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._series = {}
+        self._last_publish = 0.0
+
+    def observe(self, route, method, status, total, timings):
+        with self._lock:
+            series = self._series.get((route, method))
+            if series is None:
+                series = self._series[(route, method)] = _empty_series()
+            series['count'] += 1
+            series['sum'] += total
+            for index, bound in enumerate(BUCKETS):
+                if total <= bound:
+                    series['buckets'][index] += 1
+                    break
+            series['db_queries'] += timings.db_queries
+            series['db_seconds'] += timings.db
+            series['serializer_seconds'] += timings.serializer
+            series['permission_seconds'] += timings.permission
+            series['statuses'][status] = series['statuses'].get(status, 0) + 1
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                key: {**series, 'buckets': list(series['buckets']), 'statuses': dict(series['statuses'])}
+                for key, series in self._series.items()
+            }
+
+    def publish_due(self):
+        return time.monotonic() - self._last_publish >= settings.METRICS_SNAPSHOT_INTERVAL
+
+    def publish(self):
+        """Share this worker's snapshot through the cache for other workers' scrapes."""
+        self._last_publish = time.monotonic()
+        pid = os.getpid()
+        cache.set(SNAPSHOT_KEY.format(pid), self.snapshot(), settings.METRICS_SNAPSHOT_INTERVAL * 6)
+        workers = cache.get(WORKERS_KEY) or set()
+        if pid not in workers:
+            cache.set(WORKERS_KEY, workers | {pid}, None)
+
+    def reset(self):
+        with self._lock:
+            self._series = {}
+
+
+registry = Registry()
+
+
+def merged_snapshot():
+    """This worker's live aggregates plus the latest snapshot of every other live worker."""
+    pid = os.getpid()
+    merged = registry.snapshot()
+    workers = (cache.get(WORKERS_KEY) or set()) - {pid}
+    if not workers:
+        return merged
+    snapshots = cache.get_many([SNAPSHOT_KEY.format(worker) for worker in workers])
+    live = {int(key.rsplit(':', 1)[1]) for key in snapshots}
+    if live != workers:
+        # Forget workers whose snapshots expired (restarted or gone)
+        cache.set(WORKERS_KEY, live | {pid}, None)
+    for snapshot in snapshots.values():
+        for key, series in snapshot.items():
+            target = merged.setdefault(key, _empty_series())
+            for field in ('count', 'sum', 'db_queries', 'db_seconds', 'serializer_seconds', 'permission_seconds'):
+                target[field] += series[field]
+            target['buckets'] = [a + b for a, b in zip(target['buckets'], series['buckets'])]
+            for status, count in series['statuses'].items():
+                target['statuses'][status] = target['statuses'].get(status, 0) + count
+    return merged
+
+
+def _labels(**labels):
+    def escape(value):
+        return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+    return ','.join(f'{name}="{escape(value)}"' for name, value in labels.items())
+
+
+def render(snapshot):
+    """Prometheus text exposition (format 0.0.4) of a snapshot."""
+    ordered = sorted(snapshot.items())
+    lines = [
+        '# HELP http_request_duration_seconds Time spent handling the request.',
+        '# TYPE http_request_duration_seconds histogram',
+    ]
+    for (route, method), series in ordered:
+        labels = _labels(route=route, method=method)
+        cumulative = 0
+        for bound, count in zip(BUCKETS, series['buckets']):
+            cumulative += count
+            lines.append(f'http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} {series["count"]}')
+        lines.append(f'http_request_duration_seconds_sum{{{labels}}} {series["sum"]:.6f}')
+        lines.append(f'http_request_duration_seconds_count{{{labels}}} {series["count"]}')
+
+    lines += ['# HELP http_requests_total Requests by response status.', '# TYPE http_requests_total counter']
+    for (route, method), series in ordered:
+        for status, count in sorted(series['statuses'].items()):
+            lines.append(f'http_requests_total{{{_labels(route=route, method=method, status=status)}}} {count}')
+
+    for field, help_text in (
+        ('db_queries', 'Database queries run.'),
+        ('db_seconds', 'Time spent in database queries.'),
+        ('serializer_seconds', 'Time spent producing serializer data.'),
+        ('permission_seconds', 'Time spent in DRF permission checks.'),
+    ):
+        name = f'http_request_{field}_total'
+        lines += [f'# HELP {name} {help_text}', f'# TYPE {name} counter']
+        for (route, method), series in ordered:
+            value = series[field]
+            lines.append(f'{name}{{{_labels(route=route, method=method)}}} {value if isinstance(value, int) else f"{value:.6f}"}')
+    return '\n'.join(lines) + '\n'
+
+
+def metrics_view(request):
+    token = settings.METRICS_TOKEN
+    if token:
+        if request.headers.get('Authorization') != f'Bearer {token}':
+            return HttpResponseForbidden()
+    elif not settings.DEBUG:
+        # Route names and traffic are not for the public internet
+        return HttpResponseForbidden()
+    if not settings.SHARED_CACHE:
+        return HttpResponseNotFound('Metrics need SHARED_CACHE to combine the workers\' counters.\n')
+    return HttpResponse(render(merged_snapshot()), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+def _route(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return 'unmatched'
+    return match.view_name or match._func_path
+
+
+def server_timing(total, timings):
+    return ', '.join([
+        f'db;dur={timings.db * 1000:.1f};desc="{timings.db_queries} queries"',
+        f'serializer;dur={timings.serializer * 1000:.1f}',
+        f'permission;dur={timings.permission * 1000:.1f}',
+        f'total;dur={total * 1000:.1f}',
+    ])
+
+
+class MetricsMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        timings = RequestTimings()
+        token = _current.set(timings)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        self._finish(request, response, time.perf_counter() - started, timings)
+        if settings.SHARED_CACHE and registry.publish_due():
+            registry.publish()
+        return response
+
+    async def __acall__(self, request):
+        timings = RequestTimings()
+        token = _current.set(timings)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        self._finish(request, response, time.perf_counter() - started, timings)
+        if settings.SHARED_CACHE and registry.publish_due():
+            await sync_to_async(registry.publish)()
+        return response
+
+    def _finish(self, request, response, total, timings):
+        registry.observe(_route(request), request.method, response.status_code, total, timings)
+        if settings.METRICS_SERVER_TIMING:
+            response['Server-Timing'] = server_timing(total, timings)
+
+
+def time_queries(execute, sql, params, many, context):
+    timings = _current.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timings.db += time.perf_counter() - started
+        timings.db_queries += 1
+
+
+def install_query_timer(sender, connection, **kwargs):
+    """``connection_created`` receiver: time every query on this connection."""
+    if time_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.append(time_queries)
+
+
+class _Phase:
+    """Adds the time spent inside the block to one phase of the current request."""
+    __slots__ = ('phase', 'timings', 'started')
+
+    def __init__(self, phase):
+        self.phase = phase
+
+    def __enter__(self):
+        self.timings = _current.get()
+        if self.timings is not None:
+            self.started = time.perf_counter()
+
+    def __exit__(self, *exc_info):
+        if self.timings is not None:
+            setattr(self.timings, self.phase, getattr(self.timings, self.phase) + time.perf_counter() - self.started)
+
+
+class TimedPermissionsMixin:
+    """View hook: counts DRF permission checks as the ``permission`` phase."""
+
+    def check_permissions(self, request):
+        with _Phase('permission'):
+            super().check_permissions(request)
+
+    def check_object_permissions(self, request, obj):
+        with _Phase('permission'):
+            super().check_object_permissions(request, obj)
+
+
+class TimedSerializerMixin:
+    """
+    Serializer hook: counts ``.data`` as the ``serializer`` phase, for
+    ``many=True`` too. Nested serializers go through ``to_representation()``,
+    so each top-level ``.data`` is counted once.
+    """
+
+    @property
+    def data(self):
+        with _Phase('serializer'):
+            return super().data
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        serializer = super().many_init(*args, **kwargs)
+        if type(serializer) is ListSerializer:
+            # A Meta.list_serializer_class is left as declared
+            serializer.__class__ = TimedListSerializer
+        return serializer
+
+
+class TimedListSerializer(TimedSerializerMixin, ListSerializer):
+    pass
@@ -0,0 +1,177 @@
+import json
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db import connections
+from django.db.models import Q
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import CursorPagination
+
+
+def estimate_count(queryset):
+    """
+    Return a cheap row estimate for ``queryset``.
+
+    On PostgreSQL an unfiltered queryset reads ``pg_class.reltuples`` and a
+    filtered one reads the planner's row estimate, so neither scans the table.
+    Other databases fall back to an exact ``COUNT(*)``.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return queryset.count()
+
+    with connection.cursor() as cursor:
+        if not queryset.query.where:
+            cursor.execute(
+                'SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass',
+                [queryset.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+            # reltuples is -1 for tables that were never vacuumed/analyzed
+            if row and row[0] is not None and row[0] >= 0:
+                return int(row[0])
+            return queryset.count()
+
+        sql, params = queryset.order_by().values('pk').query.sql_with_params()
+        cursor.execute('EXPLAIN (FORMAT JSON) ' + sql, params)
+        plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]['Plan']['Plan Rows'])
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Opt-in cursor pagination for the list endpoints.
+
+    Nothing changes for clients that do not send ``page_size``; they still get
+    the full list. Sending ``?page_size=N`` switches the endpoint to keyset
+    pagination over the view's ``ordering`` (which must be backed by an
+    index), and ``?count=estimate`` adds a cheap row estimate to the envelope.
+
+    DRF's cursor keys on the first ordering field only and steps over ties with
+    an offset it stops honouring after 1000 rows. Here the cursor holds every
+    ordering field, ending with a unique one (the primary key is appended when
+    the ordering does not already end with a unique field), so ties never need
+    an offset. A view that lets clients pick the ordering lists the fields it
+    may page on in ``keyset_ordering_fields``; other orderings are rejected
+    when ``page_size`` is sent.
+    """
+    page_size = None
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+    count_query_param = 'count'
+    ordering = '-pk'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.estimated_count = None
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        unpaged = queryset
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        if self.cursor is None:
+            offset, reverse, current_position = 0, False, None
+        else:
+            offset, reverse, current_position = self.cursor
+
+        queryset = queryset.order_by(*(_reversed(self.ordering) if reverse else self.ordering))
+        if current_position is not None:
+            queryset = queryset.filter(self._after(self._decode_position(current_position), reverse))
+
+        # One extra row tells whether another page follows
+        results = list(queryset[offset:offset + self.page_size + 1])
+        self.page = results[:self.page_size]
+        if len(results) > len(self.page):
+            following_position = self._get_position_from_instance(results[-1], self.ordering)
+        else:
+            following_position = None
+
+        if reverse:
+            self.page.reverse()
+            self.has_next = current_position is not None or offset > 0
+            self.has_previous = following_position is not None
+            self.next_position = current_position
+            self.previous_position = following_position
+        else:
+            self.has_next = following_position is not None
+            self.has_previous = current_position is not None or offset > 0
+            self.next_position = following_position
+            self.previous_position = current_position
+
+        if request.query_params.get(self.count_query_param) == 'estimate':
+            self.estimated_count = estimate_count(unpaged)
+        return self.page
+
+    def get_ordering(self, request, queryset, view):
+        ordering_filters = [
+            filter_cls for filter_cls in getattr(view, 'filter_backends', [])
+            if hasattr(filter_cls, 'get_ordering')
+        ]
+        if not ordering_filters and getattr(view, 'ordering', None):
+            ordering = tuple(view.ordering) if not isinstance(view.ordering, str) else (view.ordering,)
+        else:
+            ordering = tuple(super().get_ordering(request, queryset, view))
+
+        allowed = getattr(view, 'keyset_ordering_fields', None)
+        if allowed is not None and ordering[0].lstrip('-') not in allowed:
+            raise ValidationError({'ordering': (
+                f"Paginated lists can only be ordered by {', '.join(allowed)}; "
+                f"'{ordering[0].lstrip('-')}' repeats too often to page through."
+            )})
+        if not _is_unique(queryset.model, ordering[-1].lstrip('-')):
+            ordering += ('-pk' if ordering[0].startswith('-') else 'pk',)
+        return ordering
+
+    def _get_position_from_instance(self, instance, ordering):
+        values = []
+        for order in ordering:
+            name = order.lstrip('-')
+            value = instance[name] if isinstance(instance, dict) else getattr(instance, name)
+            values.append(None if value is None else str(value))
+        return json.dumps(values)
+
+    def _decode_position(self, position):
+        try:
+            values = json.loads(position)
+        except ValueError:
+            values = None
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return values
+
+    def _after(self, values, reverse):
+        """Rows strictly past ``values`` in the (possibly reversed) ordering."""
+        condition = Q()
+        for index in reversed(range(len(self.ordering))):
+            name = self.ordering[index].lstrip('-')
+            descending = self.ordering[index].startswith('-') != reverse
+            beyond = Q(**{f"{name}__{'lt' if descending else 'gt'}": values[index]})
+            condition = beyond if index == len(self.ordering) - 1 else beyond | (Q(**{name: values[index]}) & condition)
+        return condition
+
+    def get_pagination_data(self):
+        """Pagination keys merged into the existing response envelope."""
+        data = {
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+        }
+        if self.estimated_count is not None:
+            data['estimated_count'] = self.estimated_count
+        return data
+
+
+def _reversed(ordering):
+    return tuple(order[1:] if order.startswith('-') else f'-{order}' for order in ordering)
+
+
+def _is_unique(model, name):
+    if name == 'pk':
+        return True
+    try:
+        field = model._meta.get_field(name)
+    except FieldDoesNotExist:
+        return False
+    return field.primary_key or field.unique
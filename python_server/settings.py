@@ -1,7 +1,8 @@
 # Ensure Django uses the correct backend for custom user model (email-based login)
+# EmailBackend extends ModelBackend (permissions included); listing both would
+# hash a wrong password twice
 AUTHENTICATION_BACKENDS = [
     'users.auth_backend.EmailBackend',
-    'django.contrib.auth.backends.ModelBackend',
 ]
 # Custom user model for email-based authentication
 AUTH_USER_MODEL = 'users.User'
@@ -16,9 +17,29 @@ SIMPLE_JWT = {
 REST_FRAMEWORK = {
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        # Trusts role claims issued at login; no user/profile query per request
+        'users.authentication.RoleClaimsJWTAuthentication',
     ),
     'EXCEPTION_HANDLER': 'python_server.exception_handler.custom_exception_handler',
+    # How many reverse proxies append to X-Forwarded-For in front of the app. The
+    # client IP used by the throttles is taken that many hops from the right, so a
+    # client cannot pick its own. 0 uses REMOTE_ADDR; set 1 behind nginx or Render.
+    'NUM_PROXIES': int(os.environ.get('NUM_PROXIES', 0)),
+    # Sliding-window limits for login and OTP (users/throttling.py), per IP and per
+    # email; override any of them with THROTTLE_<KEY>, e.g. THROTTLE_LOGIN_IP=60/min.
+    # Without REDIS_URL every gunicorn worker counts on its own, so the effective
+    # limit is the rate times the number of workers.
+    'DEFAULT_THROTTLE_RATES': {
+        key: os.environ.get(f'THROTTLE_{key.upper()}', rate)
+        for key, rate in {
+            'login_ip': '30/min',
+            'login_email': '10/min',
+            'otp_request_ip': '10/min',
+            'otp_request_email': '5/hour',
+            'otp_verify_ip': '30/min',
+            'otp_verify_email': '10/hour',
+        }.items()
+    },
 }
 
 SPECTACULAR_SETTINGS = {
@@ -81,11 +102,13 @@ INSTALLED_APPS = [
     'inventory',
     'vendors',
     'categories',
+    'python_server',  # Project-level commands (bench, loadtest) and SQLite tuning
     'rest_framework',
     'drf_spectacular',
 ]
 
 MIDDLEWARE = [
+    'python_server.metrics.MetricsMiddleware',  # first, so the total covers every other middleware
     'django.middleware.security.SecurityMiddleware',
     'corsheaders.middleware.CorsMiddleware',  # CORS middleware
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -96,7 +119,8 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
-ROOT_URLCONF = 'python_server.urls'
+# asgi.py switches to python_server.asgi_urls (async fast-path views)
+ROOT_URLCONF = os.environ.get('DJANGO_ROOT_URLCONF', 'python_server.urls')
 
 TEMPLATES = [
     {
@@ -121,19 +145,145 @@ WSGI_APPLICATION = 'python_server.wsgi.application'
 # https://docs.djangoproject.com/en/5.0/ref/settings/#databases
 
 # Use PostgreSQL for production, SQLite for development
+# Connection reuse: keep each worker's connection for DB_CONN_MAX_AGE seconds
+# (0 = reconnect every request) and ping it before reuse after errors. This
+# only pays off under WSGI: under ASGI each request's sync work may run on a
+# different thread with its own connection, which is then never reused or
+# closed, so asgi.py (DJANGO_ASGI) makes 0 the default there.
+DB_CONN_MAX_AGE = int(os.environ.get('DB_CONN_MAX_AGE', 0 if os.environ.get('DJANGO_ASGI') else 600))
+DB_CONN_HEALTH_CHECKS = os.environ.get('DB_CONN_HEALTH_CHECKS', 'true').lower() in ('1', 'true', 'yes')
+DB_CONNECT_TIMEOUT = int(os.environ.get('DB_CONNECT_TIMEOUT', 5))
 if os.environ.get('DATABASE_URL'):
     import dj_database_url
     DATABASES = {
-        'default': dj_database_url.parse(os.environ.get('DATABASE_URL'))
+        'default': dj_database_url.parse(
+            os.environ.get('DATABASE_URL'),
+            conn_max_age=DB_CONN_MAX_AGE,
+            conn_health_checks=DB_CONN_HEALTH_CHECKS,
+        )
     }
+    # Required behind PgBouncer in transaction pooling mode
+    DATABASES['default']['DISABLE_SERVER_SIDE_CURSORS'] = (
+        os.environ.get('DB_DISABLE_SERVER_SIDE_CURSORS', 'false').lower() in ('1', 'true', 'yes')
+    )
+    if DATABASES['default']['ENGINE'] == 'django.db.backends.postgresql':
+        DATABASES['default'].setdefault('OPTIONS', {})['connect_timeout'] = DB_CONNECT_TIMEOUT
 else:
     DATABASES = {
         'default': {
             'ENGINE': 'django.db.backends.sqlite3',
             'NAME': BASE_DIR / 'db.sqlite3',
+            'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+            'CONN_HEALTH_CHECKS': DB_CONN_HEALTH_CHECKS,
+            # In-memory by default; point at a file to run the multi-process tests on SQLite
+            'TEST': {'NAME': os.environ.get('SQLITE_TEST_NAME')},
+        }
+    }
+
+# Applied to every new SQLite connection (python_server/db.py); ignored on PostgreSQL.
+# busy_timeout comes first so switching to WAL also waits for locks. journal_mode
+# is stored in the database file; SQLITE_KEEP_JOURNAL_MODE=true leaves it as it is
+# (e.g. to keep a checked-in file in rollback mode with no -wal/-shm files).
+SQLITE_KEEP_JOURNAL_MODE = os.environ.get('SQLITE_KEEP_JOURNAL_MODE', 'false').lower() in ('1', 'true', 'yes')
+SQLITE_PRAGMAS = {
+    'busy_timeout': int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', 5000)),
+    'journal_mode': os.environ.get('SQLITE_JOURNAL_MODE', 'wal'),
+    'synchronous': os.environ.get('SQLITE_SYNCHRONOUS', 'normal'),
+    'cache_size': int(os.environ.get('SQLITE_CACHE_SIZE', -20000)),  # negative = KiB, so ~20MB
+    'mmap_size': int(os.environ.get('SQLITE_MMAP_SIZE', 128 * 1024 * 1024)),
+    'temp_store': os.environ.get('SQLITE_TEMP_STORE', 'memory'),
+}
+
+
+
+# Cache
+# Per-process locmem by default; set REDIS_URL to share the cache across workers
+if os.environ.get('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ.get('REDIS_URL'),
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'inventory-app',
         }
     }
 
+# Response caches keyed by a generation token (categories) are only correct when
+# every worker shares the cache: with per-process locmem a write would only
+# invalidate the worker that handled it, and the others would serve stale data.
+# On with REDIS_URL; SHARED_CACHE=true also suits a single-process locmem setup.
+SHARED_CACHE = os.environ.get('SHARED_CACHE', str(bool(os.environ.get('REDIS_URL')))).lower() in ('1', 'true', 'yes')
+
+# How long a user's token version stays cached. With the locmem cache this
+# also bounds how long another worker may keep accepting a revoked token.
+AUTH_TOKEN_VERSION_CACHE_TIMEOUT = int(os.environ.get('AUTH_TOKEN_VERSION_CACHE_TIMEOUT', 60))
+
+# Category list/detail responses (only with SHARED_CACHE); writes invalidate them immediately
+CATEGORY_CACHE_TIMEOUT = int(os.environ.get('CATEGORY_CACHE_TIMEOUT', 300))
+
+
+# Audit log writer: 'buffered' batches writes off the request path, 'sync' writes inline
+AUDIT_LOG_MODE = os.environ.get('AUDIT_LOG_MODE', 'buffered')
+AUDIT_LOG_BATCH_SIZE = int(os.environ.get('AUDIT_LOG_BATCH_SIZE', 200))
+AUDIT_LOG_FLUSH_INTERVAL = float(os.environ.get('AUDIT_LOG_FLUSH_INTERVAL', 2.0))
+AUDIT_LOG_MAX_PENDING = int(os.environ.get('AUDIT_LOG_MAX_PENDING', 10000))
+
+
+# Per-request timings (python_server/metrics.py): Server-Timing header and /metrics
+METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+METRICS_SERVER_TIMING = os.environ.get('METRICS_SERVER_TIMING', 'true').lower() in ('1', 'true', 'yes')
+# How often each worker shares its aggregates through the cache. /metrics is only
+# served with SHARED_CACHE, since per-worker counters would break rate()
+METRICS_SNAPSHOT_INTERVAL = float(os.environ.get('METRICS_SNAPSHOT_INTERVAL', 10))
+# /metrics requires "Authorization: Bearer <token>"; without a token it is only served with DEBUG on
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')
+
+
+# Celery (python_server/celery.py). Without a broker, tasks run eagerly in-process.
+# The broker is set on its own rather than taken from REDIS_URL: queued tasks are
+# only picked up where a worker and beat run (see render.yaml / Dockerfile).
+CELERY_BROKER_URL = os.environ.get('CELERY_BROKER_URL', 'memory://')
+CELERY_RESULT_BACKEND = os.environ.get('CELERY_RESULT_BACKEND')
+CELERY_TASK_ALWAYS_EAGER = os.environ.get(
+    'CELERY_TASK_ALWAYS_EAGER', str(CELERY_BROKER_URL == 'memory://')
+).lower() in ('1', 'true', 'yes')
+CELERY_TASK_EAGER_PROPAGATES = True
+CELERY_TASK_ACKS_LATE = True
+CELERY_WORKER_PREFETCH_MULTIPLIER = 1
+CELERY_TASK_IGNORE_RESULT = CELERY_RESULT_BACKEND is None
+CELERY_BEAT_SCHEDULE = {
+    'purge-expired-otps': {
+        'task': 'users.tasks.purge_expired_otps',
+        'schedule': 15 * 60,
+    },
+    'recompute-vendor-rating-scores': {
+        'task': 'vendors.tasks.recompute_vendor_rating_scores',
+        'schedule': 24 * 60 * 60,
+    },
+    'build-stock-snapshots': {
+        'task': 'inventory.tasks.build_stock_snapshots',
+        'schedule': 60 * 60,  # cheap when there is no complete period to add
+    },
+}
+
+# Stock checkpoints (inventory/snapshots.py): 'daily' or 'monthly', and how long
+# after a period ends before it is checkpointed (lets in-flight movements commit)
+INVENTORY_SNAPSHOT_PERIOD = os.environ.get('INVENTORY_SNAPSHOT_PERIOD', 'daily')
+INVENTORY_SNAPSHOT_SETTLE_SECONDS = int(os.environ.get('INVENTORY_SNAPSHOT_SETTLE_SECONDS', 600))
+
+# SMS delivery for OTPs (users.tasks.send_otp_sms). Without a gateway URL the
+# message is only logged.
+SMS_GATEWAY_URL = os.environ.get('SMS_GATEWAY_URL')
+SMS_GATEWAY_TOKEN = os.environ.get('SMS_GATEWAY_TOKEN')
+
+# OTP storage: users.otp_store.DatabaseOTPStore or users.otp_store.CacheOTPStore
+# (the cache store needs SHARED_CACHE; without it the database store is used)
+OTP_STORE = os.environ.get('OTP_STORE', 'users.otp_store.DatabaseOTPStore')
 
 
 # Password validation
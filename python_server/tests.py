@@ -0,0 +1,276 @@
+import multiprocessing
+import os
+import runpy
+import shutil
+import tempfile
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.db import OperationalError, connection
+from django.db.utils import ConnectionHandler
+from django.http import JsonResponse
+from django.test import AsyncClient, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from categories.models import Category
+from python_server import metrics, settings as project_settings
+from python_server.benchmarks import api_client_for, server_timing_queries
+from users.models import User, UserProfile
+from vendors.models import Vendor
+from vendors.serializers import VendorSerializer
+
+
+def make_user(email, role):
+    user = User.objects.create_user(email=email, password='user-pass-123')
+    UserProfile.objects.create(user=user, role=role)
+    return user
+
+
+def bearer(client):
+    return client._credentials['HTTP_AUTHORIZATION']
+
+
+@override_settings(ROOT_URLCONF='python_server.asgi_urls')
+class AsyncFastPathTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.admin = make_user('admin@example.com', 'admin')
+        self.member = make_user('member@example.com', 'requester')
+        self.admin_auth = bearer(api_client_for(self.admin))
+        self.member_auth = bearer(api_client_for(self.member))
+        self.client = AsyncClient()
+
+    async def test_me_matches_sync_view(self):
+        response = await self.client.get('/api/users/me/', headers={'Authorization': self.member_auth})
+        self.assertIsInstance(response, JsonResponse)  # served by the fast path, not DRF
+        with override_settings(ROOT_URLCONF='python_server.urls'):
+            sync = APIClient(headers={'Authorization': self.member_auth})
+            expected = await sync_to_async(sync.get)('/api/users/me/')
+        self.assertEqual(response.json(), expected.json())
+
+    @override_settings(SHARED_CACHE=True)
+    async def test_category_list_and_conditional_get(self):
+        await Category.objects.acreate(categoryName='Spares')
+        response = await self.client.get('/api/categories/', headers={'Authorization': self.admin_auth})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['categories'][0]['categoryName'], 'Spares')
+        again = await self.client.get(
+            '/api/categories/', headers={'Authorization': self.admin_auth, 'If-None-Match': response['ETag']}
+        )
+        self.assertEqual(again.status_code, 304)
+
+    async def test_vendor_retrieve(self):
+        vendor = await Vendor.objects.acreate(
+            vendorName='Vendor 1', fullAddress='1 Market Road', pincode='700001', city='Kolkata'
+        )
+        response = await self.client.get(f'/api/vendors/vendors/{vendor.uuid}/', headers={'Authorization': self.admin_auth})
+        self.assertIsInstance(response, JsonResponse)
+        self.assertEqual(response.json()['vendor']['vendorName'], 'Vendor 1')
+
+    async def test_declined_requests_fall_back_to_drf(self):
+        # No token, a forbidden role and an unknown vendor get the DRF responses
+        self.assertEqual((await self.client.get('/api/users/me/')).status_code, 401)
+        response = await self.client.get('/api/categories/', headers={'Authorization': self.member_auth})
+        self.assertEqual(response.status_code, 403)
+        missing = await self.client.get(
+            '/api/vendors/vendors/00000000-0000-0000-0000-000000000000/', headers={'Authorization': self.admin_auth}
+        )
+        self.assertEqual(missing.status_code, 404)
+        created = await self.client.post(
+            '/api/categories/', {'categoryName': 'Tools'}, content_type='application/json',
+            headers={'Authorization': self.admin_auth},
+        )
+        self.assertEqual(created.status_code, 201)
+
+
+def sqlite_connection(path):
+    """A standalone connection to the SQLite file at ``path``, outside the test database."""
+    return ConnectionHandler({'default': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': path}})['default']
+
+
+def contend(args):
+    """Worker process: interleave single-row writes with full-table reads."""
+    path, worker, writes = args
+    connection = sqlite_connection(path)
+    errors = 0
+    try:
+        for n in range(writes):
+            try:
+                with connection.cursor() as cursor:
+                    cursor.execute('INSERT INTO hits (worker, n) VALUES (%s, %s)', [worker, n])
+                    cursor.execute('SELECT COUNT(*) FROM hits')
+                    cursor.fetchone()
+            except OperationalError:
+                errors += 1
+    finally:
+        connection.close()
+    return errors
+
+
+class DatabaseSettingsTests(SimpleTestCase):
+    def load(self, **environ):
+        names = ('DATABASE_URL', 'DB_CONN_MAX_AGE', 'DJANGO_ASGI')
+        base = {key: value for key, value in os.environ.items() if key not in names}
+        with mock.patch.dict(os.environ, {**base, **environ}, clear=True):
+            return runpy.run_path(project_settings.__file__)['DATABASES']['default']
+
+    def test_connections_persist_under_wsgi_only(self):
+        self.assertEqual(self.load()['CONN_MAX_AGE'], 600)
+        self.assertEqual(self.load(DJANGO_ASGI='1')['CONN_MAX_AGE'], 0)
+        self.assertEqual(self.load(DJANGO_ASGI='1', DB_CONN_MAX_AGE='60')['CONN_MAX_AGE'], 60)
+
+    def test_database_url_gets_connection_settings(self):
+        database = self.load(DATABASE_URL='postgres://app:secret@db:5432/inventory', DB_CONN_MAX_AGE='30')
+        self.assertEqual(database['ENGINE'], 'django.db.backends.postgresql')
+        self.assertEqual(database['CONN_MAX_AGE'], 30)
+        self.assertTrue(database['CONN_HEALTH_CHECKS'])
+        self.assertEqual(database['OPTIONS']['connect_timeout'], 5)
+        self.assertFalse(database['DISABLE_SERVER_SIDE_CURSORS'])
+
+
+class SQLitePragmaTests(SimpleTestCase):
+    WORKERS = 6
+    WRITES = 150
+
+    def test_pragmas_are_applied_to_new_connections(self):
+        with tempfile.TemporaryDirectory() as directory:
+            connection = sqlite_connection(os.path.join(directory, 'tuned.sqlite3'))
+            with connection.cursor() as cursor:
+                cursor.execute('PRAGMA journal_mode')
+                self.assertEqual(cursor.fetchone()[0], 'wal')
+                cursor.execute('PRAGMA busy_timeout')
+                self.assertEqual(cursor.fetchone()[0], 5000)
+                cursor.execute('PRAGMA synchronous')
+                self.assertEqual(cursor.fetchone()[0], 1)  # NORMAL
+            connection.close()
+
+    def test_default_database_is_switched_to_wal(self):
+        environ = {
+            key: value for key, value in os.environ.items()
+            if key not in ('DATABASE_URL', 'SQLITE_JOURNAL_MODE', 'SQLITE_KEEP_JOURNAL_MODE')
+        }
+        with tempfile.TemporaryDirectory() as directory:
+            # A copy of the project layout, so the checked-in database is not rewritten
+            os.mkdir(os.path.join(directory, 'python_server'))
+            settings_path = shutil.copy(project_settings.__file__, os.path.join(directory, 'python_server'))
+            with mock.patch.dict(os.environ, environ, clear=True):
+                defaults = runpy.run_path(settings_path)
+            path = defaults['DATABASES']['default']['NAME']
+            shutil.copyfile(project_settings.BASE_DIR / 'db.sqlite3', path)
+            with self.settings(
+                SQLITE_PRAGMAS=defaults['SQLITE_PRAGMAS'],
+                SQLITE_KEEP_JOURNAL_MODE=defaults['SQLITE_KEEP_JOURNAL_MODE'],
+            ):
+                connection = sqlite_connection(path)
+                with connection.cursor() as cursor:
+                    cursor.execute('PRAGMA journal_mode')
+                    self.assertEqual(cursor.fetchone()[0], 'wal')
+                connection.close()
+
+    def test_journal_mode_can_be_kept(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'committed.sqlite3')
+            with self.settings(SQLITE_KEEP_JOURNAL_MODE=True):
+                connection = sqlite_connection(path)
+                with connection.cursor() as cursor:
+                    cursor.execute('PRAGMA journal_mode')
+                    self.assertEqual(cursor.fetchone()[0], 'delete')
+                    cursor.execute('PRAGMA busy_timeout')
+                    self.assertEqual(cursor.fetchone()[0], 5000)
+                connection.close()
+            self.assertEqual(os.listdir(directory), ['committed.sqlite3'])
+
+    def test_concurrent_worker_processes_never_see_database_locked(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'contention.sqlite3')
+            connection = sqlite_connection(path)
+            with connection.cursor() as cursor:
+                cursor.execute('CREATE TABLE hits (id INTEGER PRIMARY KEY, worker INTEGER, n INTEGER)')
+            connection.close()
+
+            # Separate processes, like gunicorn workers, each with its own connection
+            with multiprocessing.get_context('fork').Pool(self.WORKERS) as pool:
+                errors = pool.map(contend, [(path, worker, self.WRITES) for worker in range(self.WORKERS)])
+
+            connection = sqlite_connection(path)
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT COUNT(*) FROM hits')
+                total = cursor.fetchone()[0]
+            connection.close()
+        self.assertEqual(sum(errors), 0)
+        self.assertEqual(total, self.WORKERS * self.WRITES)
+
+
+@override_settings(METRICS_TOKEN='scrape-secret', SHARED_CACHE=True)
+class MetricsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        metrics.registry.reset()
+        self.admin = make_user('admin@example.com', 'admin')
+        self.client = api_client_for(self.admin)
+        Vendor.objects.create(vendorName='Vendor 1', fullAddress='1 Market Road', pincode='700001', city='Kolkata')
+
+    def test_server_timing_breaks_down_the_request(self):
+        response = self.client.get('/api/vendors/vendors/')
+        self.assertEqual(response.status_code, 200)
+        phases = {part.split(';')[0]: part for part in response['Server-Timing'].split(', ')}
+        self.assertEqual(set(phases), {'db', 'serializer', 'permission', 'total'})
+        self.assertRegex(phases['db'], r'^db;dur=[\d.]+;desc="[1-9]\d* queries"$')
+
+    def test_server_timing_query_count_matches_captured_queries(self):
+        # manage.py bench --live relies on this count
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get('/api/vendors/vendors/')
+        self.assertEqual(server_timing_queries(response), len(captured.captured_queries))
+
+    def test_phases_are_timed_through_view_and_serializer_hooks(self):
+        self.assertIsInstance(VendorSerializer([], many=True), metrics.TimedListSerializer)
+        timings = metrics.RequestTimings()
+        token = metrics._current.set(timings)
+        try:
+            VendorSerializer(Vendor.objects.all(), many=True).data
+        finally:
+            metrics._current.reset(token)
+        self.assertGreater(timings.serializer, 0)
+        self.assertEqual(timings.permission, 0)
+
+    def scrape(self):
+        return APIClient().get('/metrics', headers={'Authorization': 'Bearer scrape-secret'})
+
+    def test_metrics_exposes_per_route_histograms(self):
+        self.client.get('/api/vendors/vendors/')
+        self.client.get('/api/vendors/vendors/')
+        self.client.get('/api/users/me/')
+        body = self.scrape().content.decode()
+        self.assertIn('http_request_duration_seconds_count{route="vendor-list",method="GET"} 2', body)
+        self.assertIn('http_request_duration_seconds_bucket{route="vendor-list",method="GET",le="+Inf"} 2', body)
+        self.assertIn('http_requests_total{route="me",method="GET",status="200"} 1', body)
+        self.assertRegex(body, r'http_request_db_queries_total\{route="vendor-list",method="GET"\} [1-9]')
+
+    def test_metrics_merges_other_workers_snapshots(self):
+        self.client.get('/api/vendors/vendors/')
+        other = {('vendor-list', 'GET'): metrics.registry.snapshot()[('vendor-list', 'GET')]}
+        cache.set(metrics.SNAPSHOT_KEY.format(999999), other)
+        cache.set(metrics.WORKERS_KEY, {999999})
+        body = self.scrape().content.decode()
+        self.assertIn('http_request_duration_seconds_count{route="vendor-list",method="GET"} 2', body)
+
+    def test_metrics_token(self):
+        scraper = APIClient()
+        self.assertEqual(scraper.get('/metrics').status_code, 403)
+        response = scraper.get('/metrics', headers={'Authorization': 'Bearer scrape-secret'})
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(SHARED_CACHE=False)
+    def test_metrics_need_a_shared_cache(self):
+        self.client.get('/api/vendors/vendors/')
+        self.assertEqual(self.scrape().status_code, 404)
+        self.assertFalse(cache.get(metrics.WORKERS_KEY))
+
+    @override_settings(METRICS_TOKEN='')
+    def test_metrics_without_a_token_are_debug_only(self):
+        self.assertEqual(APIClient().get('/metrics').status_code, 403)
+        with self.settings(DEBUG=True):
+            self.assertEqual(APIClient().get('/metrics').status_code, 200)
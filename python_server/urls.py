@@ -18,6 +18,8 @@ from django.contrib import admin
 from django.urls import path, include
 from django.http import HttpResponse
 
+from .metrics import metrics_view
+
 
 # Simple home view
 def home_view(request):
@@ -150,6 +152,11 @@ def api_docs_view(request):
             <p>Get all vendors</p>
         </div>
         
+        <div class="endpoint">
+            <h3><span class="method get">GET</span>/api/products/</h3>
+            <p>Get products (paginated, filter by category); /api/products/by-code/&lt;code&gt;/ looks one up by SKU or barcode</p>
+        </div>
+        
         <div class="endpoint">
             <h3><span class="method get">GET</span>/api/users/</h3>
             <p>Get user information (requires authentication)</p>
@@ -175,9 +182,14 @@ urlpatterns = [
     path('api/vendors/', include('vendors.urls')),
     path('api/users/', include('users.urls')),
     path('api/categories/', include('categories.urls')),
+    path('api/products/', include('products.urls')),
+    path('api/inventory/', include('inventory.urls')),
     
     # API Documentation endpoints
     path('schema/', SpectacularAPIView.as_view(), name='schema'),
     path('swagger/', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui'),
     path('redoc/', SpectacularRedocView.as_view(url_name='schema'), name='redoc'),
+
+    # Prometheus scrape endpoint
+    path('metrics', metrics_view, name='metrics'),
 ]
@@ -0,0 +1,22 @@
+from rest_framework_simplejwt.settings import api_settings
+
+from python_server.async_views import claims_for, fast_path, json_response
+from .models import User
+from .serializers import UserDetailSerializer
+from .views import MeView
+
+
+async def me(request):
+    token = await claims_for(request)
+    if token is None:
+        return None
+    user = await User.objects.select_related('profile').filter(pk=token[api_settings.USER_ID_CLAIM]).afirst()
+    if user is None:
+        return None
+    return json_response({
+        'message': 'User profile fetched successfully',
+        'data': UserDetailSerializer(user).data
+    })
+
+
+me_view = fast_path(me, MeView.as_view())
@@ -0,0 +1,137 @@
+"""
+Audit log sink.
+
+``record()`` is the single entry point for writing ``AuditLog`` rows. In
+``buffered`` mode (the default) entries are queued in-process once the
+surrounding transaction commits and a background thread writes them with
+``bulk_create`` whenever ``AUDIT_LOG_BATCH_SIZE`` entries are pending or
+every ``AUDIT_LOG_FLUSH_INTERVAL`` seconds, so admin actions no longer pay
+for an extra INSERT and commit. Pending entries are flushed at interpreter
+exit and from gunicorn's ``worker_exit`` hook. An entry the database
+rejects (bad data) is logged and dropped on its own so it cannot hold up
+the rest; on other errors (database unavailable) entries are kept for the
+next flush. ``sync`` mode writes inline.
+"""
+import atexit
+import logging
+import os
+import threading
+
+from django.conf import settings
+from django.db import DataError, IntegrityError, close_old_connections, transaction
+from django.utils import timezone
+
+from .auditlog import AuditLog
+
+logger = logging.getLogger(__name__)
+
+
+class AuditLogBuffer:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = []
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._pid = None
+
+    def add(self, entry):
+        with self._lock:
+            self._ensure_worker()
+            self._entries.append(entry)
+            pending = len(self._entries)
+        if pending >= settings.AUDIT_LOG_MAX_PENDING:
+            # The writer is not keeping up (database down?); apply backpressure
+            self.flush()
+        elif pending >= settings.AUDIT_LOG_BATCH_SIZE:
+            self._wakeup.set()
+
+    def flush(self):
+        """Write every pending entry now; returns how many were written."""
+        with self._lock:
+            entries, self._entries = self._entries, []
+        if not entries:
+            return 0
+        try:
+            with transaction.atomic():
+                AuditLog.objects.bulk_create(entries, batch_size=settings.AUDIT_LOG_BATCH_SIZE)
+        except (DataError, IntegrityError):
+            # One bad row fails the whole batch; isolate it rather than retrying it forever
+            return self._write_each(entries)
+        except Exception:
+            self._requeue(entries)
+            raise
+        return len(entries)
+
+    def _write_each(self, entries):
+        written = 0
+        for index, entry in enumerate(entries):
+            try:
+                with transaction.atomic():
+                    entry.save(force_insert=True)
+            except (DataError, IntegrityError):
+                logger.exception('Dropping an audit log entry that cannot be written: %s %r', entry.action, entry.details)
+                continue
+            except Exception:
+                self._requeue(entries[index:])
+                raise
+            written += 1
+        return written
+
+    def _requeue(self, entries):
+        with self._lock:
+            # Keep them for the next attempt rather than losing audit records
+            self._entries[:0] = entries[:max(settings.AUDIT_LOG_MAX_PENDING - len(self._entries), 0)]
+
+    def _ensure_worker(self):
+        # Threads do not survive fork (gunicorn preload_app), so start one per process
+        if self._pid == os.getpid() and self._thread is not None and self._thread.is_alive():
+            return
+        if self._pid != os.getpid():
+            self._entries = []
+            self._pid = os.getpid()
+        self._thread = threading.Thread(target=self._run, name='audit-log-writer', daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(settings.AUDIT_LOG_FLUSH_INTERVAL)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception:
+                logger.exception('Failed to write buffered audit log entries')
+            finally:
+                close_old_connections()
+
+
+_buffer = AuditLogBuffer()
+
+
+def record(action, user=None, details=None, user_id=None):
+    """
+    Record an audit event.
+
+    Pass ``user_id`` rather than ``user`` where possible: with token-claims
+    authentication ``request.user.pk`` is free while the user object itself
+    costs a query.
+    """
+    if user_id is None and user is not None:
+        user_id = user.pk
+    entry = AuditLog(user_id=user_id, action=action, details=details, timestamp=timezone.now())
+    if settings.AUDIT_LOG_MODE == 'sync':
+        entry.save()
+        return
+    # Only audit what actually committed
+    transaction.on_commit(lambda: _buffer.add(entry))
+
+
+def flush():
+    """Flush pending entries (worker shutdown, management commands, tests)."""
+    try:
+        return _buffer.flush()
+    except Exception:
+        logger.exception('Failed to flush audit log entries')
+        return 0
+
+
+atexit.register(flush)
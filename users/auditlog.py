@@ -1,5 +1,6 @@
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
 
 class AuditLog(models.Model):
     ACTION_CHOICES = [
@@ -14,8 +15,18 @@ class AuditLog(models.Model):
     ]
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True)
     action = models.CharField(max_length=32, choices=ACTION_CHOICES)
-    timestamp = models.DateTimeField(auto_now_add=True)
+    # Set when the event happens, not when the buffered writer flushes it
+    timestamp = models.DateTimeField(default=timezone.now, editable=False)
     details = models.TextField(blank=True, null=True)
 
+    class Meta:
+        indexes = [
+            # Keyset pages are ordered by id; filtered ones use the leading column
+            models.Index(fields=['user', 'id'], name='auditlog_user_id_idx'),
+            models.Index(fields=['action', 'id'], name='auditlog_action_id_idx'),
+            # since/until windows
+            models.Index(fields=['timestamp', 'id'], name='auditlog_ts_id_idx'),
+        ]
+
     def __str__(self):
         return f"{self.user} - {self.action} at {self.timestamp}"
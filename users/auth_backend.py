@@ -1,15 +1,29 @@
 from django.contrib.auth.backends import ModelBackend
 from users.models import User
 
+
+def check_credentials(email, password):
+    """
+    Look up ``email`` (with its profile) and verify ``password`` exactly once.
+
+    Returns ``(user, password_ok)``. ``user`` is None for an unknown email,
+    which still pays for one hash so response times do not reveal which
+    accounts exist.
+    """
+    try:
+        user = User.objects.select_related('profile').get(email=email)
+    except User.DoesNotExist:
+        User().set_password(password)
+        return None, False
+    return user, user.check_password(password)
+
+
 class EmailBackend(ModelBackend):
     def authenticate(self, request, username=None, password=None, **kwargs):
         email = kwargs.get('email', username)
         if email is None or password is None:
             return None
-        try:
-            user = User.objects.get(email=email)
-            if user.check_password(password):
-                return user
-        except User.DoesNotExist:
-            return None
+        user, password_ok = check_credentials(email, password)
+        if password_ok and self.user_can_authenticate(user):
+            return user
         return None
@@ -0,0 +1,53 @@
+from django.utils.functional import SimpleLazyObject
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+
+from .tokens import BLOCKED_CLAIM, ROLE_CLAIM, VERSION_CLAIM, token_is_current
+
+
+class TokenClaimsUser(SimpleLazyObject):
+    """
+    Request user backed by token claims.
+
+    ``id``/``pk`` and the authentication flags come straight from the token, so
+    permission checks never touch the database. Any other attribute loads the
+    real ``User`` row on first access, exactly once per request.
+    """
+    is_authenticated = True
+    is_anonymous = False
+
+    def __init__(self, validated_token, loader):
+        super().__init__(loader)
+        self.__dict__['_user_id'] = validated_token[api_settings.USER_ID_CLAIM]
+
+    @property
+    def pk(self):
+        return self.__dict__['_user_id']
+
+    id = pk
+
+    def __bool__(self):
+        return True
+
+
+class RoleClaimsJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that trusts the role claims issued at login.
+
+    Tokens are revoked through the cached token-version map in
+    ``users.tokens``: blocking, unblocking, deactivating or changing the role
+    of a user bumps their version and every older token stops working.
+    Tokens issued before the claims existed fall back to loading the user.
+    """
+
+    def get_user(self, validated_token):
+        if ROLE_CLAIM not in validated_token or VERSION_CLAIM not in validated_token:
+            return super().get_user(validated_token)
+        if api_settings.USER_ID_CLAIM not in validated_token:
+            return super().get_user(validated_token)
+        if validated_token.get(BLOCKED_CLAIM):
+            raise AuthenticationFailed('User account is blocked.', code='user_blocked')
+        if not token_is_current(validated_token):
+            raise AuthenticationFailed('Token has been revoked. Please log in again.', code='token_revoked')
+        return TokenClaimsUser(validated_token, lambda: super(RoleClaimsJWTAuthentication, self).get_user(validated_token))
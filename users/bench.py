@@ -0,0 +1,117 @@
+import random
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.test import override_settings
+
+from python_server.benchmarks import scenario
+from .models import User, UserProfile
+from .serializers import EmailTokenObtainPairSerializer
+
+BENCH_PASSWORD = 'bench-pass-123'
+
+
+def seed_users(count, batch_size=5000):
+    """Bulk-insert ``count`` requester users with profiles; returns their profile uuids."""
+    # Hash once: seeding should measure the database, not PBKDF2
+    password = make_password(BENCH_PASSWORD)
+    uuids = []
+    for start in range(0, count, batch_size):
+        stop = min(start + batch_size, count)
+        users = User.objects.bulk_create(
+            User(email=f'bench-user-{i}@example.com', password=password)
+            for i in range(start, stop)
+        )
+        profiles = UserProfile.objects.bulk_create(
+            UserProfile(user=user, role='requester', name=f'Bench User {user.pk}')
+            for user in users
+        )
+        uuids.extend(str(profile.uuid) for profile in profiles)
+    return uuids
+
+
+def make_admin(email='bench-admin@example.com'):
+    admin = User.objects.create_user(email=email, password=BENCH_PASSWORD)
+    UserProfile.objects.create(user=admin, role='admin', name='Bench Admin')
+    return admin
+
+
+@scenario('user-retrieve', 'GET /api/users/<uuid>/ by profile uuid across a seeded user table.')
+def user_retrieve(run):
+    uuids = seed_users(run.size)
+    client = run.client(make_admin())
+    rng = random.Random(42)
+    run.measure(
+        'retrieve',
+        lambda i: client.get(f'/api/users/{rng.choice(uuids)}/'),
+        expected_status=200,
+    )
+
+
+@scenario('user-list', 'GET /api/users/: the full list and one keyset page of 50.')
+def user_list(run):
+    seed_users(run.size)
+    client = run.client(make_admin())
+    run.measure('list', lambda i: client.get('/api/users/'), expected_status=200)
+    run.measure('list-page', lambda i: client.get('/api/users/', {'page_size': 50}), expected_status=200)
+
+
+@scenario('token-refresh', 'POST /api/users/token/refresh/ with a valid refresh token.')
+def token_refresh(run):
+    seed_users(run.size)
+    user = User.objects.get(email='bench-user-0@example.com')
+    refresh = str(EmailTokenObtainPairSerializer.get_token(user))
+    client = run.client()
+    run.measure(
+        'refresh',
+        lambda i: client.post('/api/users/token/refresh/', {'refresh': refresh}, format='json'),
+        expected_status=200,
+    )
+
+
+def throttle_rates(**rates):
+    """Settings override replacing the auth throttle rates (empty disables them)."""
+    return override_settings(REST_FRAMEWORK={**settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_RATES': rates})
+
+
+@scenario('login', 'POST /api/users/login/: right, wrong and unknown credentials (throughput per worker) and throttled rejections.')
+def login(run):
+    seed_users(run.size)
+    client = run.client()
+    # Every attempt costs a full PBKDF2 run, so keep the sample count modest
+    iterations = min(run.iterations, 50)
+    rng = random.Random(42)
+
+    def attempt(email, password):
+        return client.post('/api/users/login/', {'email': email, 'password': password}, format='json')
+
+    # Measure the login pipeline itself, not the rate limiter
+    with throttle_rates():
+        run.measure(
+            'success',
+            lambda i: attempt(f'bench-user-{rng.randrange(run.size)}@example.com', BENCH_PASSWORD),
+            expected_status=200,
+            iterations=iterations,
+        )
+        run.measure(
+            'wrong-password',
+            lambda i: attempt(f'bench-user-{rng.randrange(run.size)}@example.com', 'wrong-password'),
+            expected_status=400,
+            iterations=iterations,
+        )
+        run.measure(
+            'unknown-email',
+            lambda i: attempt(f'nobody-{i}@example.com', BENCH_PASSWORD),
+            expected_status=400,
+            iterations=iterations,
+        )
+
+    cache.clear()
+    with throttle_rates(login_ip='1/day'):
+        attempt('bench-user-0@example.com', BENCH_PASSWORD)
+        run.measure(
+            'throttled',
+            lambda i: attempt('bench-user-0@example.com', BENCH_PASSWORD),
+            expected_status=429,
+        )
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from users.otp_store import DEFAULT_PURGE_BATCH_SIZE, get_otp_store
+
+
+class Command(BaseCommand):
+    help = 'Delete expired password-reset OTPs in batches (no-op for the cache-backed store).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_PURGE_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        deleted = get_otp_store().purge_expired(batch_size=max(options['batch_size'], 1))
+        self.stdout.write(self.style.SUCCESS(f'{deleted} expired OTPs deleted.'))
@@ -0,0 +1,21 @@
+# Generated by Django 5.0.3 on 2026-10-17 01:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0010_auditlog_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='passwordresetotp',
+            index=models.Index(fields=['user', 'otp_code', 'is_used', 'expires_at'], name='otp_lookup_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='passwordresetotp',
+            index=models.Index(fields=['expires_at'], name='otp_expires_idx'),
+        ),
+    ]
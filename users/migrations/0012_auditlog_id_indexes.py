@@ -0,0 +1,29 @@
+# Generated by Django 5.0.3 on 2026-10-17 02:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0011_passwordresetotp_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='auditlog',
+            name='auditlog_user_ts_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='auditlog',
+            name='auditlog_action_ts_idx',
+        ),
+        migrations.AddIndex(
+            model_name='auditlog',
+            index=models.Index(fields=['user', 'id'], name='auditlog_user_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='auditlog',
+            index=models.Index(fields=['action', 'id'], name='auditlog_action_id_idx'),
+        ),
+    ]
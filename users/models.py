@@ -1,6 +1,10 @@
 from django.db import models
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin, BaseUserManager
 from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+
+from .tokens import invalidate_token_version
 
 
 # Custom user manager
@@ -31,9 +35,30 @@ class User(AbstractBaseUser, PermissionsMixin):
 
 	objects = CustomUserManager()
 
+	class Meta:
+		indexes = [
+			# Keyset pagination order for the user list
+			models.Index(fields=['date_joined', 'id'], name='user_date_joined_id_idx'),
+		]
+
 	def __str__(self):
 		return self.email
 
+	@classmethod
+	def from_db(cls, db, field_names, values):
+		instance = super().from_db(db, field_names, values)
+		instance._loaded_is_active = instance.__dict__.get('is_active')
+		return instance
+
+	def save(self, *args, **kwargs):
+		super().save(*args, **kwargs)
+		loaded = getattr(self, '_loaded_is_active', None)
+		if loaded is not None and loaded != self.is_active:
+			# Deactivation must revoke tokens that carry role claims
+			UserProfile.objects.filter(user_id=self.pk).update(token_version=F('token_version') + 1)
+			transaction.on_commit(lambda: invalidate_token_version(self.pk))
+		self._loaded_is_active = self.is_active
+
 
 # UserProfile model should be separate
 
@@ -48,7 +73,7 @@ class UserProfile(models.Model):
 	]
 
 	import uuid
-	uuid = models.UUIDField(default=uuid.uuid4, editable=False)
+	uuid = models.UUIDField(default=uuid.uuid4, editable=False, unique=True)
 	user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="profile")
 	role = models.CharField(max_length=20, choices=ROLE_CHOICES)
 	name = models.CharField(max_length=100, blank=True)
@@ -63,9 +88,31 @@ class UserProfile(models.Model):
 	last_otp_used = models.CharField(max_length=6, blank=True, null=True, help_text="Last used OTP to prevent replay attacks")
 	otp_backup_codes = models.JSONField(default=list, blank=True, help_text="Backup codes for 2FA recovery")
 
+	# Embedded in JWTs; bumped whenever role or blocked changes so older tokens stop working
+	token_version = models.PositiveIntegerField(default=0)
+
 	def __str__(self):
 		return f"{self.user.email} ({self.get_role_display()})"
 
+	@classmethod
+	def from_db(cls, db, field_names, values):
+		instance = super().from_db(db, field_names, values)
+		instance._loaded_auth_state = (instance.__dict__.get('role'), instance.__dict__.get('blocked'))
+		return instance
+
+	def save(self, *args, **kwargs):
+		loaded = getattr(self, '_loaded_auth_state', None)
+		# Fields deferred at load time show up as None and are treated as unknown
+		changed = loaded is not None and None not in loaded and loaded != (self.role, self.blocked)
+		if changed:
+			self.token_version += 1
+			if kwargs.get('update_fields') is not None:
+				kwargs['update_fields'] = set(kwargs['update_fields']) | {'token_version'}
+		super().save(*args, **kwargs)
+		self._loaded_auth_state = (self.role, self.blocked)
+		if changed:
+			transaction.on_commit(lambda: invalidate_token_version(self.user_id))
+
 
 # OTP Model for SMS-based 2FA
 class PasswordResetOTP(models.Model):
@@ -81,6 +128,12 @@ class PasswordResetOTP(models.Model):
 	
 	class Meta:
 		ordering = ['-created_at']
+		indexes = [
+			# Verification lookup (users.otp_store.DatabaseOTPStore.consume)
+			models.Index(fields=['user', 'otp_code', 'is_used', 'expires_at'], name='otp_lookup_idx'),
+			# Batched purge of expired rows
+			models.Index(fields=['expires_at'], name='otp_expires_idx'),
+		]
 	
 	def __str__(self):
 		return f"OTP for {self.user.email} - {self.otp_code} ({'Used' if self.is_used else 'Active'})"
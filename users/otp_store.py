@@ -0,0 +1,103 @@
+"""
+Pluggable storage for password-reset OTPs.
+
+``settings.OTP_STORE`` names the backend class:
+
+* ``users.otp_store.DatabaseOTPStore`` (default) keeps ``PasswordResetOTP``
+  rows. Verification is a single indexed ``UPDATE`` that also marks the code
+  used, and ``purge_expired()`` (run by ``manage.py purge_expired_otps`` or
+  the periodic task) deletes expired rows in batches so the table stays
+  bounded.
+* ``users.otp_store.CacheOTPStore`` keeps codes in the shared cache with a
+  native TTL. Nothing needs purging, and verification is one ``DELETE``.
+  It needs ``SHARED_CACHE``: a per-process cache would lose codes issued by
+  another worker, so without it the database store is used instead.
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import PasswordResetOTP
+
+logger = logging.getLogger(__name__)
+
+OTP_TTL = timedelta(minutes=10)
+DEFAULT_PURGE_BATCH_SIZE = 5000
+
+
+class BaseOTPStore:
+    def issue(self, user, request_type='password_reset', ttl=OTP_TTL):
+        """Create and store a new code for ``user``; returns the code."""
+        raise NotImplementedError
+
+    def consume(self, user, code, request_type='password_reset'):
+        """Atomically use up ``code``; True only if it was valid, unused and unexpired."""
+        raise NotImplementedError
+
+    def purge_expired(self, batch_size=DEFAULT_PURGE_BATCH_SIZE):
+        """Delete expired codes; returns how many were removed."""
+        return 0
+
+
+class DatabaseOTPStore(BaseOTPStore):
+    def issue(self, user, request_type='password_reset', ttl=OTP_TTL):
+        otp_code = PasswordResetOTP.generate_otp()
+        PasswordResetOTP.objects.create(
+            user=user,
+            otp_code=otp_code,
+            expires_at=timezone.now() + ttl,
+            request_type=request_type,
+        )
+        return otp_code
+
+    def consume(self, user, code, request_type='password_reset'):
+        # One UPDATE on otp_lookup_idx; concurrent attempts cannot both succeed
+        return PasswordResetOTP.objects.filter(
+            user=user,
+            otp_code=code,
+            is_used=False,
+            expires_at__gt=timezone.now(),
+            request_type=request_type,
+        ).update(is_used=True) > 0
+
+    def purge_expired(self, batch_size=DEFAULT_PURGE_BATCH_SIZE):
+        now = timezone.now()
+        deleted = 0
+        while True:
+            # Short batches keep each DELETE's locks and WAL small
+            ids = list(
+                PasswordResetOTP.objects.filter(expires_at__lte=now)
+                .order_by().values_list('pk', flat=True)[:batch_size]
+            )
+            if not ids:
+                return deleted
+            # Nothing cascades from OTP rows, so this is a single fast DELETE
+            deleted += PasswordResetOTP.objects.filter(pk__in=ids).delete()[0]
+
+
+class CacheOTPStore(BaseOTPStore):
+    key_format = 'otp:{request_type}:{user_id}:{code}'
+
+    def _key(self, user, code, request_type):
+        return self.key_format.format(request_type=request_type, user_id=user.pk, code=code)
+
+    def issue(self, user, request_type='password_reset', ttl=OTP_TTL):
+        otp_code = PasswordResetOTP.generate_otp()
+        cache.set(self._key(user, otp_code, request_type), 1, int(ttl.total_seconds()))
+        return otp_code
+
+    def consume(self, user, code, request_type='password_reset'):
+        # delete() reports whether the key existed, so each code works once
+        return bool(cache.delete(self._key(user, code, request_type)))
+
+
+def get_otp_store():
+    store_class = import_string(settings.OTP_STORE)
+    if issubclass(store_class, CacheOTPStore) and not settings.SHARED_CACHE:
+        logger.warning('%s needs SHARED_CACHE; using DatabaseOTPStore', settings.OTP_STORE)
+        store_class = DatabaseOTPStore
+    return store_class()
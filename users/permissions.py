@@ -1,34 +1,59 @@
 from rest_framework import permissions
 
+from .tokens import ROLE_CLAIM
+
+
+def get_request_role(request):
+    """
+    Role of the requesting user.
+
+    Read from the access token's role claim when present, which costs no
+    queries; older tokens and session/forced auth fall back to the profile.
+    """
+    user = request.user
+    if not user or not user.is_authenticated:
+        return None
+    claims = getattr(request.auth, 'payload', None)
+    if claims and ROLE_CLAIM in claims:
+        return claims[ROLE_CLAIM]
+    profile = getattr(user, 'profile', None)
+    return profile.role if profile is not None else None
+
+
 class IsAdminRole(permissions.BasePermission):
     """
     Custom permission to only allow users with admin role in their profile.
     This works with our UserProfile.role = 'admin' system instead of Django's is_staff.
     """
-    
+
     def has_permission(self, request, view):
-        return (
-            request.user and 
-            request.user.is_authenticated and
-            hasattr(request.user, 'profile') and 
-            request.user.profile.role == 'admin'
-        )
+        return get_request_role(request) == 'admin'
 
 class IsAdminOrReadOnly(permissions.BasePermission):
     """
     Custom permission to allow read access to authenticated users,
     but only allow write access to admin role users.
     """
-    
+
     def has_permission(self, request, view):
         # Read permissions for authenticated users
         if request.method in permissions.SAFE_METHODS:
             return request.user and request.user.is_authenticated
-        
+
         # Write permissions only for admin role
-        return (
-            request.user and 
-            request.user.is_authenticated and
-            hasattr(request.user, 'profile') and 
-            request.user.profile.role == 'admin'
-        )
\ No newline at end of file
+        return get_request_role(request) == 'admin'
+
+
+INVENTORY_ROLES = ('admin', 'inventorymanager', 'storekeeper')
+
+
+class IsInventoryRole(permissions.BasePermission):
+    """
+    Read access for authenticated users; stock-changing writes for the
+    admin, inventory manager and storekeeper roles.
+    """
+
+    def has_permission(self, request, view):
+        if request.method in permissions.SAFE_METHODS:
+            return request.user and request.user.is_authenticated
+        return get_request_role(request) in INVENTORY_ROLES
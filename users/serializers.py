@@ -1,60 +1,75 @@
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from python_server.metrics import TimedSerializerMixin
+from django.contrib.auth.models import update_last_login
 
 # Custom serializer for email-based JWT login
 from users.models import UserProfile
+from users.tokens import add_role_claims, token_is_current
+from users.auth_backend import check_credentials
 
-class EmailTokenObtainPairSerializer(TokenObtainPairSerializer):
+class EmailTokenObtainPairSerializer(TimedSerializerMixin, TokenObtainPairSerializer):
     username_field = 'email'
 
+    @classmethod
+    def get_token(cls, user):
+        # Role claims let RoleClaimsJWTAuthentication skip the user/profile queries
+        return add_role_claims(super().get_token(user), user)
+
     def validate(self, attrs):
-        try:
-            from django.contrib.auth import authenticate
-            email = attrs.get('email')
-            password = attrs.get('password')
-            if not email or not password:
-                raise serializers.ValidationError({'message': 'Email and password are required.'})
-            user = authenticate(request=self.context.get('request'), username=email, password=password)
-            if user is None:
-                # Check if user exists for better error
-                from users.models import User
-                try:
-                    user_obj = User.objects.get(email=email)
-                    if not user_obj.check_password(password):
-                        raise serializers.ValidationError({'message': 'Invalid password.'})
-                    if not user_obj.is_active:
-                        raise serializers.ValidationError({'message': 'User account is inactive.'})
-                    if hasattr(user_obj, 'profile') and getattr(user_obj.profile, 'blocked', False):
-                        raise serializers.ValidationError({'message': 'User account is blocked.'})
-                except User.DoesNotExist:
-                    raise serializers.ValidationError({'message': 'User with this email does not exist.'})
-                raise serializers.ValidationError({'message': 'Authentication failed.'})
-            if not user.is_active:
-                raise serializers.ValidationError({'message': 'User account is inactive.'})
-            if hasattr(user, 'profile') and getattr(user.profile, 'blocked', False):
-                raise serializers.ValidationError({'message': 'User account is blocked.'})
-            data = super().validate(attrs)
-            data['user'] = {
-                'uuid': str(user.profile.uuid) if hasattr(user, 'profile') else None,
+        # One user+profile lookup and one password hash per attempt, whatever the outcome
+        email = attrs.get('email')
+        password = attrs.get('password')
+        if not email or not password:
+            raise serializers.ValidationError({'message': 'Email and password are required.'})
+        user, password_ok = check_credentials(email, password)
+        if user is None:
+            raise serializers.ValidationError({'message': 'User with this email does not exist.'})
+        if not password_ok:
+            raise serializers.ValidationError({'message': 'Invalid password.'})
+        if not user.is_active:
+            raise serializers.ValidationError({'message': 'User account is inactive.'})
+        profile = getattr(user, 'profile', None)
+        if profile is not None and profile.blocked:
+            raise serializers.ValidationError({'message': 'User account is blocked.'})
+
+        refresh = self.get_token(user)
+        if jwt_settings.UPDATE_LAST_LOGIN:
+            update_last_login(None, user)
+        return {
+            'refresh': str(refresh),
+            'access': str(refresh.access_token),
+            'user': {
+                'uuid': str(profile.uuid) if profile else None,
                 'email': user.email,
-                'role': getattr(user.profile, 'role', None) if hasattr(user, 'profile') else None,
+                'role': profile.role if profile else None,
                 'is_active': user.is_active,
-            }
-            return data
-        except Exception as e:
-            import traceback
-            print('LOGIN ERROR:', traceback.format_exc())
-            raise serializers.ValidationError({'message': f'Login failed: {str(e)}'})
+            },
+        }
+
+
+class RoleClaimsTokenRefreshSerializer(TimedSerializerMixin, TokenRefreshSerializer):
+    """Refuse to refresh tokens whose role claims were revoked."""
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs['refresh'])
+        if not token_is_current(refresh):
+            raise InvalidToken('Token has been revoked. Please log in again.')
+        return super().validate(attrs)
+
 
 from rest_framework import serializers
 from users.models import User
 from .models import UserProfile
+from .auditlog import AuditLog
 
-class UserProfileSerializer(serializers.ModelSerializer):
+class UserProfileSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = UserProfile
         fields = ('role', 'uuid', 'blocked')
 
-class UserDetailSerializer(serializers.ModelSerializer):
+class UserDetailSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     profile = UserProfileSerializer(read_only=True)
     status = serializers.SerializerMethodField()
     
@@ -96,22 +111,29 @@ class UserDetailSerializer(serializers.ModelSerializer):
             'role': profile.role if profile else None
         }
 
-class UserUpdateSerializer(serializers.ModelSerializer):
+class AuditLogSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    actor = serializers.EmailField(source='user.email', read_only=True, allow_null=True)
+
+    class Meta:
+        model = AuditLog
+        fields = ('id', 'timestamp', 'action', 'actor', 'details')
+
+class UserUpdateSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ('email', 'is_active')
 
-class UserStatusSerializer(serializers.ModelSerializer):
+class UserStatusSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ('is_active',)
 
-class UserPasswordSerializer(serializers.Serializer):
+class UserPasswordSerializer(TimedSerializerMixin, serializers.Serializer):
     password = serializers.CharField(write_only=True)
 
 
 # Public registration for Admin users (entry point of hierarchy)
-class AdminRegistrationSerializer(serializers.ModelSerializer):
+class AdminRegistrationSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     name = serializers.CharField(write_only=True)
     email = serializers.EmailField(write_only=True)
     phone_number = serializers.CharField(write_only=True, required=False, allow_blank=True)
@@ -168,7 +190,7 @@ class AdminRegistrationSerializer(serializers.ModelSerializer):
 
 
 # Protected registration for other roles (admin only - excludes admin and super_admin)
-class UserRegistrationSerializer(serializers.ModelSerializer):
+class UserRegistrationSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     # Define allowed roles for this endpoint (excluding admin and super_admin)
     ALLOWED_ROLES = [
         ('storekeeper', 'Store Keeper'),
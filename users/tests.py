@@ -1,3 +1,377 @@
-from django.test import TestCase
+import json
+import urllib.error
+from io import StringIO
+from unittest import mock
+from datetime import timedelta
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import transaction
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from . import audit
+from .auditlog import AuditLog
+from .models import PasswordResetOTP, User, UserProfile
+from .otp_store import DatabaseOTPStore
+
+
+def make_user(email, role='requester', password='user-pass-123', **profile_fields):
+    user = User.objects.create_user(email=email, password=password)
+    UserProfile.objects.create(user=user, role=role, **profile_fields)
+    return user
+
+
+class UserDetailLookupTests(TestCase):
+    def setUp(self):
+        self.admin = make_user('admin@example.com', role='admin')
+        self.target = make_user('target@example.com')
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_retrieve_by_profile_uuid(self):
+        response = self.client.get(f'/api/users/{self.target.profile.uuid}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['data']['email'], 'target@example.com')
+
+    def test_malformed_uuid_is_not_found_without_query(self):
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/users/abc-123/')
+        self.assertEqual(response.status_code, 404)
+
+    def test_set_status_by_profile_uuid(self):
+        response = self.client.patch(
+            f'/api/users/{self.target.profile.uuid}/status/', {'is_active': False}, format='json'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.target.refresh_from_db()
+        self.assertFalse(self.target.is_active)
+
+
+class RoleClaimsAuthenticationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.admin = make_user('admin@example.com', role='admin')
+        self.member = make_user('member@example.com')
+        self.client = APIClient()
+
+    def login(self, email, password='user-pass-123'):
+        response = self.client.post('/api/users/login/', {'email': email, 'password': password}, format='json')
+        self.assertEqual(response.status_code, 200, response.data)
+        return response.data['access']
+
+    def test_admin_permission_check_needs_no_queries(self):
+        token = self.login('admin@example.com')
+        self.assertEqual(AccessToken(token)['role'], 'admin')
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        self.client.get('/api/vendors/vendors/')  # warm the token version cache
+        # Only the vendor list query itself remains
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/vendors/vendors/')
+        self.assertEqual(response.status_code, 200)
+
+    def test_blocking_revokes_existing_tokens(self):
+        token = self.login('member@example.com')
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        self.assertEqual(self.client.get('/api/users/').status_code, 200)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            profile = UserProfile.objects.get(user=self.member)
+            profile.blocked = True
+            profile.save()
+
+        self.assertEqual(self.client.get('/api/users/').status_code, 401)
+
+    def test_role_change_revokes_refresh_token(self):
+        refresh = self.client.post(
+            '/api/users/login/', {'email': 'member@example.com', 'password': 'user-pass-123'}, format='json'
+        ).data['refresh']
+        with self.captureOnCommitCallbacks(execute=True):
+            profile = UserProfile.objects.get(user=self.member)
+            profile.role = 'storekeeper'
+            profile.save()
+        response = self.client.post('/api/users/token/refresh/', {'refresh': refresh}, format='json')
+        self.assertEqual(response.status_code, 401)
+
+
+class LoginTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.member = make_user('member@example.com')
+        self.client = APIClient()
+
+    def login(self, email, password):
+        return self.client.post('/api/users/login/', {'email': email, 'password': password}, format='json')
+
+    def count_hashes(self, email, password):
+        with mock.patch.object(PBKDF2PasswordHasher, 'encode', autospec=True,
+                               side_effect=PBKDF2PasswordHasher.encode) as encode:
+            with self.assertNumQueries(1):
+                response = self.login(email, password)
+        return response, encode.call_count
+
+    def test_wrong_password_costs_one_lookup_and_one_hash(self):
+        response, hashes = self.count_hashes('member@example.com', 'wrong-pass')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['message'], 'Invalid password.')
+        self.assertEqual(hashes, 1)
+
+    def test_unknown_email_still_hashes_once(self):
+        response, hashes = self.count_hashes('nobody@example.com', 'wrong-pass')
+        self.assertEqual(response.data['message'], 'User with this email does not exist.')
+        self.assertEqual(hashes, 1)
+
+    def test_blocked_and_inactive_messages(self):
+        UserProfile.objects.filter(user=self.member).update(blocked=True)
+        self.assertEqual(self.login('member@example.com', 'user-pass-123').data['message'], 'User account is blocked.')
+        User.objects.filter(pk=self.member.pk).update(is_active=False)
+        self.assertEqual(self.login('member@example.com', 'user-pass-123').data['message'], 'User account is inactive.')
+
+    def test_success_returns_tokens_and_user(self):
+        response = self.login('member@example.com', 'user-pass-123')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['message'], 'Login successful')
+        self.assertEqual(response.data['user']['role'], 'requester')
+        self.assertEqual(AccessToken(response.data['access'])['role'], 'requester')
+
+
+class AuthThrottleTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        make_user('member@example.com')
+        self.client = APIClient()
+
+    def rates(self, **rates):
+        return override_settings(REST_FRAMEWORK={**settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_RATES': rates})
+
+    def login(self, email, password='wrong-pass'):
+        return self.client.post('/api/users/login/', {'email': email, 'password': password}, format='json')
+
+    def test_email_limit_rejects_before_any_query(self):
+        with self.rates(login_ip='100/min', login_email='2/min'):
+            self.assertEqual(self.login('member@example.com').status_code, 400)
+            self.assertEqual(self.login('Member@example.com ').status_code, 400)
+            with self.assertNumQueries(0):
+                response = self.login('member@example.com', 'user-pass-123')
+            self.assertEqual(response.status_code, 429)
+            self.assertIn('Retry-After', response)
+            self.assertIn('throttled', response.data['message'])
+            # Another account from the same IP is still allowed
+            self.assertEqual(self.login('other@example.com').status_code, 400)
+
+    def test_ip_limit_applies_across_emails(self):
+        with self.rates(login_ip='2/min', login_email='100/min'):
+            self.login('a@example.com')
+            self.login('b@example.com')
+            self.assertEqual(self.login('c@example.com').status_code, 429)
+
+    def test_forwarded_for_cannot_reset_the_ip_limit(self):
+        with self.rates(login_ip='2/min', login_email='100/min'):
+            for spoofed in ('203.0.113.1', '203.0.113.2', '203.0.113.3'):
+                response = self.client.post(
+                    '/api/users/login/', {'email': 'a@example.com', 'password': 'wrong-pass'},
+                    format='json', HTTP_X_FORWARDED_FOR=spoofed,
+                )
+            self.assertEqual(response.status_code, 429)
+
+    def test_otp_endpoints_have_their_own_limits(self):
+        with self.rates(otp_request_ip='1/min', login_ip='100/min'):
+            payload = {'email': 'member@example.com', 'otp_method': 'sms'}
+            self.client.post('/api/users/request-otp-reset/', payload, format='json')
+            self.assertEqual(self.client.post('/api/users/request-otp-reset/', payload, format='json').status_code, 429)
+            self.assertEqual(self.login('member@example.com').status_code, 400)
+
+
+class OTPStoreTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.member = make_user('member@example.com', phone_number='9876543210')
+        self.client = APIClient()
+
+    def reset_with_otp(self, otp_code):
+        return self.client.post('/api/users/verify-otp-reset/', {
+            'email': 'member@example.com', 'otp_code': otp_code,
+            'new_password': 'new-pass-123', 'confirm_password': 'new-pass-123',
+        }, format='json')
+
+    def request_sms(self):
+        return self.client.post(
+            '/api/users/request-otp-reset/', {'email': 'member@example.com', 'otp_method': 'sms'}, format='json'
+        )
+
+    def check_single_use(self):
+        with self.settings(DEBUG=True):
+            otp_code = self.request_sms().data['data']['otp_for_dev']
+        self.assertEqual(self.reset_with_otp(otp_code).status_code, 200)
+        self.assertEqual(self.reset_with_otp(otp_code).status_code, 400)
+
+    def test_database_store_codes_work_once(self):
+        self.check_single_use()
+
+    @override_settings(OTP_STORE='users.otp_store.CacheOTPStore', SHARED_CACHE=True)
+    def test_cache_store_codes_work_once(self):
+        self.check_single_use()
+        self.assertFalse(PasswordResetOTP.objects.exists())
+
+    @override_settings(OTP_STORE='users.otp_store.CacheOTPStore', SHARED_CACHE=False)
+    def test_cache_store_needs_a_shared_cache(self):
+        # A per-worker cache would lose codes issued by another worker
+        with self.assertLogs('users.otp_store', 'WARNING'):
+            self.check_single_use()
+        self.assertTrue(PasswordResetOTP.objects.filter(is_used=True).exists())
+
+    @override_settings(SMS_GATEWAY_URL='https://sms.example.com/send')
+    def test_sms_is_sent_by_task_after_commit(self):
+        with mock.patch('users.tasks.urllib.request.urlopen') as urlopen:
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.request_sms()
+                urlopen.assert_not_called()
+        self.assertNotIn('otp_for_dev', response.data['data'])
+        sent = json.loads(urlopen.call_args.args[0].data)
+        self.assertEqual(sent['to'], '9876543210')
+        otp_code = sent['message'].rsplit(' ', 1)[-1]
+        self.assertEqual(self.reset_with_otp(otp_code).status_code, 200)
+
+    @override_settings(SMS_GATEWAY_URL='https://sms.example.com/send')
+    def test_gateway_failure_without_a_worker_still_answers(self):
+        with mock.patch('users.tasks.urllib.request.urlopen', side_effect=urllib.error.URLError('down')) as urlopen:
+            with self.assertLogs('users.tasks', 'WARNING'):
+                with self.captureOnCommitCallbacks(execute=True):
+                    response = self.request_sms()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(urlopen.call_count, 1)
+
+    def test_expired_code_is_rejected_and_purged(self):
+        store = DatabaseOTPStore()
+        otp_code = store.issue(self.member, ttl=timedelta(minutes=-1))
+        live_code = store.issue(self.member)
+        self.assertEqual(self.reset_with_otp(otp_code).status_code, 400)
+        call_command('purge_expired_otps', '--batch-size', '1', stdout=StringIO())
+        self.assertEqual(list(PasswordResetOTP.objects.values_list('otp_code', flat=True)), [live_code])
+
+
+class UserExportTests(TestCase):
+    def test_admin_can_export_users_as_zstd_jsonl(self):
+        import zstandard
+
+        admin = make_user('admin@example.com', role='admin')
+        make_user('member@example.com')
+        client = APIClient()
+        client.force_authenticate(admin)
+        response = client.get('/api/users/export/?file_format=jsonl&compression=zstd')
+        self.assertEqual(response.status_code, 200)
+        payload = zstandard.ZstdDecompressor().decompressobj().decompress(b''.join(response.streaming_content))
+        emails = [json.loads(line)['email'] for line in payload.decode().splitlines()]
+        self.assertEqual(emails, ['admin@example.com', 'member@example.com'])
+
+    def test_non_admin_cannot_export(self):
+        client = APIClient()
+        client.force_authenticate(make_user('member@example.com'))
+        self.assertEqual(client.get('/api/users/export/').status_code, 403)
+        self.assertEqual(client.get('/api/users/audit-logs/export/').status_code, 403)
+
+
+@override_settings(AUDIT_LOG_MODE='sync')
+class AuditLogWriterTests(TestCase):
+    def setUp(self):
+        self.admin = make_user('admin@example.com', role='admin')
+        self.target = make_user('target@example.com')
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_sync_mode_writes_inline(self):
+        response = self.client.patch('/api/users/block/', {'email': 'target@example.com'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        log = AuditLog.objects.get()
+        self.assertEqual((log.user_id, log.action), (self.admin.pk, 'block'))
+
+    @override_settings(AUDIT_LOG_MODE='buffered', AUDIT_LOG_FLUSH_INTERVAL=3600)
+    def test_buffered_mode_defers_until_commit_and_flush(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            audit.record('block', user_id=self.admin.pk, details='Blocked user target@example.com')
+            audit.record('unblock', user_id=self.admin.pk, details='Unblocked user target@example.com')
+        self.assertFalse(AuditLog.objects.exists())
+        self.assertEqual(audit.flush(), 2)
+        self.assertEqual(list(AuditLog.objects.order_by('id').values_list('action', flat=True)), ['block', 'unblock'])
+
+    @override_settings(AUDIT_LOG_MODE='buffered', AUDIT_LOG_FLUSH_INTERVAL=3600)
+    def test_buffered_mode_drops_rolled_back_events(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    audit.record('delete', user_id=self.admin.pk)
+                    raise ValueError
+            except ValueError:
+                pass
+        self.assertEqual(audit.flush(), 0)
+
+    @override_settings(AUDIT_LOG_MODE='buffered', AUDIT_LOG_FLUSH_INTERVAL=3600)
+    def test_a_bad_entry_is_dropped_without_blocking_the_rest(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            audit.record('block', user_id=self.admin.pk)
+            audit.record(None, user_id=self.admin.pk)  # violates NOT NULL
+            audit.record('unblock', user_id=self.admin.pk)
+        with self.assertLogs('users.audit', 'ERROR'):
+            self.assertEqual(audit.flush(), 2)
+        self.assertEqual(list(AuditLog.objects.order_by('id').values_list('action', flat=True)), ['block', 'unblock'])
+        self.assertEqual(audit.flush(), 0)
+
+
+class AuditLogListTests(TestCase):
+    def setUp(self):
+        self.admin = make_user('admin@example.com', role='admin')
+        self.member = make_user('member@example.com')
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+        now = timezone.now()
+        for days_ago, user, action in [(3, self.admin, 'block'), (2, self.member, 'change_password'),
+                                       (1, self.admin, 'unblock'), (0, self.admin, 'delete')]:
+            AuditLog.objects.create(user=user, action=action, timestamp=now - timedelta(days=days_ago))
+
+    def actions(self, response):
+        self.assertEqual(response.status_code, 200, response.data)
+        return [entry['action'] for entry in response.data['data']]
+
+    def test_keyset_pages_newest_first(self):
+        first = self.client.get('/api/users/audit-logs/?page_size=3')
+        self.assertEqual(self.actions(first), ['delete', 'unblock', 'change_password'])
+        second = self.client.get(first.data['next'])
+        self.assertEqual(self.actions(second), ['block'])
+        self.assertIsNone(second.data['next'])
+
+    def test_keyset_pages_cover_tied_timestamps(self):
+        stamp = timezone.now()
+        AuditLog.objects.bulk_create(AuditLog(user=self.admin, action='block', timestamp=stamp) for _ in range(1100))
+        seen, url = [], '/api/users/audit-logs/?page_size=1000'
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            seen += [entry['id'] for entry in response.data['data']]
+            url = response.data['next']
+        self.assertEqual(len(seen), 1104)
+        self.assertEqual(seen, sorted(set(seen), reverse=True))
+
+    def test_filters_by_actor_action_and_window(self):
+        member_uuid = self.member.profile.uuid
+        self.assertEqual(self.actions(self.client.get(f'/api/users/audit-logs/?actor={member_uuid}')), ['change_password'])
+        self.assertEqual(
+            self.actions(self.client.get('/api/users/audit-logs/?actor=admin@example.com&action=block')), ['block']
+        )
+        # Naive values are read in the current time zone
+        since = timezone.localtime(timezone.now() - timedelta(days=2, hours=1)).strftime('%Y-%m-%dT%H:%M:%S')
+        until = timezone.localtime(timezone.now() - timedelta(hours=12)).strftime('%Y-%m-%dT%H:%M:%S')
+        response = self.client.get('/api/users/audit-logs/', {'since': since, 'until': until})
+        self.assertEqual(self.actions(response), ['unblock', 'change_password'])
+        self.assertEqual(self.actions(self.client.get('/api/users/audit-logs/?actor=nobody@example.com')), [])
+
+    def test_invalid_window_is_rejected(self):
+        response = self.client.get('/api/users/audit-logs/?since=yesterday')
+        self.assertEqual(response.status_code, 400)
+
+    def test_non_admin_cannot_list(self):
+        self.client.force_authenticate(self.member)
+        self.assertEqual(self.client.get('/api/users/audit-logs/').status_code, 403)
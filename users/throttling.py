@@ -0,0 +1,103 @@
+"""
+Sliding-window rate limits for the unauthenticated auth endpoints.
+
+Counters live in the shared cache, so with REDIS_URL every gunicorn worker
+enforces the same limit. Under the per-process locmem fallback each worker
+keeps its own window and a client gets up to the rate times the number of
+workers. Each key keeps one counter per fixed window,
+and the request count is estimated as
+
+    previous_window * (share of the previous window still inside the sliding
+    window) + current_window
+
+This is the usual sliding-window counter: three cache operations per key,
+atomic increments, and no per-request timestamp lists. Throttles run in
+``APIView.initial()``, before the serializer, so a rejected attempt never
+touches the database or hashes a password.
+
+A view opts in with ``throttle_scope = '<scope>'`` and reads its limits from
+``REST_FRAMEWORK['DEFAULT_THROTTLE_RATES']['<scope>_ip' / '<scope>_email']``.
+A missing or ``None`` rate disables that key.
+"""
+import hashlib
+import time
+
+from django.core.cache import cache
+from rest_framework.exceptions import ParseError
+from rest_framework.settings import api_settings
+from rest_framework.throttling import SimpleRateThrottle
+
+
+class SlidingWindowThrottle(SimpleRateThrottle):
+    ident_kind = None
+    cache_format = 'throttle:%(scope)s:%(ident)s:%(window)d'
+
+    def __init__(self):
+        # The scope comes from the view, so rates are resolved per request
+        self.wait_seconds = None
+
+    def get_rate(self):
+        # Read at request time so settings overrides apply
+        return api_settings.DEFAULT_THROTTLE_RATES.get(self.scope)
+
+    def get_ident_value(self, request):
+        raise NotImplementedError('.get_ident_value() must be overridden')
+
+    def allow_request(self, request, view):
+        view_scope = getattr(view, 'throttle_scope', None)
+        if not view_scope:
+            return True
+        self.scope = f'{view_scope}_{self.ident_kind}'
+        rate = self.get_rate()
+        if rate is None:
+            return True
+        self.num_requests, self.duration = self.parse_rate(rate)
+        ident = self.get_ident_value(request)
+        if not ident:
+            return True
+
+        window, offset = divmod(time.time(), self.duration)
+        window = int(window)
+        current_key = self.cache_format % {'scope': self.scope, 'ident': ident, 'window': window}
+        previous_key = self.cache_format % {'scope': self.scope, 'ident': ident, 'window': window - 1}
+        # Rejected attempts count too, so a sustained burst stays blocked
+        cache.add(current_key, 0, self.duration * 2)
+        try:
+            current = cache.incr(current_key)
+        except ValueError:
+            # Evicted between add() and incr()
+            cache.set(current_key, 1, self.duration * 2)
+            current = 1
+        previous = cache.get(previous_key, 0)
+        estimated = previous * (1 - offset / self.duration) + current
+        self.wait_seconds = self.duration - offset
+        return estimated <= self.num_requests
+
+    def wait(self):
+        return self.wait_seconds
+
+
+class IPSlidingWindowThrottle(SlidingWindowThrottle):
+    # get_ident() only reads X-Forwarded-For as far as NUM_PROXIES allows
+    ident_kind = 'ip'
+
+    def get_ident_value(self, request):
+        return self.get_ident(request)
+
+
+class EmailSlidingWindowThrottle(SlidingWindowThrottle):
+    ident_kind = 'email'
+
+    def get_ident_value(self, request):
+        try:
+            email = request.data.get('email')
+        except (ParseError, AttributeError):
+            # Malformed bodies are rejected by the view's serializer
+            return None
+        if not isinstance(email, str) or not email.strip():
+            return None
+        # Hashed so arbitrary input is always a safe, bounded cache key
+        return hashlib.sha256(email.strip().lower().encode()).hexdigest()[:32]
+
+
+AUTH_THROTTLE_CLASSES = [IPSlidingWindowThrottle, EmailSlidingWindowThrottle]
@@ -0,0 +1,74 @@
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework_simplejwt.settings import api_settings
+
+# Claims embedded in every token issued at login
+ROLE_CLAIM = 'role'
+BLOCKED_CLAIM = 'blocked'
+VERSION_CLAIM = 'pv'
+
+TOKEN_VERSION_CACHE_KEY = 'auth:token_version:{}'
+
+# Cached marker for users that have no profile (and so no version)
+NO_PROFILE = -1
+
+
+def _cache_key(user_id):
+    return TOKEN_VERSION_CACHE_KEY.format(user_id)
+
+
+def get_token_version(user_id):
+    """
+    Current token version for ``user_id``.
+
+    Served from the shared cache; only a cache miss reads the profile row.
+    """
+    version = cache.get(_cache_key(user_id))
+    if version is None:
+        from users.models import UserProfile
+        version = UserProfile.objects.filter(user_id=user_id).values_list('token_version', flat=True).first()
+        if version is None:
+            version = NO_PROFILE
+        cache.set(_cache_key(user_id), version, settings.AUTH_TOKEN_VERSION_CACHE_TIMEOUT)
+    return version
+
+
+async def aget_token_version(user_id):
+    """Async twin of ``get_token_version`` for the ASGI fast-path views."""
+    version = await cache.aget(_cache_key(user_id))
+    if version is None:
+        from users.models import UserProfile
+        version = await UserProfile.objects.filter(user_id=user_id).values_list('token_version', flat=True).afirst()
+        if version is None:
+            version = NO_PROFILE
+        await cache.aset(_cache_key(user_id), version, settings.AUTH_TOKEN_VERSION_CACHE_TIMEOUT)
+    return version
+
+
+def invalidate_token_version(user_id):
+    """Drop the cached version so the next request re-reads the bumped value."""
+    cache.delete(_cache_key(user_id))
+
+
+def add_role_claims(token, user):
+    """Embed role, blocked flag and token version so permission checks need no queries."""
+    profile = getattr(user, 'profile', None)
+    if profile is None:
+        return token
+    token[ROLE_CLAIM] = profile.role
+    token[BLOCKED_CLAIM] = profile.blocked
+    token[VERSION_CLAIM] = profile.token_version
+    return token
+
+
+def token_is_current(token):
+    """False once the user's role, blocked flag or active state changed after issue."""
+    if VERSION_CLAIM not in token:
+        return True
+    return get_token_version(token[api_settings.USER_ID_CLAIM]) == token[VERSION_CLAIM]
+
+
+async def atoken_is_current(token):
+    if VERSION_CLAIM not in token:
+        return True
+    return await aget_token_version(token[api_settings.USER_ID_CLAIM]) == token[VERSION_CLAIM]
@@ -3,7 +3,8 @@ from rest_framework.routers import DefaultRouter
 from .views import (
     UserRegistrationView, AdminRegistrationView, LogoutView, MeView, UserViewSet, 
     EmailTokenObtainPairView,
-    RequestPasswordResetOTPView, VerifyOTPResetPasswordView, Enable2FAView, Verify2FASetupView
+    RequestPasswordResetOTPView, VerifyOTPResetPasswordView, Enable2FAView, Verify2FASetupView,
+    AuditLogListView, AuditLogExportView,
 )
 
 from rest_framework_simplejwt.views import TokenObtainPairView
@@ -31,6 +32,10 @@ urlpatterns = [
     # 2FA setup
     path('enable-2fa/', Enable2FAView.as_view(), name='enable-2fa'),
     path('verify-2fa-setup/', Verify2FASetupView.as_view(), name='verify-2fa-setup'),
+
+    # Audit log (admin only)
+    path('audit-logs/', AuditLogListView.as_view(), name='audit-log-list'),
+    path('audit-logs/export/', AuditLogExportView.as_view(), name='audit-log-export'),
     
     path('', include(router.urls)),
 ]
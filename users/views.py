@@ -1,10 +1,12 @@
 from drf_spectacular.utils import extend_schema
 from rest_framework_simplejwt.views import TokenRefreshView
+from python_server.metrics import TimedPermissionsMixin
+from .serializers import RoleClaimsTokenRefreshSerializer
 
 # Custom TokenRefreshView for Swagger grouping
 @extend_schema(tags=["Token"], description="Obtain a new access token using a valid refresh token.")
-class CustomTokenRefreshView(TokenRefreshView):
-	pass
+class CustomTokenRefreshView(TimedPermissionsMixin, TokenRefreshView):
+	serializer_class = RoleClaimsTokenRefreshSerializer
 from rest_framework_simplejwt.views import TokenObtainPairView
 from .serializers import EmailTokenObtainPairSerializer
 
@@ -13,10 +15,13 @@ from rest_framework.response import Response
 from rest_framework import status
 
 from drf_spectacular.utils import extend_schema
+from .throttling import AUTH_THROTTLE_CLASSES
 
 @extend_schema(tags=["Auth"])
-class EmailTokenObtainPairView(TokenObtainPairView):
+class EmailTokenObtainPairView(TimedPermissionsMixin, TokenObtainPairView):
 	serializer_class = EmailTokenObtainPairSerializer
+	throttle_classes = AUTH_THROTTLE_CLASSES
+	throttle_scope = 'login'
 
 	def post(self, request, *args, **kwargs):
 		response = super().post(request, *args, **kwargs)
@@ -29,8 +34,10 @@ class EmailTokenObtainPairView(TokenObtainPairView):
 				response.data['message'] = response.data['detail']
 				del response.data['detail']
 		return response
+import uuid
 from rest_framework import viewsets, mixins
 from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
 from rest_framework.permissions import IsAuthenticated
 from django.contrib.auth import get_user_model
 User = get_user_model()
@@ -40,7 +47,11 @@ from .serializers import UserDetailSerializer, UserUpdateSerializer, UserStatusS
 
 from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiParameter, OpenApiTypes
 from .auditlog import AuditLog
+from . import audit
 from django_filters.rest_framework import DjangoFilterBackend
+from python_server.pagination import KeysetPagination
+from .permissions import get_request_role
+from python_server.export import ExportError, stream_export
 
 @extend_schema_view(
 	list=extend_schema(
@@ -63,7 +74,7 @@ from django_filters.rest_framework import DjangoFilterBackend
 	set_password=extend_schema(summary="Set user password", tags=["Users"], description="Set a new password for a user (admin only)."),
 )
 
-class UserViewSet(viewsets.GenericViewSet, mixins.ListModelMixin, mixins.RetrieveModelMixin, mixins.UpdateModelMixin, mixins.DestroyModelMixin):
+class UserViewSet(TimedPermissionsMixin, viewsets.GenericViewSet, mixins.ListModelMixin, mixins.RetrieveModelMixin, mixins.UpdateModelMixin, mixins.DestroyModelMixin):
 
 	@extend_schema(
 		summary="Change own password",
@@ -79,7 +90,7 @@ class UserViewSet(viewsets.GenericViewSet, mixins.ListModelMixin, mixins.Retriev
 		user.set_password(serializer.validated_data['password'])
 		user.save()
 		# Audit log
-		AuditLog.objects.create(user=user, action="change_password", details="User changed their password")
+		audit.record("change_password", user_id=user.pk, details="User changed their password")
 		return Response({'message': 'Password changed successfully'})
 
 	@extend_schema(
@@ -91,7 +102,7 @@ class UserViewSet(viewsets.GenericViewSet, mixins.ListModelMixin, mixins.Retriev
 	def block(self, request):
 		"""Block a user by email or name (admin only)."""
 		current_user = request.user
-		if not hasattr(current_user, 'profile') or current_user.profile.role != 'admin':
+		if get_request_role(request) != 'admin':
 			return Response({'message': 'You do not have permission to block users. Only admin can perform this action.', 'data': None}, status=status.HTTP_403_FORBIDDEN)
 		identifier = request.data.get('email') or request.data.get('name')
 		if not identifier:
@@ -106,7 +117,7 @@ class UserViewSet(viewsets.GenericViewSet, mixins.ListModelMixin, mixins.Retriev
 		if user and hasattr(user, 'profile'):
 			user.profile.blocked = True
 			user.profile.save()
-			AuditLog.objects.create(user=current_user, action="block", details=f"Blocked user {user.email}")
+			audit.record("block", user_id=current_user.pk, details=f"Blocked user {user.email}")
 			return Response({'message': 'User blocked successfully', 'data': None})
 		return Response({'message': 'User not found or profile missing', 'data': None}, status=status.HTTP_404_NOT_FOUND)
 
@@ -119,7 +130,7 @@ class UserViewSet(viewsets.GenericViewSet, mixins.ListModelMixin, mixins.Retriev
 	def unblock(self, request):
 		"""Unblock a user by email or name (admin only)."""
 		current_user = request.user
-		if not hasattr(current_user, 'profile') or current_user.profile.role != 'admin':
+		if get_request_role(request) != 'admin':
 			return Response({'message': 'You do not have permission to unblock users. Only admin can perform this action.', 'data': None}, status=status.HTTP_403_FORBIDDEN)
 		identifier = request.data.get('email') or request.data.get('name')
 		if not identifier:
@@ -134,7 +145,7 @@ class UserViewSet(viewsets.GenericViewSet, mixins.ListModelMixin, mixins.Retriev
 		if user and hasattr(user, 'profile'):
 			user.profile.blocked = False
 			user.profile.save()
-			AuditLog.objects.create(user=current_user, action="unblock", details=f"Unblocked user {user.email}")
+			audit.record("unblock", user_id=current_user.pk, details=f"Unblocked user {user.email}")
 			return Response({'message': 'User unblocked successfully', 'data': None})
 		return Response({'message': 'User not found or profile missing', 'data': None}, status=status.HTTP_404_NOT_FOUND)
 
@@ -147,6 +158,8 @@ class UserViewSet(viewsets.GenericViewSet, mixins.ListModelMixin, mixins.Retriev
 	lookup_value_regex = '[0-9a-fA-F-]+'
 	filter_backends = [DjangoFilterBackend]
 	filterset_fields = ['profile__role']
+	pagination_class = KeysetPagination  # Opt-in with ?page_size=N
+	ordering = ('-date_joined', '-id')
 
 	@extend_schema(
 		summary="Delete a user",
@@ -156,7 +169,7 @@ class UserViewSet(viewsets.GenericViewSet, mixins.ListModelMixin, mixins.Retriev
 	def destroy(self, request, *args, **kwargs):
 		current_user = request.user
 		# Only allow admin to delete users
-		if not hasattr(current_user, 'profile') or current_user.profile.role != 'admin':
+		if get_request_role(request) != 'admin':
 			return Response({
 				'message': 'You do not have permission to delete users. Only admins can perform this action.',
 				'data': None
@@ -164,7 +177,7 @@ class UserViewSet(viewsets.GenericViewSet, mixins.ListModelMixin, mixins.Retriev
 		user = self.get_object()
 		super().destroy(request, *args, **kwargs)
 		# Audit log
-		AuditLog.objects.create(user=current_user, action="delete", details=f"Deleted user {user.email}")
+		audit.record("delete", user_id=current_user.pk, details=f"Deleted user {user.email}")
 		return Response({
 			'message': 'User deleted successfully',
 			'data': None
@@ -177,16 +190,26 @@ class UserViewSet(viewsets.GenericViewSet, mixins.ListModelMixin, mixins.Retriev
 		if role:
 			queryset = queryset.filter(profile__role=role)
 		current_user = self.request.user
-		if hasattr(current_user, 'profile'):
-			current_role = current_user.profile.role
-			if current_role == 'admin':
-				# Admin can see all users (hierarchy starts from admin)
-				return queryset
-			else:
-				# Other roles can only see themselves
-				return queryset.filter(id=current_user.id)
+		if get_request_role(self.request) == 'admin':
+			# Admin can see all users (hierarchy starts from admin)
+			return queryset
+		# Other roles can only see themselves
 		return queryset.filter(id=current_user.id)
 
+	def get_object(self):
+		"""Fetch user and profile in one query driven by the unique profile uuid index."""
+		try:
+			profile_uuid = uuid.UUID(str(self.kwargs[self.lookup_url_kwarg]))
+		except ValueError:
+			# Malformed ids can never match, so skip the database entirely
+			raise NotFound('User not found')
+		queryset = self.filter_queryset(self.get_queryset())
+		user = queryset.filter(profile__uuid=profile_uuid).first()
+		if user is None:
+			raise NotFound('User not found')
+		self.check_object_permissions(self.request, user)
+		return user
+
 	def get_serializer_class(self):
 		if self.action == 'update' or self.action == 'partial_update':
 			return UserUpdateSerializer
@@ -198,11 +221,55 @@ class UserViewSet(viewsets.GenericViewSet, mixins.ListModelMixin, mixins.Retriev
 
 
 	def list(self, request, *args, **kwargs):
-		response = super().list(request, *args, **kwargs)
-		return Response({
+		queryset = self.filter_queryset(self.get_queryset())
+		page = self.paginate_queryset(queryset)
+		serializer = self.get_serializer(page if page is not None else queryset, many=True)
+		data = {
 			'message': 'Users fetched successfully',
-			'data': response.data
-		}, status=response.status_code)
+			'data': serializer.data
+		}
+		if page is not None:
+			data.update(self.paginator.get_pagination_data())
+		return Response(data, status=status.HTTP_200_OK)
+
+	# (queryset lookup, exported column name)
+	EXPORT_COLUMNS = [
+		('profile__uuid', 'uuid'),
+		('email', 'email'),
+		('profile__name', 'name'),
+		('profile__role', 'role'),
+		('profile__phone_number', 'phone_number'),
+		('is_active', 'is_active'),
+		('profile__blocked', 'blocked'),
+		('date_joined', 'date_joined'),
+	]
+
+	@extend_schema(
+		summary="Export users (streaming CSV/JSONL)",
+		tags=["Users"],
+		description="Stream all users (admin only) as CSV or JSONL, optionally gzip or zstd compressed. Supports the same role filter as the list.",
+		parameters=[
+			OpenApiParameter(name='file_format', type=OpenApiTypes.STR, location=OpenApiParameter.QUERY, enum=['csv', 'jsonl']),
+			OpenApiParameter(name='compression', type=OpenApiTypes.STR, location=OpenApiParameter.QUERY, enum=['gzip', 'zstd']),
+		],
+		responses={200: OpenApiTypes.BINARY},
+	)
+	@action(detail=False, methods=['get'], url_path='export')
+	def export(self, request):
+		if get_request_role(request) != 'admin':
+			return Response({'message': 'You do not have permission to export users. Only admin can perform this action.', 'data': None}, status=status.HTTP_403_FORBIDDEN)
+		queryset = self.filter_queryset(self.get_queryset()).order_by('date_joined', 'id')
+		try:
+			return stream_export(
+				queryset,
+				[lookup for lookup, _ in self.EXPORT_COLUMNS],
+				columns=[column for _, column in self.EXPORT_COLUMNS],
+				file_format=request.query_params.get('file_format'),
+				compression=request.query_params.get('compression'),
+				filename='users',
+			)
+		except ExportError as exc:
+			return Response({'message': str(exc), 'data': None}, status=status.HTTP_400_BAD_REQUEST)
 
 	def retrieve(self, request, *args, **kwargs):
 		try:
@@ -221,7 +288,7 @@ class UserViewSet(viewsets.GenericViewSet, mixins.ListModelMixin, mixins.Retriev
 				'data': data,
 				'error': None
 			}, status=200)
-		except self.queryset.model.DoesNotExist:
+		except (self.queryset.model.DoesNotExist, NotFound):
 			return Response({
 				'message': 'User not found',
 				'data': None,
@@ -250,7 +317,7 @@ class UserViewSet(viewsets.GenericViewSet, mixins.ListModelMixin, mixins.Retriev
 
 
 	@action(detail=True, methods=['patch'], url_path='status')
-	def set_status(self, request, pk=None):
+	def set_status(self, request, id=None):
 		user = self.get_object()
 		serializer = self.get_serializer(user, data=request.data, partial=True)
 		serializer.is_valid(raise_exception=True)
@@ -258,15 +325,15 @@ class UserViewSet(viewsets.GenericViewSet, mixins.ListModelMixin, mixins.Retriev
 		return Response({'message': 'User status updated successfully'})
 
 	@action(detail=True, methods=['patch'], url_path='password')
-	def set_password(self, request, pk=None):
+	def set_password(self, request, id=None):
 		"""Set password for a user (admin only)."""
 		try:
 			current_user = request.user
-			print(f"DEBUG: Current user: {current_user.email}, Role: {getattr(current_user.profile, 'role', 'No profile')}")
+			print(f"DEBUG: Current user: {current_user.pk}, Role: {get_request_role(request)}")
 			print(f"DEBUG: Request data: {request.data}")
-			print(f"DEBUG: pk parameter: {pk}")
+			print(f"DEBUG: id parameter: {id}")
 			
-			if not hasattr(current_user, 'profile') or current_user.profile.role != 'admin':
+			if get_request_role(request) != 'admin':
 				return Response({
 					'message': 'You do not have permission to set passwords for other users. Only admin can perform this action.',
 					'data': None
@@ -285,7 +352,7 @@ class UserViewSet(viewsets.GenericViewSet, mixins.ListModelMixin, mixins.Retriev
 			user.save()
 			
 			print("DEBUG: Creating audit log...")
-			AuditLog.objects.create(user=current_user, action="change_password", details=f"Admin changed password for user {user.email}")
+			audit.record("change_password", user_id=current_user.pk, details=f"Admin changed password for user {user.email}")
 			
 			return Response({'message': 'Password set successfully', 'data': None})
 		except Exception as e:
@@ -318,7 +385,7 @@ class LogoutSerializer(serializers.Serializer):
 	- The backend cannot fully log out a user by itself; deleting tokens on the frontend is required.
 	"""
 )
-class LogoutView(GenericAPIView):
+class LogoutView(TimedPermissionsMixin, GenericAPIView):
 	permission_classes = [IsAuthenticated]
 	serializer_class = LogoutSerializer
 
@@ -336,7 +403,7 @@ class LogoutView(GenericAPIView):
 from .serializers import UserDetailSerializer
 # Get logged-in user API
 @extend_schema(tags=["Auth"])
-class MeView(GenericAPIView):
+class MeView(TimedPermissionsMixin, GenericAPIView):
 	permission_classes = [IsAuthenticated]
 	serializer_class = UserDetailSerializer
 
@@ -357,8 +424,7 @@ class IsAdminUserCustom(permissions.BasePermission):
 	def has_permission(self, request, view):
 		return (
 			request.user.is_authenticated and 
-			hasattr(request.user, 'profile') and 
-			request.user.profile.role in ['admin']
+			get_request_role(request) in ['admin']
 		)
 
 # Public registration for Admin users (no authentication required)
@@ -373,7 +439,7 @@ class IsAdminUserCustom(permissions.BasePermission):
 	Hierarchy: Admin → (store_keeper, inventory_manager, requester, vendor)
 	"""
 )
-class AdminRegistrationView(generics.CreateAPIView):
+class AdminRegistrationView(TimedPermissionsMixin, generics.CreateAPIView):
 	from django.contrib.auth import get_user_model
 	queryset = get_user_model().objects.all()
 	serializer_class = AdminRegistrationSerializer
@@ -398,7 +464,7 @@ class AdminRegistrationView(generics.CreateAPIView):
 	Super_admin is not involved in user creation - the hierarchy starts from admin.
 	"""
 )
-class UserRegistrationView(generics.CreateAPIView):
+class UserRegistrationView(TimedPermissionsMixin, generics.CreateAPIView):
 	from django.contrib.auth import get_user_model
 	queryset = get_user_model().objects.all()
 	serializer_class = UserRegistrationSerializer
@@ -414,9 +480,11 @@ class UserRegistrationView(generics.CreateAPIView):
 		return response
 
 # Two-Factor Authentication Views for Password Reset
+from django.conf import settings
 from django.utils import timezone
-from datetime import timedelta
-from .models import PasswordResetOTP
+from .otp_store import get_otp_store
+from .tasks import send_otp_sms
+from django.db import transaction
 import random
 
 @extend_schema(
@@ -428,8 +496,10 @@ import random
 	OTP expires in 10 minutes for security.
 	"""
 )
-class RequestPasswordResetOTPView(generics.GenericAPIView):
+class RequestPasswordResetOTPView(TimedPermissionsMixin, generics.GenericAPIView):
 	permission_classes = []  # No authentication required
+	throttle_classes = AUTH_THROTTLE_CLASSES
+	throttle_scope = 'otp_request'
 	
 	class RequestOTPSerializer(serializers.Serializer):
 		email = serializers.EmailField()
@@ -465,28 +535,23 @@ class RequestPasswordResetOTPView(generics.GenericAPIView):
 						'data': None
 					}, status=status.HTTP_400_BAD_REQUEST)
 				
-				# Generate 6-digit OTP
-				otp_code = PasswordResetOTP.generate_otp()
-				
-				# Create OTP record
-				otp_record = PasswordResetOTP.objects.create(
-					user=user,
-					otp_code=otp_code,
-					expires_at=timezone.now() + timedelta(minutes=10),
-					request_type='password_reset'
-				)
+				# Generate and store a 6-digit OTP
+				otp_code = get_otp_store().issue(user, request_type='password_reset')
 				
-				# In production, send SMS here
-				# send_sms(profile.phone_number, f"Your password reset OTP: {otp_code}")
+				# Delivered by a Celery worker (inline when no broker is configured)
+				phone_number = profile.phone_number
+				transaction.on_commit(lambda: send_otp_sms.delay(phone_number, otp_code))
 				
+				data = {
+					'method': 'sms',
+					'phone_masked': f"***{profile.phone_number[-4:]}" if len(profile.phone_number) > 4 else "***",
+					'expires_in': '10 minutes',
+				}
+				if settings.DEBUG:
+					data['otp_for_dev'] = otp_code
 				return Response({
 					'message': 'OTP sent to your registered phone number',
-					'data': {
-						'method': 'sms',
-						'phone_masked': f"***{profile.phone_number[-4:]}" if len(profile.phone_number) > 4 else "***",
-						'expires_in': '10 minutes',
-						'otp_for_dev': otp_code  # Remove in production
-					}
+					'data': data
 				}, status=status.HTTP_200_OK)
 			
 			elif otp_method == 'authenticator':
@@ -525,8 +590,10 @@ class RequestPasswordResetOTPView(generics.GenericAPIView):
 	Also supports backup codes for emergency access.
 	"""
 )
-class VerifyOTPResetPasswordView(generics.GenericAPIView):
+class VerifyOTPResetPasswordView(TimedPermissionsMixin, generics.GenericAPIView):
 	permission_classes = []  # No authentication required
+	throttle_classes = AUTH_THROTTLE_CLASSES
+	throttle_scope = 'otp_verify'
 	
 	class VerifyOTPSerializer(serializers.Serializer):
 		email = serializers.EmailField()
@@ -580,19 +647,8 @@ class VerifyOTPResetPasswordView(generics.GenericAPIView):
 						'data': None
 					}, status=status.HTTP_400_BAD_REQUEST)
 			
-			# Check SMS OTP
-			sms_otp = PasswordResetOTP.objects.filter(
-				user=user,
-				otp_code=otp_code,
-				is_used=False,
-				request_type='password_reset'
-			).first()
-			
-			if sms_otp and not sms_otp.is_expired():
-				# Valid SMS OTP
-				sms_otp.is_used = True
-				sms_otp.save()
-				
+			# Check SMS OTP (marks it used in the same step)
+			if get_otp_store().consume(user, otp_code, request_type='password_reset'):
 				# Reset password
 				user.set_password(new_password)
 				user.save()
@@ -646,7 +702,7 @@ class VerifyOTPResetPasswordView(generics.GenericAPIView):
 	Also generates backup codes for emergency access.
 	"""
 )
-class Enable2FAView(generics.GenericAPIView):
+class Enable2FAView(TimedPermissionsMixin, generics.GenericAPIView):
 	permission_classes = [IsAuthenticated]
 	
 	def post(self, request):
@@ -711,7 +767,7 @@ class Enable2FAView(generics.GenericAPIView):
 	This completes the 2FA setup and enables 2FA for the user.
 	"""
 )
-class Verify2FASetupView(generics.GenericAPIView):
+class Verify2FASetupView(TimedPermissionsMixin, generics.GenericAPIView):
 	permission_classes = [IsAuthenticated]
 	
 	class Verify2FASerializer(serializers.Serializer):
@@ -762,3 +818,127 @@ class Verify2FASetupView(generics.GenericAPIView):
 				'message': 'Google Authenticator not properly configured',
 				'data': None
 			}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+# Audit log API (admin only)
+from .permissions import IsAdminRole
+
+from datetime import datetime
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.exceptions import ValidationError
+from .serializers import AuditLogSerializer
+
+AUDIT_LOG_FILTER_PARAMETERS = [
+	OpenApiParameter(name='actor', type=OpenApiTypes.STR, location=OpenApiParameter.QUERY, description='Profile UUID or email of the user who performed the action'),
+	OpenApiParameter(name='action', type=OpenApiTypes.STR, location=OpenApiParameter.QUERY, enum=[choice for choice, _ in AuditLog.ACTION_CHOICES]),
+	OpenApiParameter(name='since', type=OpenApiTypes.DATETIME, location=OpenApiParameter.QUERY, description='Inclusive lower bound (ISO 8601 date or datetime)'),
+	OpenApiParameter(name='until', type=OpenApiTypes.DATETIME, location=OpenApiParameter.QUERY, description='Exclusive upper bound (ISO 8601 date or datetime)'),
+]
+
+
+def _parse_audit_time(request, name):
+	raw = request.query_params.get(name)
+	if not raw:
+		return None
+	try:
+		value = parse_datetime(raw)
+		if value is None:
+			date = parse_date(raw)
+			value = datetime.combine(date, datetime.min.time()) if date else None
+	except ValueError:
+		value = None
+	if value is None:
+		raise ValidationError({name: [f'Enter a valid ISO 8601 date or datetime for {name}.']})
+	if timezone.is_naive(value):
+		value = timezone.make_aware(value)
+	return value
+
+
+def filter_audit_logs(request, queryset):
+	"""
+	Apply the actor/action/since/until filters shared by the list and export views.
+
+	The actor is resolved to a user id up front so the audit query stays on
+	the (user, id) index instead of joining users.
+	"""
+	actor = request.query_params.get('actor')
+	if actor:
+		try:
+			user_ids = UserProfile.objects.filter(uuid=uuid.UUID(actor)).values_list('user_id', flat=True)
+		except ValueError:
+			user_ids = get_user_model().objects.filter(email__iexact=actor).values_list('id', flat=True)
+		user_id = user_ids.first()
+		if user_id is None:
+			return queryset.none()
+		queryset = queryset.filter(user_id=user_id)
+	action_name = request.query_params.get('action')
+	if action_name:
+		queryset = queryset.filter(action=action_name)
+	since = _parse_audit_time(request, 'since')
+	if since:
+		queryset = queryset.filter(timestamp__gte=since)
+	until = _parse_audit_time(request, 'until')
+	if until:
+		queryset = queryset.filter(timestamp__lt=until)
+	return queryset
+
+
+class AuditLogPagination(KeysetPagination):
+	# Always on: the audit table is far too large to return in one response
+	page_size = 100
+	max_page_size = 1000
+
+
+@extend_schema(
+	tags=["Audit Log"],
+	summary="List audit log entries",
+	description="Newest first, keyset paginated (follow `next`; ?page_size= up to 1000). Filter by actor, action and a since/until time window.",
+	parameters=AUDIT_LOG_FILTER_PARAMETERS,
+)
+class AuditLogListView(TimedPermissionsMixin, generics.ListAPIView):
+	permission_classes = [IsAdminRole]
+	serializer_class = AuditLogSerializer
+	pagination_class = AuditLogPagination
+	filter_backends = []
+	# id follows write order and is unique, so pages never stall on tied timestamps
+	ordering = ('-id',)
+
+	def get_queryset(self):
+		return filter_audit_logs(self.request, AuditLog.objects.select_related('user'))
+
+	def list(self, request, *args, **kwargs):
+		page = self.paginate_queryset(self.get_queryset())
+		serializer = self.get_serializer(page, many=True)
+		data = {
+			'message': 'Audit logs fetched successfully',
+			'data': serializer.data
+		}
+		data.update(self.paginator.get_pagination_data())
+		return Response(data, status=status.HTTP_200_OK)
+
+
+@extend_schema(
+	tags=["Audit Log"],
+	summary="Export audit log (streaming CSV/JSONL)",
+	description="Stream audit log entries, newest first, as CSV or JSONL, optionally gzip or zstd compressed. Takes the same filters as the list endpoint.",
+	parameters=AUDIT_LOG_FILTER_PARAMETERS + [
+		OpenApiParameter(name='file_format', type=OpenApiTypes.STR, location=OpenApiParameter.QUERY, enum=['csv', 'jsonl']),
+		OpenApiParameter(name='compression', type=OpenApiTypes.STR, location=OpenApiParameter.QUERY, enum=['gzip', 'zstd']),
+	],
+	responses={200: OpenApiTypes.BINARY},
+)
+class AuditLogExportView(TimedPermissionsMixin, APIView):
+	permission_classes = [IsAdminRole]
+
+	def get(self, request):
+		queryset = filter_audit_logs(request, AuditLog.objects.order_by('-id'))
+		try:
+			return stream_export(
+				queryset,
+				['id', 'timestamp', 'action', 'user__email', 'details'],
+				columns=['id', 'timestamp', 'action', 'user', 'details'],
+				file_format=request.query_params.get('file_format'),
+				compression=request.query_params.get('compression'),
+				filename='audit-log',
+			)
+		except ExportError as exc:
+			return Response({'message': str(exc), 'data': None}, status=status.HTTP_400_BAD_REQUEST)
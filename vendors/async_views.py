@@ -0,0 +1,24 @@
+from python_server.async_views import claims_for, fast_path, json_response
+from users.tokens import ROLE_CLAIM
+from .models import Vendor
+from .serializers import VendorSerializer
+from .views import VendorViewSet
+
+
+async def retrieve_vendor(request, id):
+    token = await claims_for(request)
+    if token is None or token[ROLE_CLAIM] != 'admin':
+        return None
+    vendor = await Vendor.objects.filter(uuid=id).afirst()
+    if vendor is None:
+        return None
+    return json_response({
+        'success': True,
+        'message': 'Vendor retrieved successfully',
+        'vendor': VendorSerializer(vendor).data
+    })
+
+
+vendor_detail_view = fast_path(retrieve_vendor, VendorViewSet.as_view({
+    'get': 'retrieve', 'put': 'update', 'patch': 'partial_update', 'delete': 'destroy',
+}))
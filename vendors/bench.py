@@ -0,0 +1,74 @@
+import random
+
+from python_server.benchmarks import scenario
+from users.bench import make_admin
+from .models import Vendor
+
+RATINGS = [choice for choice, _ in Vendor.RATING_CHOICES]
+
+
+def seed_vendors(count, batch_size=5000):
+    """Bulk-insert ``count`` vendors with varied types, cities and ratings; returns their uuids."""
+    rng = random.Random(42)
+    uuids = []
+    for start in range(0, count, batch_size):
+        vendors = []
+        for i in range(start, min(start + batch_size, count)):
+            vendor = Vendor(
+                vendorName=f'Bench Vendor {i}',
+                fullAddress=f'{i} Bench Road',
+                pincode='700001',
+                city=rng.choice(['Kolkata', 'Mumbai', 'Chennai', 'Delhi']),
+                vendorType=rng.choice(['purchase', 'service', 'scrap']),
+                overall_avg_rating=rng.choice(RATINGS),
+            )
+            vendor.sync_rating_scores()  # bulk_create bypasses save()
+            vendors.append(vendor)
+        uuids.extend(str(vendor.uuid) for vendor in Vendor.objects.bulk_create(vendors))
+    return uuids
+
+
+@scenario('vendor-list', 'GET /api/vendors/vendors/: full list, one keyset page of 50 and a filtered page.')
+def vendor_list(run):
+    seed_vendors(run.size)
+    client = run.client(make_admin())
+    run.measure('list', lambda i: client.get('/api/vendors/vendors/'), expected_status=200)
+    run.measure('list-page', lambda i: client.get('/api/vendors/vendors/', {'page_size': 50}), expected_status=200)
+    run.measure(
+        'list-filtered',
+        lambda i: client.get('/api/vendors/vendors/', {'page_size': 50, 'city': 'Mumbai', 'vendorType': 'service'}),
+        expected_status=200,
+    )
+
+
+@scenario('vendor-retrieve', 'GET /api/vendors/vendors/<uuid>/ across a seeded vendor table.')
+def vendor_retrieve(run):
+    uuids = seed_vendors(run.size)
+    client = run.client(make_admin())
+    rng = random.Random(42)
+    run.measure(
+        'retrieve',
+        lambda i: client.get(f'/api/vendors/vendors/{rng.choice(uuids)}/'),
+        expected_status=200,
+    )
+
+
+@scenario('vendor-create', 'POST /api/vendors/vendors/ with unique names, phones and emails.')
+def vendor_create(run):
+    seed_vendors(run.size)
+    client = run.client(make_admin())
+    # Warmup calls reuse the same counter, so every payload stays unique
+    counter = iter(range(10 ** 9))
+
+    def create(i):
+        n = next(counter)
+        return client.post('/api/vendors/vendors/', {
+            'vendorName': f'Created Vendor {n}',
+            'fullAddress': f'{n} Create Street',
+            'pincode': '560001',
+            'city': 'Bengaluru',
+            'phone': f'{9000000000 + n}',
+            'email': f'created-{n}@example.com',
+        }, format='json')
+
+    run.measure('create', create, expected_status=201)
@@ -0,0 +1,283 @@
+"""
+Streaming bulk import of vendors from CSV or JSONL.
+
+Rows are parsed one at a time and validated with the same precompiled
+patterns as ``VendorSerializer``, then inserted with ``bulk_create`` in
+fixed-size batches inside one transaction. Only the current batch is held
+in memory, uniqueness is checked per batch against the database (which
+already contains the earlier batches), and the error report is capped, so
+memory stays bounded however large the file is.
+"""
+import csv
+import io
+import json
+
+from django.core.exceptions import ValidationError
+from django.core.validators import EmailValidator
+from django.db import DatabaseError, transaction
+
+from .models import Vendor
+from .serializers import (
+    GSTN_ERROR, GSTN_RE, PHONE_ERROR, PHONE_RE, PINCODE_ERROR, PINCODE_RE, RATING_ERROR, VALID_RATINGS,
+)
+from .signals import invalidate_vendor_lists
+
+DEFAULT_BATCH_SIZE = 1000
+MAX_BATCH_SIZE = 5000  # A batch is held in memory, so callers cannot raise this
+MAX_REPORTED_ERRORS = 1000
+FORMATS = ('csv', 'jsonl')
+
+REQUIRED_FIELDS = {'vendorName': 100, 'fullAddress': 255, 'pincode': 10, 'city': 50}
+UNIQUE_FIELDS = ('vendorName', 'phone', 'email', 'GSTN')
+RATING_FIELDS = ('quality_price_rating', 'delivery_time_rating', 'overall_avg_rating')
+VENDOR_TYPES = {choice for choice, _ in Vendor.VENDOR_TYPE_CHOICES}
+TRUE_VALUES = {'true', '1', 'yes', 'y'}
+FALSE_VALUES = {'false', '0', 'no', 'n'}
+
+validate_email = EmailValidator()
+
+
+class ImportFormatError(Exception):
+    pass
+
+
+def detect_format(filename, explicit=None):
+    if explicit:
+        if explicit not in FORMATS:
+            raise ImportFormatError(f"Unsupported format '{explicit}'. Use one of: {', '.join(FORMATS)}.")
+        return explicit
+    lowered = (filename or '').lower()
+    if lowered.endswith('.csv'):
+        return 'csv'
+    if lowered.endswith(('.jsonl', '.ndjson')):
+        return 'jsonl'
+    raise ImportFormatError('Cannot tell the file format from its name; pass csv or jsonl explicitly.')
+
+
+def iter_rows(stream, file_format):
+    """Yield ``(row_number, dict_or_error_message)`` from a text stream."""
+    if file_format == 'csv':
+        reader = csv.DictReader(stream)
+        # Row 1 is the header, so data starts at row 2 like in a spreadsheet
+        for number, row in enumerate(reader, start=2):
+            yield number, row
+        return
+    for number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as exc:
+            yield number, f'Invalid JSON: {exc}'
+            continue
+        yield number, row if isinstance(row, dict) else 'Each line must be a JSON object.'
+
+
+def unreadable_message(exc):
+    if isinstance(exc, UnicodeDecodeError):
+        return 'The file is not UTF-8 text; save it as UTF-8 (CSV UTF-8 in Excel) and upload it again.'
+    return f'Malformed CSV: {exc}'
+
+
+def _text(row, field):
+    value = row.get(field)
+    if value is None:
+        return ''
+    return str(value).strip()
+
+
+def clean_row(row):
+    """Validate one raw row. Returns ``(field_values, errors)``; errors maps field -> message."""
+    errors = {}
+    values = {}
+
+    for field, max_length in REQUIRED_FIELDS.items():
+        value = _text(row, field)
+        if not value:
+            errors[field] = 'This field is required.'
+        elif len(value) > max_length:
+            errors[field] = f'Ensure this field has no more than {max_length} characters.'
+        values[field] = value
+    if values['pincode'] and 'pincode' not in errors and not PINCODE_RE.match(values['pincode']):
+        errors['pincode'] = PINCODE_ERROR
+
+    # Optional unique fields are stored as NULL rather than '' so they stay unique
+    phone = _text(row, 'phone') or None
+    if phone and not PHONE_RE.match(phone):
+        errors['phone'] = PHONE_ERROR
+    values['phone'] = phone
+
+    email = _text(row, 'email') or None
+    if email:
+        try:
+            validate_email(email)
+        except ValidationError:
+            errors['email'] = 'Enter a valid email address.'
+    values['email'] = email
+
+    gstn = _text(row, 'GSTN') or None
+    if gstn and not GSTN_RE.match(gstn):
+        errors['GSTN'] = GSTN_ERROR
+    values['GSTN'] = gstn
+
+    vendor_type = _text(row, 'vendorType') or 'purchase'
+    if vendor_type not in VENDOR_TYPES:
+        errors['vendorType'] = f'"{vendor_type}" is not a valid choice.'
+    values['vendorType'] = vendor_type
+
+    for field in RATING_FIELDS:
+        rating = _text(row, field) or 'Not Rated'
+        if rating not in VALID_RATINGS:
+            errors[field] = RATING_ERROR
+        values[field] = rating
+
+    for field in ('rating', 'plantId'):
+        raw = _text(row, field)
+        if not raw:
+            values[field] = None
+            continue
+        try:
+            values[field] = int(raw)
+        except ValueError:
+            errors[field] = 'A valid integer is required.'
+    if values.get('rating') is not None and not 1 <= values['rating'] <= 5:
+        errors['rating'] = 'Rating must be between 1 and 5.'
+
+    is_active = _text(row, 'isActive').lower()
+    if not is_active or is_active in TRUE_VALUES:
+        values['isActive'] = True
+    elif is_active in FALSE_VALUES:
+        values['isActive'] = False
+    else:
+        errors['isActive'] = 'Must be a valid boolean.'
+
+    return values, errors
+
+
+class VendorImporter:
+    """Validates and inserts a stream of vendor rows; ``report`` holds the outcome."""
+
+    def __init__(self, batch_size=DEFAULT_BATCH_SIZE, all_or_nothing=False, dry_run=False):
+        self.batch_size = min(max(batch_size, 1), MAX_BATCH_SIZE)
+        self.all_or_nothing = all_or_nothing
+        self.dry_run = dry_run
+        self.report = {
+            'total_rows': 0,
+            'created': 0,
+            'failed': 0,
+            'errors': [],
+            'errors_truncated': False,
+            'rolled_back': False,
+        }
+
+    def _fail(self, row_number, errors):
+        self.report['failed'] += 1
+        if len(self.report['errors']) < MAX_REPORTED_ERRORS:
+            self.report['errors'].append({'row': row_number, 'errors': errors})
+        else:
+            self.report['errors_truncated'] = True
+
+    def run(self, stream, file_format):
+        with transaction.atomic():
+            try:
+                self._import_rows(stream, file_format)
+            except (UnicodeDecodeError, csv.Error) as exc:
+                # The rest of the file cannot be read, so keep nothing from it
+                self.report['failed'] += 1
+                self.report['errors'].append({'row': self._next_row, 'errors': {'file': unreadable_message(exc)}})
+                transaction.set_rollback(True)
+                self.report['rolled_back'] = True
+                self.report['created'] = 0
+                return self.report
+
+            if self.dry_run or (self.all_or_nothing and self.report['failed']):
+                transaction.set_rollback(True)
+                self.report['rolled_back'] = True
+                self.report['created'] = 0
+        return self.report
+
+    def _import_rows(self, stream, file_format):
+        # Row 1 is the CSV header
+        self._next_row = 2 if file_format == 'csv' else 1
+        batch = []
+        for row_number, row in iter_rows(stream, file_format):
+            self._next_row = row_number + 1
+            self.report['total_rows'] += 1
+            if isinstance(row, str):
+                self._fail(row_number, {'row': row})
+                continue
+            values, errors = clean_row(row)
+            if errors:
+                self._fail(row_number, errors)
+                continue
+            batch.append((row_number, values))
+            if len(batch) >= self.batch_size:
+                self._flush(batch)
+                batch = []
+        if batch:
+            self._flush(batch)
+
+    def _flush(self, batch):
+        batch = self._drop_duplicates(batch)
+        vendors = []
+        for row_number, values in batch:
+            vendor = Vendor(**values)
+            vendor.sync_rating_scores()  # bulk_create bypasses save()
+            vendors.append((row_number, vendor))
+        if not vendors:
+            return
+        try:
+            with transaction.atomic():
+                Vendor.objects.bulk_create([vendor for _, vendor in vendors])
+            self.report['created'] += len(vendors)
+            invalidate_vendor_lists()  # bulk_create sends no post_save
+        except DatabaseError:
+            # A concurrent writer beat us to a unique value, or the database rejected a
+            # value the checks above let through (DataError); retry row by row to pinpoint it
+            for row_number, vendor in vendors:
+                try:
+                    with transaction.atomic():
+                        vendor.save(force_insert=True)
+                    self.report['created'] += 1
+                except DatabaseError as exc:
+                    self._fail(row_number, {'non_field_errors': str(exc)})
+
+    def _drop_duplicates(self, batch):
+        """Reject rows whose unique values repeat within the batch or already exist."""
+        existing = {}
+        for field in UNIQUE_FIELDS:
+            values = {values[field] for _, values in batch if values[field]}
+            existing[field] = set(
+                Vendor.objects.filter(**{f'{field}__in': values}).values_list(field, flat=True)
+            ) if values else set()
+
+        kept = []
+        seen = {field: set() for field in UNIQUE_FIELDS}
+        for row_number, values in batch:
+            errors = {}
+            for field in UNIQUE_FIELDS:
+                value = values[field]
+                if not value:
+                    continue
+                if value in existing[field]:
+                    errors[field] = f'vendor with this {field} already exists.'
+                elif value in seen[field]:
+                    errors[field] = f'Duplicate {field} earlier in this file.'
+            if errors:
+                self._fail(row_number, errors)
+                continue
+            for field in UNIQUE_FIELDS:
+                if values[field]:
+                    seen[field].add(values[field])
+            kept.append((row_number, values))
+        return kept
+
+
+def import_vendors(binary_stream, file_format, **options):
+    """Import from a binary file-like object (upload or open file)."""
+    stream = io.TextIOWrapper(binary_stream, encoding='utf-8-sig', newline='')
+    try:
+        return VendorImporter(**options).run(stream, file_format)
+    finally:
+        # Leave the underlying upload/file open for its owner to close
+        stream.detach()
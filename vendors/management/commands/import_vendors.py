@@ -0,0 +1,40 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from vendors.importer import DEFAULT_BATCH_SIZE, FORMATS, MAX_BATCH_SIZE, ImportFormatError, detect_format, import_vendors
+
+
+class Command(BaseCommand):
+    help = 'Stream-import vendors from a CSV or JSONL file and print a per-row error report.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV (with header row) or JSONL file.')
+        parser.add_argument('--format', dest='file_format', choices=FORMATS, help='Override detection by extension.')
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help=f'At most {MAX_BATCH_SIZE}.')
+        parser.add_argument('--all-or-nothing', action='store_true', help='Roll back everything if any row fails.')
+        parser.add_argument('--dry-run', action='store_true', help='Validate only; nothing is saved.')
+
+    def handle(self, *args, **options):
+        try:
+            file_format = detect_format(options['path'], options['file_format'])
+        except ImportFormatError as exc:
+            raise CommandError(str(exc))
+        try:
+            with open(options['path'], 'rb') as fh:
+                report = import_vendors(
+                    fh, file_format,
+                    batch_size=options['batch_size'],
+                    all_or_nothing=options['all_or_nothing'],
+                    dry_run=options['dry_run'],
+                )
+        except OSError as exc:
+            raise CommandError(str(exc))
+
+        self.stdout.write(json.dumps(report, indent=2))
+        if report['failed']:
+            self.stderr.write(self.style.WARNING(
+                f"{report['created']} created, {report['failed']} failed out of {report['total_rows']} rows."
+            ))
+        else:
+            self.stderr.write(self.style.SUCCESS(f"{report['created']} vendors imported."))
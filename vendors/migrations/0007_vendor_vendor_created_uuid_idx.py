@@ -0,0 +1,17 @@
+# Generated by Django 5.0.3 on 2026-10-17 01:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vendors', '0006_auto_20260109_1835'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='vendor',
+            index=models.Index(fields=['created_At', 'uuid'], name='vendor_created_uuid_idx'),
+        ),
+    ]
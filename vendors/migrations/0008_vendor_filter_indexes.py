@@ -0,0 +1,33 @@
+# Generated by Django 5.0.3 on 2026-10-17 01:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vendors', '0007_vendor_vendor_created_uuid_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='vendor',
+            index=models.Index(fields=['vendorType'], name='vendor_type_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vendor',
+            index=models.Index(fields=['city'], name='vendor_city_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vendor',
+            index=models.Index(fields=['pincode'], name='vendor_pincode_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vendor',
+            index=models.Index(fields=['isActive', 'vendorType'], name='vendor_active_type_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vendor',
+            index=models.Index(fields=['plantId', 'isActive'], name='vendor_plant_active_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.0.3 on 2026-10-17 01:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vendors', '0008_vendor_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='vendor',
+            index=models.Index(fields=['updated_At'], name='vendor_updated_idx'),
+        ),
+    ]
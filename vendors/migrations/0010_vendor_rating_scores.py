@@ -0,0 +1,52 @@
+# Generated by Django 5.0.3 on 2026-10-17 01:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vendors', '0009_vendor_updated_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='vendor',
+            name='delivery_time_score',
+            field=models.DecimalField(blank=True, decimal_places=1, editable=False, max_digits=2, null=True),
+        ),
+        migrations.AddField(
+            model_name='vendor',
+            name='overall_avg_score',
+            field=models.DecimalField(blank=True, decimal_places=1, editable=False, max_digits=2, null=True),
+        ),
+        migrations.AddField(
+            model_name='vendor',
+            name='quality_price_score',
+            field=models.DecimalField(blank=True, decimal_places=1, editable=False, max_digits=2, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='vendor',
+            index=models.Index(fields=['quality_price_score', 'id'], name='vendor_quality_score_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vendor',
+            index=models.Index(fields=['delivery_time_score', 'id'], name='vendor_delivery_score_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vendor',
+            index=models.Index(fields=['overall_avg_score', 'id'], name='vendor_overall_score_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vendor',
+            index=models.Index(fields=['vendorType', 'quality_price_score', 'id'], name='vendor_type_quality_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vendor',
+            index=models.Index(fields=['vendorType', 'delivery_time_score', 'id'], name='vendor_type_delivery_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vendor',
+            index=models.Index(fields=['vendorType', 'overall_avg_score', 'id'], name='vendor_type_overall_idx'),
+        ),
+    ]
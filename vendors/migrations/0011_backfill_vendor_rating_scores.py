@@ -0,0 +1,40 @@
+# Generated by Django 5.0.3 on 2026-10-17 01:30
+
+from decimal import Decimal
+
+from django.db import migrations
+
+# Frozen copy of Vendor.RATING_CHOICES -> score; 'Not Rated' stays NULL
+RATING_SCORES = {
+    '5.0 - Excellent': Decimal('5.0'),
+    '4.5 - Very Good': Decimal('4.5'),
+    '4.0 - Good': Decimal('4.0'),
+    '3.5 - Average': Decimal('3.5'),
+    '3.0 - Below Average': Decimal('3.0'),
+    '2.0 - Poor': Decimal('2.0'),
+}
+
+SCORE_FIELDS = {
+    'quality_price_rating': 'quality_price_score',
+    'delivery_time_rating': 'delivery_time_score',
+    'overall_avg_rating': 'overall_avg_score',
+}
+
+
+def backfill_scores(apps, schema_editor):
+    Vendor = apps.get_model('vendors', 'Vendor')
+    # Ratings only take a handful of values, so one UPDATE per value is set-based
+    for rating_field, score_field in SCORE_FIELDS.items():
+        for rating, score in RATING_SCORES.items():
+            Vendor.objects.filter(**{rating_field: rating}).update(**{score_field: score})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vendors', '0010_vendor_rating_scores'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_scores, migrations.RunPython.noop),
+    ]
@@ -1,4 +1,7 @@
+from decimal import Decimal
+
 from django.db import models
+from django.utils import timezone
 import uuid
 
 class Vendor(models.Model):
@@ -48,6 +51,19 @@ class Vendor(models.Model):
         help_text="Overall average rating"
     )
     
+    # Numeric shadows of the rating strings above, kept in sync on save() so
+    # ratings can be filtered and sorted in SQL. 'Not Rated' maps to NULL.
+    quality_price_score = models.DecimalField(max_digits=2, decimal_places=1, null=True, blank=True, editable=False)
+    delivery_time_score = models.DecimalField(max_digits=2, decimal_places=1, null=True, blank=True, editable=False)
+    overall_avg_score = models.DecimalField(max_digits=2, decimal_places=1, null=True, blank=True, editable=False)
+
+    # Rating string field -> numeric shadow field
+    RATING_SCORE_FIELDS = {
+        'quality_price_rating': 'quality_price_score',
+        'delivery_time_rating': 'delivery_time_score',
+        'overall_avg_rating': 'overall_avg_score',
+    }
+
     # Legacy rating field - keeping for backward compatibility
     rating = models.IntegerField(null=True, blank=True)
     plantId = models.BigIntegerField(null=True, blank=True)
@@ -55,5 +71,74 @@ class Vendor(models.Model):
     created_At = models.DateTimeField(auto_now_add=True)
     updated_At = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # Keyset pagination order for the vendor list
+            models.Index(fields=['created_At', 'uuid'], name='vendor_created_uuid_idx'),
+            # Server-side list filters
+            models.Index(fields=['vendorType'], name='vendor_type_idx'),
+            models.Index(fields=['city'], name='vendor_city_idx'),
+            models.Index(fields=['pincode'], name='vendor_pincode_idx'),
+            models.Index(fields=['isActive', 'vendorType'], name='vendor_active_type_idx'),
+            models.Index(fields=['plantId', 'isActive'], name='vendor_plant_active_idx'),
+            # ?ordering=updated_At, and MAX(updated_At) for the list validators without a shared cache
+            models.Index(fields=['updated_At'], name='vendor_updated_idx'),
+            # Top-N ranking, overall and per vendorType
+            models.Index(fields=['quality_price_score', 'id'], name='vendor_quality_score_idx'),
+            models.Index(fields=['delivery_time_score', 'id'], name='vendor_delivery_score_idx'),
+            models.Index(fields=['overall_avg_score', 'id'], name='vendor_overall_score_idx'),
+            models.Index(fields=['vendorType', 'quality_price_score', 'id'], name='vendor_type_quality_idx'),
+            models.Index(fields=['vendorType', 'delivery_time_score', 'id'], name='vendor_type_delivery_idx'),
+            models.Index(fields=['vendorType', 'overall_avg_score', 'id'], name='vendor_type_overall_idx'),
+        ]
+
     def __str__(self):
-        return self.vendorName
\ No newline at end of file
+        return self.vendorName
+
+    @staticmethod
+    def rating_score(value):
+        """'4.5 - Very Good' -> Decimal('4.5'); 'Not Rated' or anything unparsable -> None."""
+        try:
+            return Decimal(str(value).split(' - ', 1)[0])
+        except (ArithmeticError, ValueError):
+            return None
+
+    def sync_rating_scores(self):
+        """Copy the rating strings into their numeric shadow columns."""
+        for rating_field, score_field in self.RATING_SCORE_FIELDS.items():
+            setattr(self, score_field, self.rating_score(getattr(self, rating_field)))
+
+    def save(self, *args, **kwargs):
+        self.sync_rating_scores()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = set(update_fields) | {
+                score_field for rating_field, score_field in self.RATING_SCORE_FIELDS.items()
+                if rating_field in update_fields
+            }
+        super().save(*args, **kwargs)
+
+    @classmethod
+    def recompute_rating_scores(cls):
+        """
+        Repair score columns that drifted from their rating strings.
+
+        Writes that bypass ``save()`` (``QuerySet.update``, raw SQL) leave the
+        shadow columns stale. Ratings only take a handful of values, so this
+        is one set-based UPDATE per value touching mismatched rows only.
+        Returns the number of rows fixed; like any bulk write it skips the
+        signals, so callers invalidate the vendor lists when it is non-zero.
+        """
+        fixed = 0
+        now = timezone.now()
+        for rating_field, score_field in cls.RATING_SCORE_FIELDS.items():
+            for rating, _ in cls.RATING_CHOICES:
+                score = cls.rating_score(rating)
+                stale = cls.objects.filter(**{rating_field: rating})
+                if score is None:
+                    stale = stale.filter(**{f'{score_field}__isnull': False})
+                else:
+                    stale = stale.exclude(**{score_field: score})
+                # Bump updated_At so clients syncing on it notice the change
+                fixed += stale.update(**{score_field: score, 'updated_At': now})
+        return fixed
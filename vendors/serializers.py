@@ -1,32 +1,44 @@
 from rest_framework import serializers
+from python_server.metrics import TimedSerializerMixin
 from .models import Vendor
 import re
 
-class VendorSerializer(serializers.ModelSerializer):
+# Compiled once at import; shared with the bulk importer
+PHONE_RE = re.compile(r'^[0-9]{10,15}$')
+PINCODE_RE = re.compile(r'^[0-9]{4,10}$')
+# Indian GSTN format: 15 characters
+# Format: 2 digits (state) + 10 characters (PAN) + 1 digit (entity) + 1 character (check) + 1 character (default Z)
+GSTN_RE = re.compile(r'^[0-9]{2}[A-Z]{5}[0-9]{4}[A-Z]{1}[1-9A-Z]{1}[Z]{1}[0-9A-Z]{1}$')
+VALID_RATINGS = [choice for choice, _ in Vendor.RATING_CHOICES]
+
+PHONE_ERROR = "Phone must be 10-15 digits."
+PINCODE_ERROR = "Pincode must be 4-10 digits."
+GSTN_ERROR = "GSTN must be a valid 15-character Indian GSTN number (Format: 22AAAAA0000A1Z5)."
+RATING_ERROR = f"Invalid rating. Must be one of: {VALID_RATINGS}"
+
+class VendorSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Vendor
         fields = [
             'uuid', 'vendorName', 'phone', 'email', 'fullAddress', 'pincode', 'city', 
             'GSTN', 'vendorType', 'quality_price_rating', 'delivery_time_rating', 
-            'overall_avg_rating', 'rating', 'plantId', 'isActive', 'created_At', 'updated_At'
+            'overall_avg_rating', 'quality_price_score', 'delivery_time_score', 'overall_avg_score',
+            'rating', 'plantId', 'isActive', 'created_At', 'updated_At'
         ]
 
     def validate_phone(self, value):
-        if value and not re.match(r'^[0-9]{10,15}$', value):
-            raise serializers.ValidationError("Phone must be 10-15 digits.")
+        if value and not PHONE_RE.match(value):
+            raise serializers.ValidationError(PHONE_ERROR)
         return value
 
     def validate_pincode(self, value):
-        if value and not re.match(r'^[0-9]{4,10}$', value):
-            raise serializers.ValidationError("Pincode must be 4-10 digits.")
+        if value and not PINCODE_RE.match(value):
+            raise serializers.ValidationError(PINCODE_ERROR)
         return value
 
     def validate_GSTN(self, value):
-        # Updated GSTN pattern for Indian GSTN format: 15 characters
-        # Format: 2 digits (state) + 10 characters (PAN) + 1 digit (entity) + 1 character (check) + 1 character (default Z)
-        GSTN_REGEX = r'^[0-9]{2}[A-Z]{5}[0-9]{4}[A-Z]{1}[1-9A-Z]{1}[Z]{1}[0-9A-Z]{1}$'
-        if value and not re.match(GSTN_REGEX, value):
-            raise serializers.ValidationError("GSTN must be a valid 15-character Indian GSTN number (Format: 22AAAAA0000A1Z5).")
+        if value and not GSTN_RE.match(value):
+            raise serializers.ValidationError(GSTN_ERROR)
         return value
 
     def validate_rating(self, value):
@@ -35,28 +47,16 @@ class VendorSerializer(serializers.ModelSerializer):
         return value
 
     def validate_quality_price_rating(self, value):
-        valid_ratings = [
-            '5.0 - Excellent', '4.5 - Very Good', '4.0 - Good', 
-            '3.5 - Average', '3.0 - Below Average', '2.0 - Poor', 'Not Rated'
-        ]
-        if value and value not in valid_ratings:
-            raise serializers.ValidationError(f"Invalid rating. Must be one of: {valid_ratings}")
+        if value and value not in VALID_RATINGS:
+            raise serializers.ValidationError(RATING_ERROR)
         return value
 
     def validate_delivery_time_rating(self, value):
-        valid_ratings = [
-            '5.0 - Excellent', '4.5 - Very Good', '4.0 - Good', 
-            '3.5 - Average', '3.0 - Below Average', '2.0 - Poor', 'Not Rated'
-        ]
-        if value and value not in valid_ratings:
-            raise serializers.ValidationError(f"Invalid rating. Must be one of: {valid_ratings}")
+        if value and value not in VALID_RATINGS:
+            raise serializers.ValidationError(RATING_ERROR)
         return value
 
     def validate_overall_avg_rating(self, value):
-        valid_ratings = [
-            '5.0 - Excellent', '4.5 - Very Good', '4.0 - Good', 
-            '3.5 - Average', '3.0 - Below Average', '2.0 - Poor', 'Not Rated'
-        ]
-        if value and value not in valid_ratings:
-            raise serializers.ValidationError(f"Invalid rating. Must be one of: {valid_ratings}")
+        if value and value not in VALID_RATINGS:
+            raise serializers.ValidationError(RATING_ERROR)
         return value
\ No newline at end of file
@@ -0,0 +1,22 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from python_server.conditional import bump_generation
+from .models import Vendor
+
+# Generation behind the vendor list ETags (python_server/conditional.py)
+GENERATION_KEY = 'vendors:generation'
+
+
+def invalidate_vendor_lists():
+    # Now for this request and again on commit, so a validator handed out
+    # before the transaction committed is also replaced
+    bump_generation(GENERATION_KEY)
+    transaction.on_commit(lambda: bump_generation(GENERATION_KEY))
+
+
+@receiver(post_save, sender=Vendor)
+@receiver(post_delete, sender=Vendor)
+def vendor_changed(sender, **kwargs):
+    invalidate_vendor_lists()
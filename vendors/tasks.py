@@ -0,0 +1,14 @@
+from celery import shared_task
+
+from .models import Vendor
+from .signals import invalidate_vendor_lists
+
+
+@shared_task
+def recompute_vendor_rating_scores():
+    """Periodic: repair score columns left stale by writes that bypassed save()."""
+    fixed = Vendor.recompute_rating_scores()
+    if fixed:
+        invalidate_vendor_lists()
+    return fixed
+
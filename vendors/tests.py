@@ -1,3 +1,329 @@
-from django.test import TestCase
+import gzip
+import json
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.cache import cache
+from django.db import DataError
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from users.models import User, UserProfile
+from .importer import MAX_BATCH_SIZE, VendorImporter
+from .models import Vendor
+from .tasks import recompute_vendor_rating_scores
+
+
+def make_vendor(index, **extra):
+    fields = {
+        'vendorName': f'Vendor {index}',
+        'fullAddress': f'{index} Market Road',
+        'pincode': '700001',
+        'city': 'Kolkata',
+    }
+    fields.update(extra)
+    return Vendor.objects.create(**fields)
+
+
+class VendorAPITestCase(TestCase):
+    def setUp(self):
+        admin = User.objects.create_user(email='admin@example.com', password='admin-pass-123')
+        UserProfile.objects.create(user=admin, role='admin')
+        self.client = APIClient()
+        self.client.force_authenticate(admin)
+
+
+class VendorListPaginationTests(VendorAPITestCase):
+    def test_list_without_page_size_returns_everything(self):
+        for i in range(3):
+            make_vendor(i)
+        response = self.client.get('/api/vendors/vendors/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 3)
+        self.assertNotIn('next', response.data)
+
+    def test_cursor_pages_cover_the_table_once(self):
+        for i in range(5):
+            make_vendor(i)
+        seen = []
+        url = '/api/vendors/vendors/?page_size=2&count=estimate'
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertTrue(response.data['success'])
+            self.assertEqual(response.data['estimated_count'], 5)
+            seen.extend(v['uuid'] for v in response.data['vendors'])
+            url = response.data['next']
+        self.assertEqual(len(seen), 5)
+        self.assertEqual(len(set(seen)), 5)
+
+    def pages(self, url):
+        seen = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            seen.extend(v['uuid'] for v in response.data['vendors'])
+            url = response.data['next']
+        return seen, response
+
+    def test_cursor_pages_cover_more_than_1000_tied_rows(self):
+        Vendor.objects.bulk_create(
+            Vendor(vendorName=f'Vendor {i}', fullAddress='1 Road', pincode='700001', city='Kolkata')
+            for i in range(1250)
+        )
+        Vendor.objects.update(created_At=timezone.now(), updated_At=timezone.now())
+        for ordering in ('-created_At', 'updated_At'):
+            seen, last = self.pages(f'/api/vendors/vendors/?page_size=300&ordering={ordering}')
+            self.assertEqual(len(seen), 1250)
+            self.assertEqual(len(set(seen)), 1250)
+        previous = self.client.get(last.data['previous'])
+        self.assertEqual(len(previous.data['vendors']), 300)
+        self.assertEqual(previous.data['vendors'][-1]['uuid'], seen[-51])
+
+    def test_paginated_lists_reject_orderings_with_many_ties(self):
+        make_vendor(1)
+        response = self.client.get('/api/vendors/vendors/?ordering=city&page_size=2')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('can only be ordered by created_At, updated_At', response.data['message'])
+        self.assertEqual(self.client.get('/api/vendors/vendors/?ordering=city').status_code, 200)
+
+
+class VendorFilterTests(VendorAPITestCase):
+    def test_filters_by_type_active_and_plant(self):
+        make_vendor(1, vendorType='service', plantId=7)
+        make_vendor(2, vendorType='service', plantId=7, isActive=False)
+        make_vendor(3, vendorType='purchase', plantId=7)
+        response = self.client.get('/api/vendors/vendors/?vendorType=service&isActive=true&plantId=7')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([v['vendorName'] for v in response.data['vendors']], ['Vendor 1'])
+
+    def test_ordering_by_name(self):
+        for i in (2, 1, 3):
+            make_vendor(i)
+        response = self.client.get('/api/vendors/vendors/?ordering=vendorName')
+        self.assertEqual(
+            [v['vendorName'] for v in response.data['vendors']],
+            ['Vendor 1', 'Vendor 2', 'Vendor 3'],
+        )
+
+
+@override_settings(SHARED_CACHE=True)
+class VendorConditionalGetTests(VendorAPITestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def test_unchanged_list_returns_304_without_a_query(self):
+        vendor = make_vendor(1)
+        response = self.client.get('/api/vendors/vendors/')
+        etag = response['ETag']
+        self.assertIn('Last-Modified', response)
+
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/vendors/vendors/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        vendor.city = 'Howrah'
+        vendor.save()
+        response = self.client.get('/api/vendors/vendors/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_delete_and_import_change_etag(self):
+        make_vendor(1)
+        doomed = make_vendor(2)
+        etag = self.client.get('/api/vendors/vendors/')['ETag']
+        doomed.delete()
+        response = self.client.get('/api/vendors/vendors/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+        etag = response['ETag']
+        upload = SimpleUploadedFile('vendors.csv', b'vendorName,fullAddress,pincode,city\nVendor 9,9 Road,700001,Kolkata\n')
+        response = self.client.post('/api/vendors/vendors/import/', {'file': upload}, format='multipart')
+        self.assertEqual(response.data['report']['created'], 1)
+        response = self.client.get('/api/vendors/vendors/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_keyset_pages_cost_no_extra_query(self):
+        for i in range(3):
+            make_vendor(i)
+        first = self.client.get('/api/vendors/vendors/', {'page_size': 2})
+        self.assertIn('ETag', first)
+        with self.assertNumQueries(1):
+            response = self.client.get(first.data['next'])
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('ETag', response)
+        with self.assertNumQueries(0):
+            response = self.client.get(first.data['next'], HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+
+
+class VendorConditionalGetWithoutSharedCacheTests(VendorAPITestCase):
+    def test_validators_come_from_one_aggregate(self):
+        vendor = make_vendor(1)
+        doomed = make_vendor(2)
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/vendors/vendors/')
+        etag = response['ETag']
+        self.assertIn('Last-Modified', response)
+
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/vendors/vendors/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        vendor.city = 'Howrah'
+        vendor.save()
+        response = self.client.get('/api/vendors/vendors/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+        doomed.delete()
+        response = self.client.get('/api/vendors/vendors/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_keyset_pages_and_filters_get_their_own_validators(self):
+        for i in range(3):
+            make_vendor(i, city='Howrah' if i else 'Kolkata')
+        page = self.client.get('/api/vendors/vendors/', {'page_size': 2})
+        response = self.client.get('/api/vendors/vendors/', {'page_size': 2}, HTTP_IF_NONE_MATCH=page['ETag'])
+        self.assertEqual(response.status_code, 304)
+        filtered = self.client.get('/api/vendors/vendors/', {'city': 'Howrah'})
+        self.assertNotEqual(filtered['ETag'], page['ETag'])
+        make_vendor(9, city='Kolkata')
+        response = self.client.get('/api/vendors/vendors/', {'city': 'Howrah'}, HTTP_IF_NONE_MATCH=filtered['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+
+class VendorTopRatedTests(VendorAPITestCase):
+    def test_scores_follow_rating_strings(self):
+        vendor = make_vendor(1, overall_avg_rating='4.5 - Very Good')
+        self.assertEqual(str(vendor.overall_avg_score), '4.5')
+        self.assertIsNone(vendor.quality_price_score)
+        vendor.overall_avg_rating = '2.0 - Poor'
+        vendor.save(update_fields=['overall_avg_rating'])
+        vendor.refresh_from_db()
+        self.assertEqual(str(vendor.overall_avg_score), '2.0')
+
+    def test_top_ranks_by_score_within_vendor_type(self):
+        make_vendor(1, overall_avg_rating='3.5 - Average')
+        make_vendor(2, overall_avg_rating='5.0 - Excellent')
+        make_vendor(3, overall_avg_rating='5.0 - Excellent', vendorType='scrap')
+        make_vendor(4)  # Not Rated
+        response = self.client.get('/api/vendors/vendors/top/?vendorType=purchase&limit=5')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([v['vendorName'] for v in response.data['vendors']], ['Vendor 2', 'Vendor 1'])
+
+    def test_top_rejects_unknown_rating(self):
+        response = self.client.get('/api/vendors/vendors/top/?by=price')
+        self.assertEqual(response.status_code, 400)
+
+
+class VendorBulkImportTests(VendorAPITestCase):
+    def upload(self, name, content, **options):
+        return self.client.post(
+            '/api/vendors/vendors/import/',
+            {'file': SimpleUploadedFile(name, content if isinstance(content, bytes) else content.encode()), **options},
+            format='multipart',
+        )
+
+    def test_csv_import_reports_row_errors(self):
+        make_vendor(0)
+        content = (
+            'vendorName,fullAddress,pincode,city,phone,overall_avg_rating\n'
+            'Fresh Catch,1 Dock St,700001,Kolkata,9876543210,4.5 - Very Good\n'
+            'Bad Pin,2 Dock St,12,Kolkata,,\n'
+            'Vendor 0,3 Dock St,700001,Kolkata,,\n'
+            'Fresh Catch,4 Dock St,700001,Kolkata,,\n'
+        )
+        response = self.upload('vendors.csv', content, batch_size=2)
+        self.assertEqual(response.status_code, 200)
+        report = response.data['report']
+        self.assertEqual((report['total_rows'], report['created'], report['failed']), (4, 1, 3))
+        self.assertEqual([error['row'] for error in report['errors']], [3, 4, 5])
+        self.assertEqual(str(Vendor.objects.get(vendorName='Fresh Catch').overall_avg_score), '4.5')
+
+    def test_jsonl_all_or_nothing_rolls_back(self):
+        content = (
+            '{"vendorName": "A", "fullAddress": "x", "pincode": "700001", "city": "Kolkata"}\n'
+            'not json\n'
+        )
+        response = self.upload('vendors.jsonl', content, all_or_nothing='true')
+        self.assertEqual(response.status_code, 400)
+        self.assertTrue(response.data['report']['rolled_back'])
+        self.assertFalse(Vendor.objects.filter(vendorName='A').exists())
+
+
+    def test_unreadable_file_is_rejected_and_nothing_is_kept(self):
+        content = 'vendorName,fullAddress,pincode,city\nCafé Rosé,1 Rue,700001,Kolkata\n'.encode('latin-1')
+        response = self.upload('vendors.csv', content)
+        self.assertEqual(response.status_code, 400)
+        report = response.data['report']
+        self.assertTrue(report['rolled_back'])
+        self.assertIn('not UTF-8', report['errors'][0]['errors']['file'])
+
+        content = 'vendorName,fullAddress,pincode,city\nFine,1 Road,700001,Kolkata\nBig,' + 'x' * 200000 + ',700001,Kolkata\n'
+        response = self.upload('vendors.csv', content)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('Malformed CSV', response.data['report']['errors'][0]['errors']['file'])
+        self.assertFalse(Vendor.objects.exists())
+
+    def test_batch_size_is_capped(self):
+        self.assertEqual(VendorImporter(batch_size=10 ** 9).batch_size, MAX_BATCH_SIZE)
+        self.assertEqual(VendorImporter(batch_size=-5).batch_size, 1)
+
+    def test_database_rejections_become_row_errors(self):
+        content = (
+            'vendorName,fullAddress,pincode,city\n'
+            'Fine,1 Road,700001,Kolkata\n'
+            'Rejected,2 Road,700001,Kolkata\n'
+        )
+        save = Vendor.save
+
+        def strict_save(vendor, *args, **kwargs):
+            if vendor.vendorName == 'Rejected':
+                raise DataError('value too long for type character varying')
+            return save(vendor, *args, **kwargs)
+
+        with mock.patch.object(Vendor.objects, 'bulk_create', side_effect=DataError('value too long')), \
+                mock.patch.object(Vendor, 'save', autospec=True, side_effect=strict_save):
+            response = self.upload('vendors.csv', content)
+        self.assertEqual(response.status_code, 200)
+        report = response.data['report']
+        self.assertEqual((report['created'], report['failed']), (1, 1))
+        self.assertEqual(report['errors'][0]['row'], 3)
+        self.assertEqual(list(Vendor.objects.values_list('vendorName', flat=True)), ['Fine'])
+
+class VendorExportTests(VendorAPITestCase):
+    def test_csv_export_streams_filtered_rows(self):
+        make_vendor(1, city='Howrah')
+        make_vendor(2)
+        response = self.client.get('/api/vendors/vendors/export/?city=Howrah')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertTrue(lines[0].startswith('uuid,vendorName'))
+        self.assertIn('Vendor 1', lines[1])
+
+    def test_gzip_jsonl_export(self):
+        make_vendor(1)
+        response = self.client.get('/api/vendors/vendors/export/?file_format=jsonl&compression=gzip')
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="vendors.jsonl.gz"')
+        rows = gzip.decompress(b''.join(response.streaming_content)).decode().splitlines()
+        self.assertEqual(json.loads(rows[0])['vendorName'], 'Vendor 1')
+
+    def test_unknown_format_is_rejected(self):
+        response = self.client.get('/api/vendors/vendors/export/?file_format=xlsx')
+        self.assertEqual(response.status_code, 400)
+
+
+class VendorTaskTests(TestCase):
+    def test_recompute_repairs_scores_written_around_save(self):
+        vendor = make_vendor(1, overall_avg_rating='4.0 - Good')
+        Vendor.objects.filter(pk=vendor.pk).update(overall_avg_rating='2.0 - Poor')
+        self.assertEqual(recompute_vendor_rating_scores.delay().get(), 1)
+        vendor.refresh_from_db()
+        self.assertEqual(vendor.overall_avg_score, Decimal('2.0'))
+        self.assertEqual(Vendor.recompute_rating_scores(), 0)
@@ -1,40 +1,200 @@
 from rest_framework import viewsets, permissions
+from rest_framework.decorators import action
+from rest_framework.filters import OrderingFilter
+from django_filters.rest_framework import DjangoFilterBackend
 from .models import Vendor
 from .serializers import VendorSerializer
+from .signals import GENERATION_KEY
+from .importer import DEFAULT_BATCH_SIZE, ImportFormatError, detect_format, import_vendors
+from python_server.export import ExportError, stream_export
+from python_server.metrics import TimedPermissionsMixin
 from users.permissions import IsAdminRole
+from python_server.pagination import KeysetPagination
+from python_server.conditional import (
+    collection_validators, is_not_modified, not_modified_response, rows_validators, set_validator_headers,
+)
 
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.exceptions import NotFound
 
-from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiResponse
+from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiResponse, OpenApiParameter, OpenApiTypes
 
 @extend_schema_view(
-    list=extend_schema(summary="List all vendors", tags=["Vendors"]),
+    list=extend_schema(
+        summary="List all vendors",
+        description="Retrieve vendors. Supports filtering by vendorType, city, pincode, isActive and plantId, and ordering with ?ordering=.",
+        tags=["Vendors"]
+    ),
     retrieve=extend_schema(summary="Retrieve a vendor", tags=["Vendors"]),
     create=extend_schema(summary="Create a new vendor", tags=["Vendors"]),
     update=extend_schema(summary="Update a vendor", tags=["Vendors"]),
     partial_update=extend_schema(summary="Partially update a vendor", tags=["Vendors"]),
     destroy=extend_schema(summary="Delete a vendor", tags=["Vendors"]),
 )
-class VendorViewSet(viewsets.ModelViewSet):
+class VendorViewSet(TimedPermissionsMixin, viewsets.ModelViewSet):
     """API endpoints for managing vendors."""
     queryset = Vendor.objects.all()
     serializer_class = VendorSerializer
     permission_classes = [IsAdminRole]  # Use custom admin role permission
     lookup_field = 'uuid'
     lookup_url_kwarg = 'id'  # URL parameter name
+    pagination_class = KeysetPagination  # Opt-in with ?page_size=N
+    filter_backends = [DjangoFilterBackend, OrderingFilter]
+    filterset_fields = ['vendorType', 'city', 'pincode', 'isActive', 'plantId']
+    ordering_fields = ['created_At', 'updated_At', 'vendorName', 'city', 'pincode']
+    # With ?page_size= only these indexed, nearly unique columns; the cursor adds a tiebreaker
+    keyset_ordering_fields = ['created_At', 'updated_At']
+    ordering = ('-created_At', '-uuid')
 
     def list(self, request, *args, **kwargs):
-        """List all vendors with beautiful response format."""
-        response = super().list(request, *args, **kwargs)
-        return Response({
+        """List all vendors with beautiful response format (supports conditional GET)."""
+        queryset = self.filter_queryset(self.get_queryset())
+        etag, last_modified = collection_validators(
+            request, GENERATION_KEY, queryset, 'updated_At',
+            # The unpaginated list is the whole collection, so its rows give the validators
+            defer=self.paginator.get_page_size(request) is None,
+        )
+        if is_not_modified(request, etag, last_modified):
+            return not_modified_response(etag, last_modified)
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page if page is not None else queryset, many=True)
+        if etag is None:
+            etag, last_modified = rows_validators(request, queryset, 'updated_At')
+        data = {
             'success': True,
             'message': 'Vendors retrieved successfully',
-            'count': len(response.data),
-            'vendors': response.data
+            'count': len(serializer.data),
+            'vendors': serializer.data
+        }
+        if page is not None:
+            data.update(self.paginator.get_pagination_data())
+        return set_validator_headers(Response(data, status=status.HTTP_200_OK), etag, last_modified)
+
+    # ?by= value -> numeric rating column used for ranking
+    TOP_RATING_FIELDS = {
+        'quality_price': 'quality_price_score',
+        'delivery_time': 'delivery_time_score',
+        'overall': 'overall_avg_score',
+    }
+    TOP_DEFAULT_LIMIT = 10
+    TOP_MAX_LIMIT = 100
+
+    @extend_schema(
+        summary="Top rated vendors",
+        description="Return the top-N vendors by a numeric rating, optionally for one vendorType. Unrated vendors are excluded.",
+        tags=["Vendors"],
+        parameters=[
+            OpenApiParameter(name='by', type=OpenApiTypes.STR, location=OpenApiParameter.QUERY, enum=['overall', 'quality_price', 'delivery_time'], description="Rating to rank by (default: overall)."),
+            OpenApiParameter(name='vendorType', type=OpenApiTypes.STR, location=OpenApiParameter.QUERY, enum=['purchase', 'service', 'scrap']),
+            OpenApiParameter(name='limit', type=OpenApiTypes.INT, location=OpenApiParameter.QUERY, description="Number of vendors (default 10, max 100)."),
+        ]
+    )
+    @action(detail=False, methods=['get'], url_path='top')
+    def top(self, request):
+        """Top-N vendors by rating, read straight off the (vendorType, score, id) index."""
+        by = request.query_params.get('by', 'overall')
+        score_field = self.TOP_RATING_FIELDS.get(by)
+        if score_field is None:
+            return Response({
+                'success': False,
+                'message': f"Invalid 'by'. Must be one of: {', '.join(self.TOP_RATING_FIELDS)}"
+            }, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            limit = min(int(request.query_params.get('limit', self.TOP_DEFAULT_LIMIT)), self.TOP_MAX_LIMIT)
+        except ValueError:
+            limit = 0
+        if limit < 1:
+            return Response({
+                'success': False,
+                'message': f'limit must be a number between 1 and {self.TOP_MAX_LIMIT}'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        queryset = Vendor.objects.filter(**{f'{score_field}__isnull': False})
+        vendor_type = request.query_params.get('vendorType')
+        if vendor_type:
+            queryset = queryset.filter(vendorType=vendor_type)
+        vendors = queryset.order_by(f'-{score_field}', '-id')[:limit]
+        serializer = self.get_serializer(vendors, many=True)
+        return Response({
+            'success': True,
+            'message': 'Top vendors retrieved successfully',
+            'count': len(serializer.data),
+            'vendors': serializer.data
         }, status=status.HTTP_200_OK)
 
+    @extend_schema(
+        summary="Bulk import vendors (CSV/JSONL)",
+        description="""Upload a CSV (header row required) or JSONL file as multipart field `file`.
+
+        Rows are validated with the vendor rules and inserted in batches in one transaction.
+        The response is a per-row error report. Options (form or query): `file_format` (csv|jsonl,
+        default from the file name), `batch_size` (at most 5000), `all_or_nothing` (roll back everything if any
+        row fails) and `dry_run` (validate only).
+        """,
+        tags=["Vendors"],
+        request={'multipart/form-data': {'type': 'object', 'properties': {'file': {'type': 'string', 'format': 'binary'}}}},
+    )
+    @action(detail=False, methods=['post'], url_path='import')
+    def bulk_import(self, request):
+        """Stream-import vendors from an uploaded CSV/JSONL file."""
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({
+                'success': False,
+                'message': "Upload the CSV or JSONL file in the 'file' field."
+            }, status=status.HTTP_400_BAD_REQUEST)
+        # Options may come as form fields or query parameters
+        option = lambda name, default=None: request.data.get(name, request.query_params.get(name, default))
+        flag = lambda name: str(option(name, '')).lower() in ('true', '1', 'yes')
+        try:
+            file_format = detect_format(upload.name, option('file_format'))
+            batch_size = int(option('batch_size', DEFAULT_BATCH_SIZE))
+        except (ImportFormatError, ValueError) as exc:
+            return Response({'success': False, 'message': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        report = import_vendors(
+            upload.file, file_format,
+            batch_size=batch_size, all_or_nothing=flag('all_or_nothing'), dry_run=flag('dry_run'),
+        )
+        if report['failed'] == 0:
+            message, response_status = 'Vendors imported successfully', status.HTTP_201_CREATED
+        elif report['rolled_back'] or report['created'] == 0:
+            message, response_status = 'No vendors were imported', status.HTTP_400_BAD_REQUEST
+        else:
+            message, response_status = 'Vendors imported with errors', status.HTTP_200_OK
+        if flag('dry_run'):
+            message, response_status = 'Dry run complete; nothing was saved', status.HTTP_200_OK
+        return Response({
+            'success': report['failed'] == 0,
+            'message': message,
+            'report': report
+        }, status=response_status)
+
+    @extend_schema(
+        summary="Export vendors (streaming CSV/JSONL)",
+        description="Stream every vendor matching the list filters as CSV or JSONL, optionally gzip or zstd compressed.",
+        tags=["Vendors"],
+        parameters=[
+            OpenApiParameter(name='file_format', type=OpenApiTypes.STR, location=OpenApiParameter.QUERY, enum=['csv', 'jsonl']),
+            OpenApiParameter(name='compression', type=OpenApiTypes.STR, location=OpenApiParameter.QUERY, enum=['gzip', 'zstd']),
+        ],
+        responses={200: OpenApiTypes.BINARY},
+    )
+    @action(detail=False, methods=['get'], url_path='export')
+    def export(self, request):
+        """Stream the (filtered) vendor table without building it in memory."""
+        try:
+            return stream_export(
+                self.filter_queryset(self.get_queryset()),
+                VendorSerializer.Meta.fields,
+                file_format=request.query_params.get('file_format'),
+                compression=request.query_params.get('compression'),
+                filename='vendors',
+            )
+        except ExportError as exc:
+            return Response({'success': False, 'message': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
     def retrieve(self, request, *args, **kwargs):
         """Retrieve a single vendor with beautiful response format."""
         response = super().retrieve(request, *args, **kwargs)